@@ -0,0 +1,58 @@
+"""add materialized paths to architecture modules and tree nodes
+
+Revision ID: e5f6a7b8c9d0
+Revises: d4e5f6a7b8c9
+Create Date: 2025-10-14 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "e5f6a7b8c9d0"
+down_revision: Union[str, None] = "d4e5f6a7b8c9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Fill path ("/<root>/.../<id>/") and level from parent_id, roots first
+BACKFILL = """
+WITH RECURSIVE paths(id, path, level) AS (
+    SELECT id, '/' || id::text || '/', 0 FROM {table} WHERE parent_id IS NULL
+    UNION ALL
+    SELECT child.id, paths.path || child.id::text || '/', paths.level + 1
+    FROM {table} child JOIN paths ON child.parent_id = paths.id
+)
+UPDATE {table} SET path = paths.path, level = paths.level
+FROM paths WHERE {table}.id = paths.id
+"""
+
+
+def upgrade() -> None:
+    op.add_column("architecture_modules", sa.Column("path", sa.Text(), nullable=True))
+
+    op.execute(BACKFILL.format(table="architecture_modules"))
+    op.execute(BACKFILL.format(table="tree_nodes"))
+
+    op.create_index(
+        "ix_architecture_modules_path",
+        "architecture_modules",
+        ["path"],
+        unique=False,
+        postgresql_ops={"path": "text_pattern_ops"},
+    )
+    op.create_index(
+        "ix_tree_nodes_path",
+        "tree_nodes",
+        ["path"],
+        unique=False,
+        postgresql_ops={"path": "text_pattern_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tree_nodes_path", table_name="tree_nodes")
+    op.drop_index("ix_architecture_modules_path", table_name="architecture_modules")
+    op.drop_column("architecture_modules", "path")
@@ -1,15 +1,16 @@
 """FastAPI dependencies."""
 
-from typing import Annotated
+from typing import Annotated, Any, Callable, Coroutine
 from uuid import UUID
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, Response, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt  # type: ignore
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.core.config import settings
+from backend.core.graph_manager import get_graph_manager
 from backend.core.schemas import TokenData
 from backend.db.base import get_db
 from backend.db.models import User
@@ -66,3 +67,29 @@ async def get_current_superuser(
     if not current_user.is_superuser:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
     return current_user
+
+
+def graph_etag() -> Callable[..., Coroutine[Any, Any, None]]:
+    """
+    Dependency adding a strong ETag (project graph hash) to a GET response.
+
+    Answers 304 Not Modified without running the endpoint when the client
+    already has the current representation (If-None-Match). The tag comes
+    from the cached graph plus one aggregate watermark query, so writes from
+    other workers change it too.
+    """
+
+    async def _check(
+        project_id: UUID,
+        request: Request,
+        response: Response,
+        db: Annotated[AsyncSession, Depends(get_db)],
+        current_user: Annotated[User, Depends(get_current_user)],
+    ) -> None:
+        etag = f'"{await get_graph_manager().get_project_etag(project_id, db)}"'
+        if_none_match = [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]
+        if etag in if_none_match or "*" in if_none_match:
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+
+    return _check
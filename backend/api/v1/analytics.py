@@ -13,11 +13,12 @@ from uuid import UUID
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.api.deps import get_current_user, get_db
+from backend.api.deps import get_current_user, get_db, graph_etag
 from backend.core.graph_manager import get_graph_manager
 from backend.db.models import User
 
-router = APIRouter(prefix="/analytics", tags=["analytics"])
+# Every analytics response is derived from the project graph: tag it with the graph hash
+router = APIRouter(prefix="/analytics", tags=["analytics"], dependencies=[Depends(graph_etag())])
 
 
 @router.get("/projects/{project_id}/most-critical-nodes")
@@ -47,28 +48,24 @@ async def get_most_critical_nodes(
     if not graph:
         return {"error": "RefMemTree not available"}
 
-    # ⭐ RefMemTree magic: Instant graph traversal!
-    all_nodes = graph.get_all_nodes()
+    # ⭐ Degree statistics for the whole graph in one pass (native with rustworkx)
+    degree_stats = await analytics.get_degree_stats()
+    ranked = sorted(degree_stats.items(), key=lambda item: item[1]["in_weight"], reverse=True)[:top_n]
 
     criticality_scores = []
 
-    for node in all_nodes:
-        # ⭐ REAL RefMemTree API: Get all dependents instantly!
-        dependents = node.get_dependencies(direction="incoming")
-
-        # Calculate "architectural weight"
-        dependent_count = len(dependents)
-
-        # Weight by dependency strength
-        total_weight = sum(getattr(dep, "strength", 1.0) for dep in dependents)
+    for node_id, stats in ranked:
+        node = graph.get_node(node_id)
+        data = node.data if node else {}
+        dependent_count = int(stats["in_degree"])
 
         criticality_scores.append(
             {
-                "node_id": node.id,
-                "node_name": node.data.get("name", "Unknown"),
-                "node_type": node.data.get("type", "Unknown"),
+                "node_id": node_id,
+                "node_name": data.get("name", "Unknown"),
+                "node_type": data.get("type", "Unknown"),
                 "dependent_count": dependent_count,
-                "architectural_weight": total_weight,
+                "architectural_weight": stats["in_weight"],
                 "is_critical": dependent_count > 5,
                 "risk_level": (
                     "critical"
@@ -78,15 +75,12 @@ async def get_most_critical_nodes(
             }
         )
 
-    # Sort by architectural weight
-    criticality_scores.sort(key=lambda x: x["architectural_weight"], reverse=True)
-
     return {
         "project_id": str(project_id),
-        "total_nodes": len(all_nodes),
-        "critical_nodes": criticality_scores[:top_n],
+        "total_nodes": len(degree_stats),
+        "critical_nodes": criticality_scores,
         "analysis_time_ms": "< 20ms",  # RefMemTree is FAST!
-        "powered_by": "RefMemTree in-memory graph",
+        "powered_by": f"RefMemTree in-memory graph ({analytics.backend} analytics)",
     }
 
 
@@ -113,10 +107,15 @@ async def get_dependency_hotspots(
     if not graph:
         return {"error": "RefMemTree not available"}
 
-    all_nodes = graph.get_all_nodes()
+    # Filter on out-degree first; only hotspots are expanded into their dependency lists
+    degree_stats = await analytics.get_degree_stats()
+    candidates = [node_id for node_id, stats in degree_stats.items() if stats["out_degree"] > threshold]
     hotspots = []
 
-    for node in all_nodes:
+    for node_id in candidates:
+        node = graph.get_node(node_id)
+        if not node:
+            continue
         # ⭐ Get outgoing dependencies (what this module depends on)
         dependencies = node.get_dependencies(direction="outgoing")
 
@@ -198,11 +197,9 @@ async def get_architecture_health(
             health_checks["no_circular_deps"] = False
             issues.append(f"Circular dependencies detected: {len(cycles)} cycles")
 
-        # Get all nodes for analysis
-        all_nodes = graph.get_all_nodes()
-
         # Check coupling
-        high_coupling = sum(1 for node in all_nodes if len(node.get_dependencies(direction="outgoing")) > 8)
+        degree_stats = await analytics.get_degree_stats()
+        high_coupling = sum(1 for stats in degree_stats.values() if stats["out_degree"] > 8)
 
         if high_coupling > 0:
             health_checks["coupling_ok"] = False
@@ -226,3 +223,92 @@ async def get_architecture_health(
         ),
         "powered_by": "RefMemTree",
     }
+
+
+@router.get("/projects/{project_id}/centrality")
+async def get_centrality(
+    project_id: UUID,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user)],
+    top_n: int = 10,
+) -> Dict[str, Any]:
+    """
+    Modules that sit on the most dependency paths (betweenness centrality).
+
+    High-betweenness modules are brokers: changes to them ripple between
+    otherwise unrelated parts of the architecture.
+    """
+    graph_manager = get_graph_manager()
+    _, _, analytics, _ = await graph_manager.get_or_create_services(project_id, db)
+
+    centrality = await analytics.get_betweenness_centrality()
+    ranked = sorted(centrality.items(), key=lambda item: item[1], reverse=True)[:top_n]
+
+    central_nodes = []
+    for node_id, score in ranked:
+        node = analytics.graph_system.get_node(node_id)
+        central_nodes.append(
+            {
+                "node_id": node_id,
+                "node_name": node.data.get("name", "Unknown") if node else "Unknown",
+                "betweenness": round(score, 6),
+            }
+        )
+
+    return {
+        "project_id": str(project_id),
+        "total_nodes": len(centrality),
+        "central_nodes": central_nodes,
+        "powered_by": f"{analytics.backend} analytics",
+    }
+
+
+@router.get("/projects/{project_id}/dependency-structure")
+async def get_dependency_structure(
+    project_id: UUID,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user)],
+) -> Dict[str, Any]:
+    """
+    Strongly connected components and build order of the module graph.
+
+    Tangles are groups of modules that all depend on each other; the
+    topological order is only available when there are none.
+    """
+    graph_manager = get_graph_manager()
+    _, _, analytics, _ = await graph_manager.get_or_create_services(project_id, db)
+
+    tangles = await analytics.get_strongly_connected_components()
+    order = await analytics.get_topological_order()
+
+    return {
+        "project_id": str(project_id),
+        "is_acyclic": order is not None,
+        "tangles": sorted(tangles, key=len, reverse=True),
+        "topological_order": order,
+        "powered_by": f"{analytics.backend} analytics",
+    }
+
+
+@router.get("/projects/{project_id}/shortest-path")
+async def get_shortest_path(
+    project_id: UUID,
+    from_node_id: UUID,
+    to_node_id: UUID,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user)],
+) -> Dict[str, Any]:
+    """Shortest dependency path between two modules (None if unreachable)."""
+    graph_manager = get_graph_manager()
+    _, _, analytics, _ = await graph_manager.get_or_create_services(project_id, db)
+
+    path = await analytics.get_shortest_path(from_node_id, to_node_id)
+
+    return {
+        "project_id": str(project_id),
+        "from_node_id": str(from_node_id),
+        "to_node_id": str(to_node_id),
+        "path": path,
+        "length": len(path) - 1 if path else None,
+        "powered_by": f"{analytics.backend} analytics",
+    }
@@ -3,11 +3,13 @@
 from typing import Annotated, Optional, List, Dict, Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.ai_agents.architecture_team import ArchitectureTeam
-from backend.api.deps import get_current_user, get_db
+from backend.api.deps import get_current_user, get_db, graph_etag
+from backend.core.graph_algorithms import DEFAULT_MAX_PATHS
+from backend.core.graph_manager import get_graph_manager
 from backend.db.models import User
 from backend.modules.architecture.schemas import (
     ArchitectureGenerationRequest,
@@ -19,6 +21,7 @@ from backend.modules.architecture.schemas import (
     ArchitectureRuleResponse,
     ArchitectureRuleUpdate,
     ArchitectureValidationResponse,
+    BatchSimulationRequest,
     ComplexityAnalysisResponse,
     ImpactAnalysisRequest,
     ImpactAnalysisResponse,
@@ -31,6 +34,9 @@ from backend.modules.architecture.service import ArchitectureService
 
 router = APIRouter()
 
+# Project-level GETs read the database; the tag includes a watermark probe of the project rows
+project_etag = graph_etag()
+
 
 # ============================================================================
 # Architecture Generation
@@ -87,15 +93,11 @@ async def generate_architecture(
         style=request.architectural_style,
     )
 
-    # Create modules in database
+    # Materialize the proposal: batched inserts, one commit, batched graph sync
     service = ArchitectureService(db)
     proposal = result["proposal"]
-    created_modules = []
-    module_name_to_id = {}
-
-    # Create all modules first
-    for module_data in proposal["modules"]:
-        module_create = ArchitectureModuleCreate(
+    module_creates = [
+        ArchitectureModuleCreate(
             project_id=project_id,
             name=module_data["name"],
             description=module_data["description"],
@@ -106,36 +108,11 @@ async def generate_architecture(
                 "patterns": module_data.get("patterns", []),
             },
         )
-
-        # Mark as AI generated
-        module = await service.create_module(module_create)
-        module.ai_generated = True
-        module.generation_reasoning = proposal.get("reasoning")
-        await db.commit()
-
-        created_modules.append(module)
-        module_name_to_id[module.name] = module.id
-
-    # Create dependencies
-    created_dependencies = []
-    for dep_data in proposal["dependencies"]:
-        from_id = module_name_to_id.get(dep_data["from_module"])
-        to_id = module_name_to_id.get(dep_data["to_module"])
-
-        if from_id and to_id:
-            try:
-                dep_create = ModuleDependencyCreate(
-                    project_id=project_id,
-                    from_module_id=from_id,
-                    to_module_id=to_id,
-                    dependency_type=dep_data["dependency_type"],
-                    description=dep_data.get("reason"),
-                )
-                dep = await service.create_dependency(dep_create)
-                created_dependencies.append(dep)
-            except ValueError:
-                # Skip if dependency validation fails
-                pass
+        for module_data in proposal["modules"]
+    ]
+    created_modules, created_dependencies = await service.create_architecture_bulk(
+        project_id, module_creates, proposal["dependencies"], generation_reasoning=proposal.get("reasoning")
+    )
 
     # Create suggested rules (optional)
     created_rules = []
@@ -163,11 +140,21 @@ async def create_module(
 ) -> ArchitectureModuleResponse:
     """Create a new architecture module."""
     service = ArchitectureService(db)
-    module = await service.create_module(data)
+    try:
+        module = await service.create_module(data)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        ) from e
     return ArchitectureModuleResponse.model_validate(module)
 
 
-@router.get("/projects/{project_id}/architecture", response_model=list[ArchitectureModuleResponse])
+@router.get(
+    "/projects/{project_id}/architecture",
+    response_model=list[ArchitectureModuleResponse],
+    dependencies=[Depends(project_etag)],
+)
 async def list_modules(
     project_id: UUID,
     db: Annotated[AsyncSession, Depends(get_db)],
@@ -219,7 +206,14 @@ async def update_module(
 ) -> ArchitectureModuleResponse:
     """Update architecture module."""
     service = ArchitectureService(db)
-    module = await service.update_module(module_id, data)
+
+    try:
+        module = await service.update_module(module_id, data)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        ) from e
 
     if not module:
         raise HTTPException(
@@ -294,7 +288,11 @@ async def create_dependency(
         )
 
 
-@router.get("/projects/{project_id}/architecture/dependencies", response_model=list[ModuleDependencyResponse])
+@router.get(
+    "/projects/{project_id}/architecture/dependencies",
+    response_model=list[ModuleDependencyResponse],
+    dependencies=[Depends(project_etag)],
+)
 async def list_dependencies(
     project_id: UUID,
     db: Annotated[AsyncSession, Depends(get_db)],
@@ -332,7 +330,11 @@ async def delete_dependency(
 # ============================================================================
 
 
-@router.get("/projects/{project_id}/architecture/validate", response_model=ArchitectureValidationResponse)
+@router.get(
+    "/projects/{project_id}/architecture/validate",
+    response_model=ArchitectureValidationResponse,
+    dependencies=[Depends(project_etag)],
+)
 async def validate_architecture(
     project_id: UUID,
     db: Annotated[AsyncSession, Depends(get_db)],
@@ -360,7 +362,11 @@ async def create_rule(
     return ArchitectureRuleResponse.model_validate(rule)
 
 
-@router.get("/projects/{project_id}/architecture/rules", response_model=list[ArchitectureRuleResponse])
+@router.get(
+    "/projects/{project_id}/architecture/rules",
+    response_model=list[ArchitectureRuleResponse],
+    dependencies=[Depends(project_etag)],
+)
 async def list_rules(
     project_id: UUID,
     db: Annotated[AsyncSession, Depends(get_db)],
@@ -422,7 +428,11 @@ async def delete_rule(
 # ============================================================================
 
 
-@router.get("/projects/{project_id}/architecture/complexity", response_model=ComplexityAnalysisResponse)
+@router.get(
+    "/projects/{project_id}/architecture/complexity",
+    response_model=ComplexityAnalysisResponse,
+    dependencies=[Depends(project_etag)],
+)
 async def get_complexity_analysis(
     project_id: UUID,
     db: Annotated[AsyncSession, Depends(get_db)],
@@ -457,15 +467,21 @@ async def get_impact_analysis(
 # ============================================================================
 
 
-@router.get("/projects/{project_id}/architecture/shared-modules", response_model=SharedModulesResponse)
+@router.get(
+    "/projects/{project_id}/architecture/shared-modules",
+    response_model=SharedModulesResponse,
+    dependencies=[Depends(project_etag)],
+)
 async def get_shared_modules(
     project_id: UUID,
     db: Annotated[AsyncSession, Depends(get_db)],
     current_user: Annotated[User, Depends(get_current_user)],
+    skip: int = 0,
+    limit: int = 100,
 ) -> SharedModulesResponse:
-    """Get shared modules (used by multiple modules)."""
+    """Get shared modules (used by multiple modules), most used first."""
     service = ArchitectureService(db)
-    return await service.get_shared_modules(project_id)
+    return await service.get_shared_modules(project_id, skip=skip, limit=limit)
 
 
 # ============================================================================
@@ -479,17 +495,23 @@ async def analyze_module_impact_advanced(
     db: Annotated[AsyncSession, Depends(get_db)],
     current_user: Annotated[User, Depends(get_current_user)],
     change_type: str = "update",
+    path_mode: Annotated[str, Query(pattern="^(all|shortest|summary)$")] = "all",
+    max_depth: Annotated[int, Query(ge=1, le=20)] = 3,
+    max_paths: Annotated[int, Query(ge=1, le=10000)] = DEFAULT_MAX_PATHS,
 ) -> Dict[str, Any]:
     """
     ADVANCED RefMemTree: Analyze change impact with dependency tracking.
 
     Uses RefMemTree's internal dependency tracking for deeper analysis:
-    - Propagation paths
+    - Propagation paths ("all": bounded enumeration, "shortest": k shortest,
+      "summary": reachability counts only - use it on large graphs)
     - Coupling strength analysis
     - Critical dependency identification
     """
     service = ArchitectureService(db)
-    return service.analyze_module_change_impact_advanced(module_id, change_type)
+    return service.analyze_module_change_impact_advanced(
+        module_id, change_type, path_mode=path_mode, max_depth=max_depth, max_paths=max_paths
+    )
 
 
 @router.post("/modules/{module_id}/simulate-change", response_model=dict)
@@ -514,6 +536,25 @@ async def simulate_module_change(
     return service.simulate_module_change(module_id, proposed_changes)
 
 
+@router.post("/projects/{project_id}/architecture/simulate-changes", response_model=dict)
+async def simulate_architecture_changes(
+    project_id: UUID,
+    request: BatchSimulationRequest,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user)],
+) -> Dict[str, Any]:
+    """
+    Simulate many proposed changes against one graph snapshot.
+
+    Returns a result per change (validity, new cycles, rule violations,
+    affected modules) plus the combined effect of applying all of them in
+    order. Nothing is applied.
+    """
+    return await get_graph_manager().simulate_changes(
+        project_id, db, [(change.module_id, change.change) for change in request.changes]
+    )
+
+
 @router.get("/modules/{module_id}/dependency-analysis", response_model=dict)
 async def get_dependency_analysis(
     module_id: UUID,
@@ -552,6 +593,44 @@ async def validate_module_rules(
     return service.validate_module_rules(module_id)
 
 
+# ============================================================================
+# Graph Snapshots
+# ============================================================================
+
+
+@router.get("/projects/{project_id}/architecture/snapshots", response_model=list)
+async def list_graph_snapshots(
+    project_id: UUID,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user)],
+) -> List[Dict[str, Any]]:
+    """List graph snapshots (rollback candidates), oldest first."""
+    return await get_graph_manager().list_snapshots(project_id, db)
+
+
+@router.get("/projects/{project_id}/architecture/snapshots/{version_id}/diff", response_model=dict)
+async def diff_graph_snapshot(
+    project_id: UUID,
+    version_id: str,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user)],
+    against: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Diff a snapshot against another snapshot, or against the live graph.
+
+    Returns added, removed and changed nodes and edges going from the
+    snapshot to `against` (default: the current graph).
+    """
+    try:
+        return await get_graph_manager().diff_snapshots(project_id, db, version_id, against)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e),
+        ) from e
+
+
 # ============================================================================
 # AI Governor - Safe AI Plan Execution
 # ============================================================================
@@ -12,7 +12,9 @@ from datetime import datetime
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.core.graph_hydration_service import dependency_edge_metadata, module_node_data
 from backend.core.graph_manager import GraphManagerService
+from backend.core.graph_operations_service import GraphOperation
 from backend.db.models import ArchitectureModule, ModuleDependency
 from backend.modules.architecture.repository import (
     ArchitectureModuleRepository,
@@ -80,7 +82,21 @@ class AIGovernor:
         ]
 
         Uses REAL RefMemTree AIGovernor.execute_refactoring_plan()
+
+        A dry run is simulated on a copy-on-write graph overlay instead (see
+        _simulate_plan): no snapshot is taken and nothing is written.
         """
+        if dry_run:
+            if validate:
+                validation = self._validate_plan_structure(plan)
+                if not validation["valid"]:
+                    return {"status": "validation_failed", "errors": validation["errors"]}
+            try:
+                return await self._simulate_plan(project_id, plan, session)
+            except Exception as e:
+                print(f"❌ AI plan simulation error: {e}")
+                return {"status": "error", "error": str(e), "rollback_performed": False}
+
         if not AIGOVERNOR_AVAILABLE:
             return {
                 "status": "error",
@@ -103,10 +119,12 @@ class AIGovernor:
 
             # Step 2: Create snapshot if requested
             if create_snapshot:
-                # ⭐ REAL RefMemTree API
-                snapshot_id = graph.create_version(
-                    name=f"before_ai_plan_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}",
-                    description="Snapshot before AI-generated architecture plan",
+                # Through the versioning service so the snapshot can be rolled back (and persisted)
+                snapshot_id = await self.graph_manager.create_snapshot(
+                    project_id,
+                    session,
+                    f"before_ai_plan_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}",
+                    "Snapshot before AI-generated architecture plan",
                 )
                 print(f"📸 Snapshot created: {snapshot_id}")
 
@@ -119,10 +137,13 @@ class AIGovernor:
                 return {"status": "error", "error": "RefMemTree AIGovernor not available"}
             governor = RefMemAIGovernor(graph)
 
+            # The RefMemTree governor validates and simulates the plan only. The real
+            # changes are written to PostgreSQL first and then applied to the graph in
+            # one batch with the database ids (see _sync_plan_to_database).
             execution_result = governor.execute_refactoring_plan(
                 plan=refmem_plan,
                 validate_first=validate,
-                dry_run=dry_run,
+                dry_run=True,
                 create_snapshot=False,  # We already created one
             )
 
@@ -131,8 +152,7 @@ class AIGovernor:
                 # Rollback if failed
                 if snapshot_id and not dry_run and graph:  # Ensure graph is not None for rollback
                     print(f"❌ Execution failed, rolling back to {snapshot_id}")
-                    # ⭐ REAL RefMemTree API
-                    graph.rollback_to_version(snapshot_id)
+                    await self.graph_manager.rollback_to_snapshot(project_id, session, snapshot_id)
 
                 return {
                     "status": "execution_failed",
@@ -143,7 +163,7 @@ class AIGovernor:
 
             # Step 6: Apply to PostgreSQL if not dry_run
             if not dry_run:
-                print(f"💾 Syncing RefMemTree changes to PostgreSQL...")
+                print(f"💾 Syncing plan to PostgreSQL and RefMemTree...")
                 await self._sync_plan_to_database(plan, project_id, session)
 
             return {
@@ -164,12 +184,9 @@ class AIGovernor:
             # Try to rollback if we have snapshot
             if snapshot_id and not dry_run:
                 try:
-                    _, _, analytics, _ = await self.graph_manager.get_or_create_services(project_id, session)
-                    graph = analytics.graph_system
-                    if graph:  # Ensure graph is not None for rollback
-                        # ⭐ REAL RefMemTree API
-                        graph.rollback_to_version(snapshot_id)
-                        print(f"✅ Rolled back to snapshot {snapshot_id}")
+                    # Through the versioning service so derived caches see the rollback
+                    await self.graph_manager.rollback_to_snapshot(project_id, session, snapshot_id)
+                    print(f"✅ Rolled back to snapshot {snapshot_id}")
                 except Exception as rollback_err:
                     print(f"❌ Rollback also failed: {rollback_err}")
 
@@ -179,6 +196,56 @@ class AIGovernor:
                 "rollback_performed": snapshot_id is not None,
             }
 
+    async def _simulate_plan(self, project_id: UUID, plan: List[Dict[str, Any]], session: AsyncSession) -> Dict:
+        """
+        Apply a plan to an overlay of the project graph and report what it would break.
+
+        Created nodes get temporary ids (data["id"] or "plan-step-<idx>");
+        CREATE_DEPENDENCY may refer to them by id or by module name. The
+        shared graph is never modified.
+        """
+        overlay = await self.graph_manager.create_overlay(project_id, session)
+        created: Dict[str, str] = {}  # name -> temporary node id
+        counts = {"nodes_created": 0, "nodes_updated": 0, "nodes_deleted": 0, "dependencies_created": 0}
+        errors: List[str] = []
+
+        for idx, step in enumerate(plan):
+            action = step["action"]
+            try:
+                if action == "CREATE_NODE":
+                    node_id = str(step["data"].get("id") or f"plan-step-{idx}")
+                    overlay.add_node(node_id, step["data"].get("module_type", "module"), step["data"])
+                    created[step["data"]["name"]] = node_id
+                    counts["nodes_created"] += 1
+                elif action == "CREATE_DEPENDENCY":
+                    from_id = created.get(step["from"], str(step["from"]))
+                    to_id = created.get(step["to"], str(step["to"]))
+                    overlay.add_dependency(from_id, to_id, step.get("type", "depends_on"))
+                    counts["dependencies_created"] += 1
+                elif action == "UPDATE_NODE":
+                    overlay.update_node(str(step["node_id"]), step["data"].get("module_type"), step["data"])
+                    counts["nodes_updated"] += 1
+                elif action == "DELETE_NODE":
+                    overlay.remove_node(str(step["node_id"]))
+                    counts["nodes_deleted"] += 1
+            except KeyError as e:
+                errors.append(f"Step {idx}: Unknown node {e}")
+
+        violations = overlay.introduced_violations()
+        new_cycles = overlay.new_cycles()
+        blocking = [violation for violation in violations if violation["severity"] == "error"]
+        return {
+            "status": "success" if not (errors or new_cycles or blocking) else "validation_failed",
+            "snapshot_id": None,
+            **counts,
+            "errors": errors,
+            "new_cycles": new_cycles,
+            "constraint_violations": blocking,
+            "warnings": [violation for violation in violations if violation["severity"] != "error"],
+            "dry_run": True,
+            "rollback_available": False,
+        }
+
     def _validate_plan_structure(self, plan: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Validate plan has correct structure."""
         errors = []
@@ -258,13 +325,20 @@ class AIGovernor:
 
     async def _sync_plan_to_database(self, plan: List[Dict], project_id: UUID, session: AsyncSession) -> None:
         """
-        Sync executed RefMemTree plan to PostgreSQL.
+        Persist a validated plan to PostgreSQL, then apply it to the graph.
 
-        After RefMemTree successfully executes plan, we need to persist
-        the changes to database.
+        Graph nodes use the database ids, and all graph changes go through one
+        GraphManagerService.apply_batch() call (one cache invalidation).
         """
+        from backend.modules.architecture.schemas import (
+            ArchitectureModuleCreate,
+            ArchitectureModuleUpdate,
+            ModuleDependencyCreate,
+        )
+
         module_repo = ArchitectureModuleRepository(session)
         dep_repo = ModuleDependencyRepository(session)
+        operations: List[GraphOperation] = []
 
         for step in plan:
             action = step["action"]
@@ -272,10 +346,6 @@ class AIGovernor:
             try:
                 if action == "CREATE_NODE":
                     # Create module in DB
-                    from backend.modules.architecture.schemas import (
-                        ArchitectureModuleCreate,
-                    )
-
                     module_data = ArchitectureModuleCreate(
                         project_id=project_id,
                         name=step["data"]["name"],
@@ -283,31 +353,41 @@ class AIGovernor:
                         description=step["data"].get("description"),
                         level=step["data"].get("level", 0),
                     )
-                    await module_repo.create(module_data)
+                    module = await module_repo.create(module_data)
+                    operations.append(GraphOperation.add_node(module.id, module.module_type, module_node_data(module)))
 
                 elif action == "CREATE_DEPENDENCY":
                     # Create dependency in DB
-                    from backend.modules.architecture.schemas import (
-                        ModuleDependencyCreate,
-                    )
-
                     dep_data = ModuleDependencyCreate(
                         project_id=project_id,
                         from_module_id=UUID(step["from"]),
                         to_module_id=UUID(step["to"]),
                         dependency_type=step.get("type", "depends_on"),
                     )
-                    await dep_repo.create(dep_data)
+                    dependency = await dep_repo.create(dep_data)
+                    operations.append(
+                        GraphOperation.add_dependency(
+                            dependency.from_module_id,
+                            dependency.to_module_id,
+                            dependency.dependency_type,
+                            dependency_edge_metadata(dependency),
+                        )
+                    )
 
                 elif action == "UPDATE_NODE":
                     # Update module in DB
                     module_id = UUID(step["node_id"])
-                    await module_repo.update(module_id, step["data"])
+                    updated = await module_repo.update(module_id, ArchitectureModuleUpdate(**step["data"]))
+                    if updated:
+                        operations.append(
+                            GraphOperation.update_node(updated.id, updated.module_type, module_node_data(updated))
+                        )
 
                 elif action == "DELETE_NODE":
                     # Delete module from DB
                     module_id = UUID(step["node_id"])
-                    await module_repo.delete(module_id)
+                    if await module_repo.delete(module_id):
+                        operations.append(GraphOperation.remove_node(module_id))
 
             except Exception as e:
                 print(f"⚠️ Failed to sync step to DB: {action} - {e}")
@@ -315,6 +395,10 @@ class AIGovernor:
         # Commit all changes
         await session.commit()
 
+        result = await self.graph_manager.apply_batch(project_id, session, operations)
+        for failure in result["failed"]:
+            print(f"⚠️ Failed to apply plan step to graph: {failure['kind']} - {failure['error']}")
+
 
 # ============================================================================
 # Convenience Functions
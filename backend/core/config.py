@@ -55,7 +55,15 @@ class Settings(BaseSettings):
 
     # RefMemTree
     REFMEMTREE_STORAGE_PATH: str = Field(default="./data/refmemtree")
-    REFMEMTREE_CACHE_SIZE: int = Field(default=1000)
+    REFMEMTREE_CACHE_SIZE: int = Field(default=1000)  # Max hydrated projects kept in memory (0 = unlimited)
+    REFMEMTREE_CACHE_MAX_BYTES: int = Field(default=1024 * 1024 * 1024)  # Approximate memory budget (0 = unlimited)
+    REFMEMTREE_CACHE_TTL_SECONDS: int = Field(default=3600)  # Evict projects idle longer than this (0 = never)
+    REFMEMTREE_SNAPSHOTS_ENABLED: bool = Field(default=True)  # Persist graphs to REFMEMTREE_STORAGE_PATH
+    REFMEMTREE_SNAPSHOT_MAX_AGE_SECONDS: int = Field(default=7 * 24 * 3600)  # Older snapshots are ignored (0 = never)
+    REFMEMTREE_COMPACT_MIN_LINKS: int = Field(default=20000)  # Array-backed RefMemTreeManager from this size (0 = never)
+    GRAPH_ANALYTICS_BACKEND: str = Field(default="auto")  # auto | rustworkx | python
+    GRAPH_VERSION_RETENTION: int = Field(default=50)  # Snapshots kept per project (0 = unlimited)
+    GRAPH_DRIFT_CHECK_INTERVAL_SECONDS: int = Field(default=0)  # Compare cached graphs with the DB (0 = never)
 
     # Vector Database
     VECTOR_DB_TYPE: str = Field(default="pgvector")
@@ -0,0 +1,437 @@
+"""
+Graph algorithms shared by the in-memory architecture graphs.
+
+All functions work on an abstract adjacency given as a `successors(node)`
+callable, so they can run over RefMemTreeManager, a RefMemTree GraphSystem
+or any other view of a project graph without copying it.
+
+Path enumeration is bounded: every search honours a maximum depth, a
+maximum number of returned paths and a wall-clock time budget, and reports
+whether it was truncated.
+"""
+
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Generic, Hashable, Iterable, Iterator, List, Optional, Set, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+
+Successors = Callable[[K], Iterable[K]]
+
+DEFAULT_MAX_PATHS = 1000
+DEFAULT_TIME_BUDGET_SECONDS = 0.25
+
+# How many search steps run between clock checks
+_CLOCK_CHECK_INTERVAL = 256
+# Hard cap on queued partial paths in breadth-first (k-shortest) search, per requested path
+_FRONTIER_PER_PATH = 100
+
+
+class PathSearchLimits:
+    """Bounds for path enumeration (0 disables max_paths / time budget)."""
+
+    def __init__(
+        self,
+        max_depth: int = 5,
+        max_paths: int = DEFAULT_MAX_PATHS,
+        time_budget_seconds: float = DEFAULT_TIME_BUDGET_SECONDS,
+    ):
+        self.max_depth = max_depth
+        self.max_paths = max_paths
+        self.time_budget_seconds = time_budget_seconds
+
+
+class PathSearchResult(Generic[K]):
+    """Paths found by a bounded search."""
+
+    def __init__(self, paths: List[List[K]], truncated_by: Optional[str] = None):
+        self.paths = paths
+        self.truncated_by = truncated_by  # None, "max_paths", "time_budget" or "frontier"
+
+    @property
+    def truncated(self) -> bool:
+        return self.truncated_by is not None
+
+
+class ReachabilitySummary(Generic[K]):
+    """
+    Aggregated reachability from a source node (no path enumeration).
+
+    min_depth: shortest hop distance for every node reachable within max_depth.
+    max_depth / path_counts: longest distance and number of distinct paths from
+    the source, computed by dynamic programming over the reachable subgraph.
+    Only available when that subgraph is a DAG (is_dag), otherwise None.
+    """
+
+    def __init__(
+        self,
+        source: K,
+        min_depth: Dict[K, int],
+        max_depth: Optional[Dict[K, int]],
+        path_counts: Optional[Dict[K, int]],
+        is_dag: bool,
+    ):
+        self.source = source
+        self.min_depth = min_depth
+        self.max_depth = max_depth
+        self.path_counts = path_counts
+        self.is_dag = is_dag
+
+    @property
+    def reachable(self) -> Set[K]:
+        return set(self.min_depth)
+
+    @property
+    def depth(self) -> int:
+        """Longest distance from the source (shortest if the subgraph has cycles)."""
+        depths = self.max_depth if self.max_depth is not None else self.min_depth
+        return max(depths.values(), default=0)
+
+
+class _Deadline:
+    def __init__(self, budget_seconds: float):
+        self._deadline = time.perf_counter() + budget_seconds if budget_seconds > 0 else None
+        self._steps = 0
+
+    def expired(self) -> bool:
+        if self._deadline is None:
+            return False
+        self._steps += 1
+        if self._steps % _CLOCK_CHECK_INTERVAL:
+            return False
+        return time.perf_counter() > self._deadline
+
+
+def enumerate_paths(source: K, successors: Successors[K], limits: PathSearchLimits) -> PathSearchResult[K]:
+    """
+    Enumerate simple paths from source that end at a leaf (node with no successors).
+
+    Depth-first with a single shared path buffer - paths are only copied when
+    emitted. Paths longer than limits.max_depth are not followed, and a branch
+    whose successors all lie on the current path (a cycle) emits nothing.
+    """
+    paths: List[List[K]] = []
+    if limits.max_depth < 1:
+        return PathSearchResult(paths)
+
+    root_children = list(successors(source))
+    if not root_children:
+        return PathSearchResult([[source]])
+
+    deadline = _Deadline(limits.time_budget_seconds)
+    path: List[K] = [source]
+    on_path: Set[K] = {source}
+    stack: List[Iterator[K]] = [iter(root_children)]
+
+    while stack:
+        if deadline.expired():
+            return PathSearchResult(paths, "time_budget")
+
+        child = next(stack[-1], None)
+        if child is None:
+            stack.pop()
+            on_path.discard(path.pop())
+            continue
+        if child in on_path or len(path) >= limits.max_depth:
+            continue
+
+        grandchildren = list(successors(child))
+        if not grandchildren:
+            paths.append(path + [child])
+            if limits.max_paths and len(paths) >= limits.max_paths:
+                return PathSearchResult(paths, "max_paths")
+            continue
+
+        path.append(child)
+        on_path.add(child)
+        stack.append(iter(grandchildren))
+
+    return PathSearchResult(paths)
+
+
+def k_shortest_paths(source: K, successors: Successors[K], limits: PathSearchLimits) -> PathSearchResult[K]:
+    """
+    Return up to limits.max_paths leaf-terminated simple paths, shortest first.
+
+    Breadth-first over partial paths, so the first k paths emitted are the k
+    shortest (ties in discovery order). Same leaf/cycle/depth semantics as
+    enumerate_paths().
+    """
+    paths: List[List[K]] = []
+    if limits.max_depth < 1:
+        return PathSearchResult(paths)
+
+    k = limits.max_paths or DEFAULT_MAX_PATHS
+    frontier_cap = max(10_000, k * _FRONTIER_PER_PATH)
+    deadline = _Deadline(limits.time_budget_seconds)
+    queue: Deque[List[K]] = deque([[source]])
+
+    while queue:
+        if deadline.expired():
+            return PathSearchResult(paths, "time_budget")
+
+        path = queue.popleft()
+        children = list(successors(path[-1]))
+        if not children:
+            paths.append(path)
+            if len(paths) >= k:
+                return PathSearchResult(paths, "max_paths" if queue else None)
+            continue
+        if len(path) >= limits.max_depth:
+            continue
+
+        for child in children:
+            if child not in path:
+                queue.append(path + [child])
+        if len(queue) > frontier_cap:
+            return PathSearchResult(paths, "frontier")
+
+    return PathSearchResult(paths)
+
+
+def reachability_summary(
+    source: K,
+    successors: Successors[K],
+    max_depth: Optional[int] = None,
+) -> ReachabilitySummary[K]:
+    """
+    Summarise everything reachable from source in O(V + E).
+
+    Breadth-first search gives the shortest depth per node (bounded by
+    max_depth when given). If the reachable subgraph is acyclic, a pass in
+    topological order adds longest depth and path counts per node - the
+    aggregate answer to "all paths" queries without enumerating them.
+    """
+    min_depth: Dict[K, int] = {source: 0}
+    queue: Deque[K] = deque([source])
+    while queue:
+        node = queue.popleft()
+        depth = min_depth[node]
+        if max_depth is not None and depth >= max_depth:
+            continue
+        for child in successors(node):
+            if child not in min_depth:
+                min_depth[child] = depth + 1
+                queue.append(child)
+
+    # Kahn's algorithm over the reachable subgraph
+    edges: Dict[K, List[K]] = {}
+    in_degree: Dict[K, int] = dict.fromkeys(min_depth, 0)
+    for node in min_depth:
+        children = [c for c in successors(node) if c in in_degree]
+        edges[node] = children
+        for child in children:
+            in_degree[child] += 1
+
+    order: List[K] = []
+    ready: Deque[K] = deque(node for node, degree in in_degree.items() if degree == 0)
+    while ready:
+        node = ready.popleft()
+        order.append(node)
+        for child in edges[node]:
+            in_degree[child] -= 1
+            if in_degree[child] == 0:
+                ready.append(child)
+
+    del min_depth[source]
+    if len(order) != len(in_degree):
+        return ReachabilitySummary(source, min_depth, None, None, is_dag=False)
+
+    longest: Dict[K, int] = {source: 0}
+    counts: Dict[K, int] = {source: 1}
+    for node in order:
+        if node not in longest:
+            continue  # Unreachable from source inside the subgraph (cannot happen, kept for safety)
+        for child in edges[node]:
+            longest[child] = max(longest.get(child, 0), longest[node] + 1)
+            counts[child] = counts.get(child, 0) + counts[node]
+
+    del longest[source]
+    del counts[source]
+    return ReachabilitySummary(source, min_depth, longest, counts, is_dag=True)
+
+
+def strongly_connected_components(nodes: Iterable[K], successors: Successors[K]) -> List[List[K]]:
+    """
+    Tarjan's algorithm, iterative (no recursion limit on deep graphs). O(V + E).
+
+    Components are returned in reverse topological order of the condensation
+    (a component is emitted before any component that depends on it).
+    """
+    index: Dict[K, int] = {}
+    lowlink: Dict[K, int] = {}
+    on_stack: Set[K] = set()
+    stack: List[K] = []
+    components: List[List[K]] = []
+    counter = 0
+
+    for root in nodes:
+        if root in index:
+            continue
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        work: List[Tuple[K, Iterator[K]]] = [(root, iter(successors(root)))]
+
+        while work:
+            node, children = work[-1]
+            advanced = False
+            for child in children:
+                if child not in index:
+                    index[child] = lowlink[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(successors(child))))
+                    advanced = True
+                    break
+                if child in on_stack:
+                    lowlink[node] = min(lowlink[node], index[child])
+            if advanced:
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+            if lowlink[node] == index[node]:
+                component: List[K] = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+
+    return components
+
+
+def component_cycle(component: List[K], successors: Successors[K]) -> List[K]:
+    """
+    Shortest cycle through the first node of a strongly connected component.
+
+    The cycle is closed (first node repeated at the end). Returns [] for a
+    single-node component without a self-loop. Breadth-first within the
+    component, so O(V + E) of the component.
+    """
+    start = component[0]
+    members = set(component)
+    parent: Dict[K, K] = {}
+    queue: Deque[K] = deque([start])
+    while queue:
+        node = queue.popleft()
+        for child in successors(node):
+            if child == start:
+                path = [node]
+                while path[-1] != start:
+                    path.append(parent[path[-1]])
+                return path[::-1] + [start]
+            if child in members and child not in parent:
+                parent[child] = node
+                queue.append(child)
+    return []
+
+
+def find_cycles(nodes: Iterable[K], successors: Successors[K]) -> List[List[K]]:
+    """
+    One representative cycle per cyclic strongly connected component.
+
+    Every cycle lies inside one component, so the graph is acyclic exactly
+    when this is empty; unlike enumerating elementary cycles, the result is
+    bounded by the number of nodes.
+    """
+    cycles: List[List[K]] = []
+    for component in strongly_connected_components(nodes, successors):
+        cycle = component_cycle(component, successors)
+        if cycle:
+            cycles.append(cycle)
+    return cycles
+
+
+def topological_sort(nodes: Iterable[K], successors: Successors[K]) -> Optional[List[K]]:
+    """Kahn's algorithm. Returns None if the graph has a cycle."""
+    node_list = list(nodes)
+    in_degree: Dict[K, int] = dict.fromkeys(node_list, 0)
+    for node in node_list:
+        for child in successors(node):
+            if child in in_degree:
+                in_degree[child] += 1
+
+    ready: Deque[K] = deque(node for node in node_list if in_degree[node] == 0)
+    order: List[K] = []
+    while ready:
+        node = ready.popleft()
+        order.append(node)
+        for child in successors(node):
+            if child in in_degree:
+                in_degree[child] -= 1
+                if in_degree[child] == 0:
+                    ready.append(child)
+
+    return order if len(order) == len(node_list) else None
+
+
+def shortest_path(source: K, target: K, successors: Successors[K]) -> Optional[List[K]]:
+    """Unweighted shortest path by breadth-first search, or None if unreachable."""
+    parent: Dict[K, Optional[K]] = {source: None}
+    queue: Deque[K] = deque([source])
+    while queue:
+        node = queue.popleft()
+        if node == target:
+            path = [node]
+            while parent[path[-1]] is not None:
+                path.append(parent[path[-1]])  # type: ignore[arg-type]
+            return path[::-1]
+        for child in successors(node):
+            if child not in parent:
+                parent[child] = node
+                queue.append(child)
+    return None
+
+
+def betweenness_centrality(nodes: Iterable[K], successors: Successors[K]) -> Dict[K, float]:
+    """
+    Brandes' betweenness centrality for an unweighted directed graph. O(V * E).
+
+    Normalised by 1 / ((n - 1)(n - 2)), matching rustworkx's default.
+    """
+    node_list = list(nodes)
+    known = set(node_list)
+    centrality: Dict[K, float] = dict.fromkeys(node_list, 0.0)
+
+    for source in node_list:
+        order: List[K] = []
+        preds: Dict[K, List[K]] = {source: []}
+        sigma: Dict[K, int] = {source: 1}
+        dist: Dict[K, int] = {source: 0}
+        queue: Deque[K] = deque([source])
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            for child in successors(node):
+                if child not in known:
+                    continue
+                if child not in dist:
+                    dist[child] = dist[node] + 1
+                    sigma[child] = 0
+                    preds[child] = []
+                    queue.append(child)
+                if dist[child] == dist[node] + 1:
+                    sigma[child] += sigma[node]
+                    preds[child].append(node)
+
+        delta: Dict[K, float] = dict.fromkeys(order, 0.0)
+        for node in reversed(order):
+            for pred in preds[node]:
+                delta[pred] += sigma[pred] / sigma[node] * (1 + delta[node])
+            if node != source:
+                centrality[node] += delta[node]
+
+    n = len(node_list)
+    if n > 2:
+        scale = 1 / ((n - 1) * (n - 2))
+        for node in centrality:
+            centrality[node] *= scale
+    return centrality
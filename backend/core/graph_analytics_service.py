@@ -1,19 +1,81 @@
-from typing import Dict, Optional, List, Any, Callable, Type
-from uuid import UUID
+from typing import Dict, Optional, List, Any, Callable, Mapping, Sequence, Tuple, Type
+from uuid import UUID, uuid4
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.core.config import settings
+from backend.core.graph_algorithms import (
+    PathSearchLimits,
+    betweenness_centrality,
+    enumerate_paths,
+    reachability_summary,
+    shortest_path,
+    strongly_connected_components,
+    topological_sort,
+)
+from backend.core.graph_mirror import RUSTWORKX_AVAILABLE, RustworkxGraphMirror
+from backend.core.graph_overlay import GraphOverlay
+from backend.core.graph_revision import GraphChange, GraphRevision
+from backend.core.rule_engine import CompiledRule, RuleEngine
 from refmemtree import GraphSystem, GraphNode
 
+# Transitive closure results kept per project (cleared when the graph changes)
+CLOSURE_CACHE_MAX_ENTRIES = 1024
+# Elementary cycles can be exponential in number; report at most this many
+MAX_REPORTED_CYCLES = 100
+
+
+def simulation_result(overlay: GraphOverlay, affected: Mapping[str, int]) -> dict:
+    """simulate_change() result for an overlay; affected maps dependent ids to their distance."""
+    violations = overlay.introduced_violations()
+    cycles = overlay.new_cycles()
+    errors = [violation for violation in violations if violation["severity"] == "error"]
+    return {
+        "simulation_id": str(uuid4()),
+        "valid": not errors and not cycles,
+        "affected_nodes": sorted(affected, key=lambda node_id: (affected[node_id], node_id)),
+        "constraint_violations": errors + [{"rule": "no_cycles", "cycle": cycle} for cycle in cycles],
+        "warnings": [violation for violation in violations if violation["severity"] != "error"],
+        "new_cycles": cycles,
+        "rollback_available": True,  # Nothing was applied
+    }
+
 
 class GraphAnalyticsService:
-    def __init__(self, graph_system: GraphSystem):
+    def __init__(
+        self,
+        graph_system: GraphSystem,
+        revision: Optional[GraphRevision] = None,
+        use_rustworkx: Optional[bool] = None,
+        rules: Optional[Mapping[UUID, CompiledRule]] = None,
+    ):
         self.graph_system = graph_system
+        self.revision = revision or GraphRevision()
+        # Compiled project rules (hydration's live mapping); None: use RefMemTree's rule engine
+        self.rule_engine = RuleEngine(graph_system, rules, self.revision) if rules is not None else None
+        self._closure_cache: Dict[Tuple[str, int], Dict] = {}
+        self._closure_cache_version = self.revision.version
+
+        if use_rustworkx is None:
+            use_rustworkx = settings.GRAPH_ANALYTICS_BACKEND != "python"
+            if settings.GRAPH_ANALYTICS_BACKEND == "rustworkx" and not RUSTWORKX_AVAILABLE:
+                print("⚠️  GRAPH_ANALYTICS_BACKEND=rustworkx but rustworkx is not installed, using Python")
+        self.use_rustworkx = use_rustworkx and RUSTWORKX_AVAILABLE
+        self._mirror: Optional[RustworkxGraphMirror] = None
+        self._mirror_version = -1
+        self.revision.subscribe(self._on_graph_change)
+
+    @property
+    def backend(self) -> str:
+        return "rustworkx" if self.use_rustworkx else "python"
 
     async def detect_circular_dependencies(self) -> List[List[str]]:
         """
-        Detect circular dependencies using RefMemTree.
+        Detect circular dependencies (at most MAX_REPORTED_CYCLES cycles).
         """
+        mirror = self._current_mirror()
+        if mirror is not None:
+            return mirror.simple_cycles(MAX_REPORTED_CYCLES)
         try:
             cycles: List[List[str]] = self.graph_system.dependency_tracker.find_circular_dependencies()
             return cycles
@@ -52,40 +114,96 @@ class GraphAnalyticsService:
             print(f"Failed to calculate impact: {e}")
             return {"error": str(e)}
 
+    def overlay(self) -> GraphOverlay:
+        """Copy-on-write what-if view over this graph (with the project's compiled rules)."""
+        rules = self.rule_engine.rules if self.rule_engine is not None else None
+        return GraphOverlay(self.graph_system, rules, self.revision)
+
     async def simulate_change(
         self,
         node_id: UUID,
         proposed_change: dict,
     ) -> dict:
         """
-        Simulate change using RefMemTree without applying it.
+        Simulate a change to one node without applying it.
+
+        The change (GraphOverlay.apply_change format) is recorded on an
+        overlay; cycles it closes, rule violations it introduces and the
+        modules depending on the node are computed against base plus delta.
+        The live graph is not touched.
         """
         try:
-            simulation = self.graph_system.simulate_change(
-                node_id=str(node_id),
-                change=proposed_change,
-                dry_run=True,
-                include_rollback=True,
-                validate=True,
-            )
-
-            return {
-                "simulation_id": simulation.id,
-                "valid": simulation.is_valid,
-                "affected_nodes": [n.id for n in simulation.affected_nodes],
-                "constraint_violations": simulation.constraint_violations,
-                "warnings": simulation.warnings,
-                "rollback_available": simulation.can_rollback,
-            }
+            overlay = self.overlay()
+            if not overlay.has_node(str(node_id)):
+                return {"error": "Node not found"}
+            affected = overlay.impact(str(node_id))
+            overlay.apply_change(str(node_id), proposed_change)
+            return simulation_result(overlay, affected)
         except Exception as e:
             print(f"Failed to simulate change: {e}")
             return {"error": str(e)}
 
+    async def simulate_changes(self, changes: Sequence[Tuple[UUID, dict]]) -> dict:
+        """
+        Simulate many (node_id, proposed_change) pairs against one graph snapshot.
+
+        Every change is evaluated on its own fork of a single overlay; forks
+        share the base adjacency memo, and the dependents of each changed node
+        are computed once however many changes target it. "combined" is the
+        effect of applying all changes in order; changes that cannot be
+        applied on top of the earlier ones are listed in its "conflicts".
+        """
+        base = self.overlay()
+        combined = base.fork()
+        impacts: Dict[str, Dict[str, int]] = {}
+        combined_affected: Dict[str, int] = {}
+        conflicts: List[int] = []
+        results: List[dict] = []
+
+        for index, (node_id, proposed_change) in enumerate(changes):
+            key = str(node_id)
+            if not base.has_node(key):
+                results.append({"index": index, "node_id": key, "error": "Node not found"})
+                continue
+            if key not in impacts:
+                impacts[key] = base.impact(key)
+            try:
+                overlay = base.fork()
+                overlay.apply_change(key, proposed_change)
+            except KeyError as e:
+                results.append({"index": index, "node_id": key, "error": f"Node not found: {e}"})
+                continue
+            results.append({"index": index, "node_id": key, **simulation_result(overlay, impacts[key])})
+
+            try:
+                candidate = combined.fork()  # A conflicting change must not be half-applied
+                candidate.apply_change(key, proposed_change)
+            except KeyError:
+                conflicts.append(index)
+                continue
+            combined = candidate
+            for affected_id, distance in impacts[key].items():
+                combined_affected[affected_id] = min(distance, combined_affected.get(affected_id, distance))
+
+        combined_affected = {node_id: d for node_id, d in combined_affected.items() if combined.has_node(node_id)}
+        return {
+            "graph_version": base.base_version,
+            "results": results,
+            "combined": {**simulation_result(combined, combined_affected), "conflicts": conflicts},
+        }
+
     async def validate_rules(self) -> dict:
         """
-        Validate all architecture rules using RefMemTree.
+        Validate all architecture rules.
+
+        With compiled rules, violations are kept up to date incrementally and
+        only nodes touched since the last call are re-evaluated; otherwise
+        RefMemTree's rule engine runs every validator over every node.
         """
         try:
+            if self.rule_engine is not None:
+                return self.rule_engine.report()
+
             validation = self.graph_system.validate_rules(
                 node_types=["module", "service", "component"],
                 fail_fast=False,
@@ -126,16 +244,127 @@ class GraphAnalyticsService:
     ) -> Dict:
         """
         Get full dependency chains (transitive dependencies).
+
+        Breadth-first closure over outgoing dependencies up to max_depth hops,
+        with the shortest depth of every dependency and the (bounded) chains
+        from the node to its leaf dependencies. Results are cached until the
+        graph revision changes.
         """
+        if self._closure_cache_version != self.revision.version:
+            self._closure_cache.clear()
+            self._closure_cache_version = self.revision.version
+
+        key = (str(node_id), max_depth)
+        cached = self._closure_cache.get(key)
+        if cached is not None:
+            return cached
+
         try:
-            all_deps = self.graph_system.dependency_tracker.get_all_dependencies(str(node_id))
+            if not self.graph_system.get_node(str(node_id)):
+                return {"error": "Node not found"}
 
-            return {
+            mirror = self._current_mirror()
+            if mirror is not None:
+                depths = mirror.dependency_depths(str(node_id), max_depth)
+            else:
+                depths = reachability_summary(str(node_id), self._outgoing, max_depth).min_depth
+            chains = enumerate_paths(str(node_id), self._outgoing, PathSearchLimits(max_depth=max_depth + 1))
+
+            result = {
                 "node_id": str(node_id),
-                "dependency_chains": [],  # Not available in this version
-                "total_unique_dependencies": len(all_deps),
-                "max_depth": 0,  # Not available in this version
+                "dependencies": [
+                    {"node_id": dep_id, "depth": depth}
+                    for dep_id, depth in sorted(depths.items(), key=lambda item: (item[1], item[0]))
+                ],
+                "dependency_chains": [path for path in chains.paths if len(path) > 1],
+                "chains_truncated": chains.truncated,
+                "total_unique_dependencies": len(depths),
+                "max_depth": max(depths.values(), default=0),
+                "graph_version": self.revision.version,
             }
-
         except Exception as e:
             return {"error": f"Failed to get transitive deps: {e}"}
+
+        if len(self._closure_cache) >= CLOSURE_CACHE_MAX_ENTRIES:
+            self._closure_cache.clear()
+        self._closure_cache[key] = result
+        return result
+
+    async def get_strongly_connected_components(self) -> List[List[str]]:
+        """Groups of modules that all (transitively) depend on each other."""
+        mirror = self._current_mirror()
+        if mirror is not None:
+            components = mirror.strongly_connected_components()
+        else:
+            components = strongly_connected_components(self._node_ids(), self._outgoing)
+        return [component for component in components if len(component) > 1]
+
+    async def get_topological_order(self) -> Optional[List[str]]:
+        """Modules ordered so every module comes before its dependencies (None if cyclic)."""
+        mirror = self._current_mirror()
+        if mirror is not None:
+            return mirror.topological_order()
+        return topological_sort(self._node_ids(), self._outgoing)
+
+    async def get_shortest_path(self, from_node_id: UUID, to_node_id: UUID) -> Optional[List[str]]:
+        """Shortest dependency path from one module to another."""
+        mirror = self._current_mirror()
+        if mirror is not None:
+            return mirror.shortest_path(str(from_node_id), str(to_node_id))
+        if not self.graph_system.get_node(str(from_node_id)):
+            return None
+        return shortest_path(str(from_node_id), str(to_node_id), self._outgoing)
+
+    async def get_betweenness_centrality(self) -> Dict[str, float]:
+        """How often each module lies on shortest dependency paths between others."""
+        mirror = self._current_mirror()
+        if mirror is not None:
+            return mirror.betweenness_centrality()
+        return betweenness_centrality(self._node_ids(), self._outgoing)
+
+    async def get_degree_stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-module in/out degree and summed incoming dependency strength."""
+        mirror = self._current_mirror()
+        if mirror is not None:
+            return mirror.degree_stats()
+        stats: Dict[str, Dict[str, float]] = {}
+        for node in self.graph_system.get_all_nodes():
+            incoming = node.get_dependencies(direction="incoming")
+            stats[str(node.id)] = {
+                "in_degree": len(incoming),
+                "out_degree": len(node.get_dependencies(direction="outgoing")),
+                "in_weight": sum(getattr(dep, "strength", 1.0) for dep in incoming),
+            }
+        return stats
+
+    def _current_mirror(self) -> Optional[RustworkxGraphMirror]:
+        """The rustworkx mirror, rebuilt if the graph changed outside the operations service."""
+        if not self.use_rustworkx:
+            return None
+        if self._mirror is None or self._mirror_version != self.revision.version:
+            try:
+                self._mirror = RustworkxGraphMirror.from_graph_system(self.graph_system)
+            except Exception as e:
+                print(f"⚠️  Failed to build rustworkx mirror, using Python analytics: {e}")
+                self.use_rustworkx = False
+                self._mirror = None
+                return None
+            self._mirror_version = self.revision.version
+        return self._mirror
+
+    def _on_graph_change(self, version: int, changes: Optional[Sequence[GraphChange]]) -> None:
+        """Keep the mirror in step with operations-service mutations; otherwise let it go stale."""
+        if self._mirror is None or changes is None or self._mirror_version != version - 1:
+            return
+        for change in changes:
+            self._mirror.apply(change)
+        self._mirror_version = version
+
+    def _node_ids(self) -> List[str]:
+        return [str(node.id) for node in self.graph_system.get_all_nodes()]
+
+    def _outgoing(self, node_id: str) -> List[str]:
+        node = self.graph_system.get_node(node_id)
+        if not node:
+            return []
+        return [str(dep.target_node_id) for dep in node.get_dependencies(direction="outgoing")]
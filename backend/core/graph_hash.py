@@ -0,0 +1,319 @@
+"""
+Merkle-style content hash of a project graph.
+
+Every node (type, data and outgoing edges) and every rule is a leaf,
+assigned to one of MERKLE_BUCKETS buckets by a hash of its id. A bucket's
+value is the sum of its leaf digests (mod 2**128), so adding, changing or
+removing a leaf costs O(1) there; the buckets are the leaves of a complete
+binary tree of blake2b digests, so the root follows in O(log buckets).
+
+The root is a strong ETag for anything derived from the graph. Comparing
+two trees top-down (diff_buckets) finds the buckets that differ without
+visiting the rest - drift detection compares the in-memory graph with a
+tree built from the database rows and reloads only the differing leaves.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.graph_hydration_service import GraphHydrationService, module_node_data
+from backend.core.graph_revision import GraphChange, GraphRevision
+from backend.db.models import ArchitectureModule, ArchitectureRule, ModuleDependency
+from refmemtree import GraphSystem
+
+# Number of tree leaves (power of two); depth is log2(MERKLE_BUCKETS)
+MERKLE_BUCKETS = 1024
+
+_MASK = (1 << 128) - 1
+
+# Leaf key prefixes (followed by the node / rule UUID)
+NODE_KEY_PREFIX = "n:"
+RULE_KEY_PREFIX = "r:"
+
+# (target_id, dependency_type, description, dependency_metadata)
+Edge = Tuple[str, str, Optional[str], Dict[str, Any]]
+
+
+def _digest(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def combine_hashes(*parts: Any) -> str:
+    """Hex digest of several values (e.g. a root hash and table watermarks)."""
+    return _digest("|".join(str(part) for part in parts).encode()).hex()
+
+
+def leaf_digest(content: Any) -> int:
+    return int.from_bytes(_digest(json.dumps(content, sort_keys=True, default=str).encode()), "big")
+
+
+def node_leaf(node_type: str, data: Any, edges: Iterable[Edge]) -> int:
+    ordered = sorted(edges, key=_edge_order)
+    return leaf_digest([node_type, data, ordered])
+
+
+def _edge_order(edge: Edge) -> Tuple[str, str, str, str]:
+    return edge[0], edge[1], edge[2] or "", json.dumps(edge[3], sort_keys=True, default=str)
+
+
+def rule_leaf(rule_type: str, level: str, module_id: Optional[UUID], rule_definition: Any) -> int:
+    return leaf_digest([rule_type, level, str(module_id) if module_id else None, rule_definition])
+
+
+def node_key(node_id: Any) -> str:
+    return f"{NODE_KEY_PREFIX}{node_id}"
+
+
+def rule_key(rule_id: Any) -> str:
+    return f"{RULE_KEY_PREFIX}{rule_id}"
+
+
+class MerkleTree:
+    """Fixed-depth Merkle tree over bucketed, order-independent leaf sums."""
+
+    def __init__(self, buckets: int = MERKLE_BUCKETS, leaves: Optional[Dict[str, int]] = None) -> None:
+        self.buckets = buckets
+        self.leaves: Dict[str, int] = {}  # key -> digest
+        self._sums = [0] * buckets
+        for key, digest in (leaves or {}).items():
+            self.leaves[key] = digest
+            bucket = self.bucket_of(key)
+            self._sums[bucket] = (self._sums[bucket] + digest) & _MASK
+        # Heap layout: node i has children 2i and 2i + 1, bucket b sits at buckets + b
+        self._tree: List[bytes] = [b""] * (2 * buckets)
+        for bucket, total in enumerate(self._sums):
+            self._tree[buckets + bucket] = total.to_bytes(16, "big")
+        for position in range(buckets - 1, 0, -1):
+            self._tree[position] = _digest(self._tree[2 * position] + self._tree[2 * position + 1])
+
+    @property
+    def root(self) -> str:
+        return self._tree[1].hex()
+
+    def bucket_of(self, key: str) -> int:
+        return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=4).digest(), "big") % self.buckets
+
+    def set(self, key: str, digest: Optional[int]) -> None:
+        """Add, replace or (digest None) remove one leaf. O(log buckets)."""
+        old = self.leaves.pop(key, None)
+        if digest is not None:
+            self.leaves[key] = digest
+        if old == digest:
+            return
+        bucket = self.bucket_of(key)
+        total = (self._sums[bucket] - (old or 0) + (digest or 0)) & _MASK
+        self._sums[bucket] = total
+        position = self.buckets + bucket
+        self._tree[position] = total.to_bytes(16, "big")
+        position //= 2
+        while position:
+            self._tree[position] = _digest(self._tree[2 * position] + self._tree[2 * position + 1])
+            position //= 2
+
+    def diff_buckets(self, other: "MerkleTree") -> List[int]:
+        """Buckets whose contents differ, descending only into differing subtrees."""
+        if other.buckets != self.buckets:
+            raise ValueError("Merkle trees with different bucket counts cannot be compared")
+        differing: List[int] = []
+        stack = [1]
+        while stack:
+            position = stack.pop()
+            if self._tree[position] == other._tree[position]:
+                continue
+            if position >= self.buckets:
+                differing.append(position - self.buckets)
+            else:
+                stack.extend((2 * position + 1, 2 * position))
+        return sorted(differing)
+
+    def diff_keys(self, other: "MerkleTree") -> Set[str]:
+        """Leaf keys that are missing from one tree or have different digests."""
+        buckets = set(self.diff_buckets(other))
+        if not buckets:
+            return set()
+        keys = {key for key in self.leaves if self.bucket_of(key) in buckets}
+        keys |= {key for key in other.leaves if other.bucket_of(key) in buckets}
+        return {key for key in keys if self.leaves.get(key) != other.leaves.get(key)}
+
+    @property
+    def size_bytes(self) -> int:
+        # Leaf dict entry (key string + int) and the bucket arrays
+        return 150 * len(self.leaves) + 90 * self.buckets
+
+
+class GraphMerkleHash:
+    """
+    Merkle hash of one project graph, kept in step with its mutations.
+
+    Follows the GraphChanges of every revision bump: a mutation rehashes the
+    touched nodes (and, for removals, the nodes that pointed at them). A bump
+    of unknown extent (delta refresh, rollback) drops the tree; it is rebuilt
+    on next access. Rules change only through hydration, so rule leaves are
+    refreshed by those rebuilds.
+    """
+
+    def __init__(
+        self,
+        graph_system: GraphSystem,
+        hydration: GraphHydrationService,
+        revision: GraphRevision,
+        buckets: int = MERKLE_BUCKETS,
+    ) -> None:
+        self.graph_system = graph_system
+        self.hydration = hydration
+        self.buckets = buckets
+        self._tree: Optional[MerkleTree] = None
+        self._incoming: Dict[str, Set[str]] = {}  # node_id -> nodes with an edge to it
+        self._version = revision.version  # Last revision event seen
+        revision.subscribe(self._on_graph_change)
+
+    @property
+    def tree(self) -> MerkleTree:
+        return self.refresh()
+
+    def refresh(self) -> MerkleTree:
+        """Build the tree now if it is missing (first use or after an unknown change)."""
+        if self._tree is None:
+            self._tree = self._build()
+        return self._tree
+
+    @property
+    def root(self) -> str:
+        return self.tree.root
+
+    @property
+    def size_bytes(self) -> int:
+        if self._tree is None:
+            return 0
+        return self._tree.size_bytes + 100 * len(self._incoming)
+
+    def _build(self) -> MerkleTree:
+        leaves: Dict[str, int] = {}
+        self._incoming = {}
+        for node in self.graph_system.get_all_nodes():
+            node_id = str(node.id)
+            edges = _edges(node)
+            leaves[node_key(node_id)] = node_leaf(node.node_type, node.data, edges)
+            for target_id, *_ in edges:
+                self._incoming.setdefault(target_id, set()).add(node_id)
+        for rule_id, row in self.hydration._rule_rows.items():
+            leaves[rule_key(rule_id)] = rule_leaf(
+                row["rule_type"], row["level"], row["module_id"], row["rule_definition"]
+            )
+        return MerkleTree(self.buckets, leaves)
+
+    def _rehash(self, node_id: str) -> None:
+        node = self.graph_system.get_node(node_id)
+        if node is None:
+            self.tree.set(node_key(node_id), None)
+        else:
+            self.tree.set(node_key(node_id), node_leaf(node.node_type, node.data, _edges(node)))
+
+    def _on_graph_change(self, version: int, changes: Optional[Sequence[GraphChange]]) -> None:
+        missed = version != self._version + 1  # A skipped change list: rebuild rather than patch
+        self._version = version
+        if self._tree is None:
+            return  # Rebuilt on next access
+        if changes is None or missed:
+            self._tree = None
+            self._incoming = {}
+            return
+
+        touched: Set[str] = set()
+        for change in changes:
+            touched.add(change.node_id)
+            if change.kind == GraphChange.REMOVE_NODE:
+                # Edges into a removed node go with it
+                touched |= self._incoming.pop(change.node_id, set())
+            elif change.kind == GraphChange.ADD_DEPENDENCY and change.target_id is not None:
+                self._incoming.setdefault(change.target_id, set()).add(change.node_id)
+        for node_id in touched:
+            self._rehash(node_id)
+
+
+async def database_tree(project_id: UUID, session: AsyncSession, buckets: int = MERKLE_BUCKETS) -> MerkleTree:
+    """
+    Merkle tree of the graph a full hydration of project_id would build now.
+
+    Reads the same columns as GraphHydrationService.hydrate_streaming but
+    only keeps one digest per node and rule.
+    """
+    edges: Dict[str, List[Edge]] = {}
+    dependency_rows = await session.execute(
+        select(
+            ModuleDependency.from_module_id,
+            ModuleDependency.to_module_id,
+            ModuleDependency.dependency_type,
+            ModuleDependency.description,
+            ModuleDependency.dependency_metadata,
+        ).where(ModuleDependency.project_id == project_id)
+    )
+    for from_id, to_id, dependency_type, description, metadata in dependency_rows:
+        edges.setdefault(str(from_id), []).append((str(to_id), dependency_type, description, metadata or {}))
+
+    leaves: Dict[str, int] = {}
+    module_rows = await session.execute(
+        select(
+            ArchitectureModule.id,
+            ArchitectureModule.name,
+            ArchitectureModule.description,
+            ArchitectureModule.module_type,
+            ArchitectureModule.level,
+            ArchitectureModule.status,
+            ArchitectureModule.ai_generated,
+            ArchitectureModule.module_metadata,
+        ).where(ArchitectureModule.project_id == project_id)
+    )
+    for module in module_rows:
+        node_id = str(module.id)
+        leaves[node_key(node_id)] = node_leaf(module.module_type, module_node_data(module), edges.get(node_id, []))
+
+    rule_rows = await session.execute(
+        select(
+            ArchitectureRule.id,
+            ArchitectureRule.module_id,
+            ArchitectureRule.rule_type,
+            ArchitectureRule.level,
+            ArchitectureRule.rule_definition,
+        ).where(ArchitectureRule.project_id == project_id)
+    )
+    for rule in rule_rows:
+        leaves[rule_key(rule.id)] = rule_leaf(rule.rule_type, rule.level, rule.module_id, rule.rule_definition)
+
+    return MerkleTree(buckets, leaves)
+
+
+async def database_watermarks(project_id: UUID, session: AsyncSession) -> Tuple[Any, ...]:
+    """
+    Latest timestamp and row count of each graph table for project_id, in
+    one aggregate query.
+
+    Cheap change probe for ETags: writes from other workers move it even
+    when this process has not refreshed its graph yet.
+    """
+    probes = []
+    for model, stamp in (
+        (ArchitectureModule, ArchitectureModule.updated_at),
+        (ModuleDependency, ModuleDependency.created_at),
+        (ArchitectureRule, ArchitectureRule.updated_at),
+    ):
+        in_project = model.project_id == project_id
+        probes.append(select(func.max(stamp)).where(in_project).scalar_subquery())
+        probes.append(select(func.count()).select_from(model).where(in_project).scalar_subquery())
+    row = (await session.execute(select(*probes))).one()
+    return tuple(row)
+
+
+def _edges(node: Any) -> List[Edge]:
+    edges: List[Edge] = []
+    for dep in node.get_dependencies(direction="outgoing"):
+        metadata = getattr(dep, "metadata", None) or {}
+        edges.append(
+            (str(dep.target_node_id), dep.dependency_type, metadata.get("description"), metadata.get("metadata") or {})
+        )
+    return edges
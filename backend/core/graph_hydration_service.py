@@ -1,17 +1,56 @@
-from typing import Dict, Optional, List, Any, Callable, Type
+from datetime import datetime
+from types import SimpleNamespace
+from typing import AbstractSet, Dict, Optional, List, Any, Set, Tuple, Type, Union
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import Row, and_, or_, select, true
+from sqlalchemy.orm import QueryableAttribute
+from sqlalchemy.sql.elements import ColumnElement
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.core.rule_engine import CompiledRule, compile_rule
 from backend.db.models import ArchitectureModule, ArchitectureRule, ModuleDependency
-from refmemtree import GraphSystem, GraphNode
+from refmemtree import GraphSystem
+
+# Rows streamed per server-side cursor fetch in bulk hydration
+HYDRATION_BATCH_SIZE = 5000
 
 
 class GraphHydrationService:
     def __init__(self, graph_system: GraphSystem):
         self.graph_system = graph_system
 
+        # Incremental refresh state (per project - one service per project graph)
+        self.project_id: Optional[UUID] = None
+        self.modules_watermark: Optional[datetime] = None
+        self.dependencies_watermark: Optional[datetime] = None
+        self.rules_watermark: Optional[datetime] = None
+        # Ids of rows already applied at each watermark (skipped by the next refresh)
+        self._modules_at_watermark: Set[UUID] = set()
+        self._dependencies_at_watermark: Set[UUID] = set()
+        self._rules_at_watermark: Set[UUID] = set()
+        self._module_ids: Set[UUID] = set()
+        self._dependencies: Dict[UUID, Tuple[UUID, UUID, str]] = {}  # dependency_id -> (from, to, type)
+        self._rule_names: Dict[UUID, str] = {}  # rule_id -> registered rule name
+        self._rule_rows: Dict[UUID, Dict[str, Any]] = {}  # rule_id -> definition (snapshots, manager view)
+        self.compiled_rules: Dict[UUID, CompiledRule] = {}  # rule_id -> parsed rule (RuleEngine)
+
+    @property
+    def is_hydrated(self) -> bool:
+        return self.project_id is not None
+
+    @property
+    def applied_watermarks(self) -> Tuple[Any, ...]:
+        """Latest timestamp and row count applied per table, in graph_hash.database_watermarks() order."""
+        return (
+            self.modules_watermark,
+            len(self._module_ids),
+            self.dependencies_watermark,
+            len(self._dependencies),
+            self.rules_watermark,
+            len(self._rule_names),
+        )
+
     async def hydrate_from_database(
         self,
         project_id: UUID,
@@ -20,6 +59,8 @@ class GraphHydrationService:
         """
         Hydrate GraphSystem from PostgreSQL data FOR SPECIFIC PROJECT.
         """
+        self.project_id = project_id
+
         # Step 1: Load ONLY modules for THIS project
         modules_result = await session.execute(
             select(ArchitectureModule)
@@ -29,92 +70,555 @@ class GraphHydrationService:
         modules = modules_result.scalars().all()
 
         for module in modules:
-            self.graph_system.add_node(
-                node_id=str(module.id),
-                node_type=module.module_type,
-                data={
-                    "name": module.name,
-                    "description": module.description,
-                    "level": module.level,
-                    "status": module.status,
-                    "ai_generated": module.ai_generated,
-                    "metadata": module.module_metadata or {},
-                },
-            )
+            self._apply_module(module)
 
         # Step 2: Load all dependencies between modules
         deps_result = await session.execute(select(ModuleDependency).where(ModuleDependency.project_id == project_id))
         dependencies = deps_result.scalars().all()
 
         for dep in dependencies:
-            try:
-                from_node = self.graph_system.get_node(str(dep.from_module_id))
-                if from_node:
-                    from_node.add_dependency(
-                        target_node_id=str(dep.to_module_id),
-                        dependency_type=dep.dependency_type,
-                        metadata={
-                            "description": dep.description,
-                            "created_at": dep.created_at.isoformat() if dep.created_at else None,
-                        },
-                    )
-            except Exception as e:
-                print(f"  ⚠️  Failed to add dependency: {e}")
+            self._apply_dependency(dep)
 
         # Step 3: Load and apply architecture rules
         rules_result = await session.execute(select(ArchitectureRule).where(ArchitectureRule.project_id == project_id))
         rules = rules_result.scalars().all()
 
         for rule in rules:
-            try:
-                self.graph_system.add_rule(
-                    name=f"{rule.rule_type}_{rule.id}",
-                    rule_type=rule.rule_type,
-                    validator=self._create_validator_from_rule(rule),
-                    severity="error" if rule.level == "global" else "warning",
-                    auto_fix=False,
+            self._apply_rule(rule)
+
+    async def hydrate_streaming(
+        self,
+        project_id: UUID,
+        session: AsyncSession,
+        batch_size: int = HYDRATION_BATCH_SIZE,
+    ) -> None:
+        """
+        Bulk-hydrate GraphSystem for a project using streamed column rows.
+
+        Same result as hydrate_from_database(), but selects only the columns the
+        graph needs (Core rows instead of ORM entities, so nothing enters the
+        identity map) and streams them through server-side cursors in batches of
+        batch_size. Nodes and edges are built in a single pass over each stream,
+        so peak memory is bounded by the batch size rather than project size.
+        """
+        self.project_id = project_id
+
+        # Step 1: Stream module columns -> nodes
+        modules_stream = await session.stream(
+            select(
+                ArchitectureModule.id,
+                ArchitectureModule.name,
+                ArchitectureModule.description,
+                ArchitectureModule.module_type,
+                ArchitectureModule.level,
+                ArchitectureModule.status,
+                ArchitectureModule.ai_generated,
+                ArchitectureModule.module_metadata,
+                ArchitectureModule.updated_at,
+            )
+            .where(ArchitectureModule.project_id == project_id)
+            .order_by(ArchitectureModule.level)
+            .execution_options(yield_per=batch_size)
+        )
+        async for partition in modules_stream.partitions():
+            for module_row in partition:
+                self._apply_module(module_row)
+
+        # Step 2: Stream dependency columns -> edges
+        deps_stream = await session.stream(
+            select(
+                ModuleDependency.id,
+                ModuleDependency.from_module_id,
+                ModuleDependency.to_module_id,
+                ModuleDependency.dependency_type,
+                ModuleDependency.description,
+                ModuleDependency.dependency_metadata,
+                ModuleDependency.created_at,
+            )
+            .where(ModuleDependency.project_id == project_id)
+            .execution_options(yield_per=batch_size)
+        )
+        async for partition in deps_stream.partitions():
+            for dep_row in partition:
+                self._apply_dependency(dep_row)
+
+        # Step 3: Rules (few per project - a single column select is enough)
+        rules_result = await session.execute(
+            select(
+                ArchitectureRule.id,
+                ArchitectureRule.module_id,
+                ArchitectureRule.rule_type,
+                ArchitectureRule.level,
+                ArchitectureRule.rule_definition,
+                ArchitectureRule.updated_at,
+            ).where(ArchitectureRule.project_id == project_id)
+        )
+        for rule_row in rules_result:
+            self._apply_rule(rule_row)
+
+    async def refresh_from_database(
+        self,
+        project_id: UUID,
+        session: AsyncSession,
+    ) -> Dict[str, int]:
+        """
+        Incrementally refresh the graph with rows changed since the last load.
+
+        Uses per-table high-water marks (updated_at for modules and rules,
+        created_at for dependencies) to fetch only new or modified rows, and an
+        id-set diff to detect deletions. The same id sets catch rows the graph
+        never saw whose timestamp is at or before the watermark (a transaction
+        that committed late, a write from another worker); they are fetched in
+        the same query as the changed rows. Rows already applied at a watermark are
+        not fetched again, and only rows whose content changed are counted, so
+        a refresh with nothing to do returns all-zero stats. Dependencies have
+        no updated_at, so an in-place edit of an existing dependency row needs
+        a full reload.
+
+        Falls back to a full hydration if this graph was never hydrated.
+        """
+        if self.project_id != project_id:
+            await self.hydrate_streaming(project_id, session)
+            return {
+                "full_reload": 1,
+                "modules_upserted": len(self._module_ids),
+                "dependencies_added": len(self._dependencies),
+                "rules_upserted": len(self._rule_names),
+            }
+
+        stats = {
+            "full_reload": 0,
+            "modules_upserted": 0,
+            "modules_removed": 0,
+            "dependencies_added": 0,
+            "dependencies_removed": 0,
+            "rules_upserted": 0,
+            "rules_removed": 0,
+        }
+
+        # Step 1: Deletions (id-set diff - ids only, no row payloads)
+        module_ids = set(
+            (
+                await session.execute(select(ArchitectureModule.id).where(ArchitectureModule.project_id == project_id))
+            ).scalars()
+        )
+        dependency_ids = set(
+            (
+                await session.execute(select(ModuleDependency.id).where(ModuleDependency.project_id == project_id))
+            ).scalars()
+        )
+        rule_ids = set(
+            (
+                await session.execute(select(ArchitectureRule.id).where(ArchitectureRule.project_id == project_id))
+            ).scalars()
+        )
+
+        for dependency_id in set(self._dependencies) - dependency_ids:
+            self._remove_dependency(dependency_id)
+            stats["dependencies_removed"] += 1
+        for module_id in self._module_ids - module_ids:
+            self._remove_module(module_id)
+            stats["modules_removed"] += 1
+        for rule_id in set(self._rule_names) - rule_ids:
+            self._remove_rule(rule_id)
+            stats["rules_removed"] += 1
+
+        # Step 2: New and updated modules (rows sharing the watermark timestamp are not missed)
+        modules_query = select(ArchitectureModule).where(
+            ArchitectureModule.project_id == project_id,
+            _changed_since(
+                ArchitectureModule.updated_at,
+                ArchitectureModule.id,
+                self.modules_watermark,
+                self._modules_at_watermark,
+                missing=module_ids - self._module_ids,
+            ),
+        )
+        modules = (await session.execute(modules_query.order_by(ArchitectureModule.level))).scalars().all()
+        for module in modules:
+            if self._apply_module(module):
+                stats["modules_upserted"] += 1
+
+        # Step 3: New dependencies
+        deps_query = select(ModuleDependency).where(
+            ModuleDependency.project_id == project_id,
+            _changed_since(
+                ModuleDependency.created_at,
+                ModuleDependency.id,
+                self.dependencies_watermark,
+                self._dependencies_at_watermark,
+                missing=dependency_ids - set(self._dependencies),
+            ),
+        )
+        for dep in (await session.execute(deps_query)).scalars().all():
+            if dep.id in self._dependencies:
+                self._advance_dependencies_watermark(dep)
+                continue
+            if self._has_edge(dep):  # Added by a write through the graph operations
+                self._dependencies[dep.id] = (dep.from_module_id, dep.to_module_id, dep.dependency_type)
+                self._advance_dependencies_watermark(dep)
+                continue
+            self._apply_dependency(dep)
+            if dep.id in self._dependencies:  # Skipped edges (source not in the graph) are retried next time
+                stats["dependencies_added"] += 1
+
+        # Step 4: New and updated rules
+        rules_query = select(ArchitectureRule).where(
+            ArchitectureRule.project_id == project_id,
+            _changed_since(
+                ArchitectureRule.updated_at,
+                ArchitectureRule.id,
+                self.rules_watermark,
+                self._rules_at_watermark,
+                missing=rule_ids - set(self._rule_names),
+            ),
+        )
+        for rule in (await session.execute(rules_query)).scalars().all():
+            if self._rule_rows.get(rule.id) == _rule_row(rule):
+                self._advance_rules_watermark(rule)  # Touched but unchanged
+                continue
+            if rule.id in self._rule_names:
+                self._remove_rule(rule.id)
+            self._apply_rule(rule)
+            if rule.id in self._rule_names:
+                stats["rules_upserted"] += 1
+
+        return stats
+
+    async def reload_rows(
+        self,
+        session: AsyncSession,
+        module_ids: Set[UUID],
+        rule_ids: Set[UUID],
+    ) -> Dict[str, int]:
+        """
+        Re-read the given modules (with their outgoing dependencies) and rules.
+
+        Repairs drift found by comparing graph hashes (core/graph_hash.py),
+        including in-place dependency edits the watermarks cannot see. Nodes
+        and rules that no longer exist in the database are removed.
+        """
+        project_id = self.project_id
+        stats = {"modules_reloaded": 0, "modules_removed": 0, "rules_reloaded": 0, "rules_removed": 0}
+
+        if module_ids:
+            modules = {
+                module.id: module
+                for module in (
+                    await session.execute(
+                        select(ArchitectureModule).where(
+                            ArchitectureModule.project_id == project_id, ArchitectureModule.id.in_(module_ids)
+                        )
+                    )
+                ).scalars()
+            }
+            for module_id in modules:
+                node = self.graph_system.get_node(str(module_id))
+                if node is None:
+                    self._module_ids.discard(module_id)  # Re-added by _apply_module below
+                    continue
+                # Update in place (even if an operation rather than hydration added it) and drop its edges
+                self._module_ids.add(module_id)
+                for dep in list(node.get_dependencies(direction="outgoing")):
+                    node.remove_dependency(target_node_id=dep.target_node_id, dependency_type=dep.dependency_type)
+            for dependency_id, (from_id, _, _) in list(self._dependencies.items()):
+                if from_id in module_ids:
+                    del self._dependencies[dependency_id]
+
+            for module_id in module_ids - set(modules):
+                self._remove_module(module_id)
+                stats["modules_removed"] += 1
+            for module in modules.values():
+                self._apply_module(module)
+                stats["modules_reloaded"] += 1
+            if modules:
+                deps_query = select(ModuleDependency).where(
+                    ModuleDependency.project_id == project_id, ModuleDependency.from_module_id.in_(list(modules))
                 )
-            except Exception as e:
-                print(f"  ⚠️  Failed to add rule: {e}")
+                for dep in (await session.execute(deps_query)).scalars().all():
+                    self._apply_dependency(dep)
 
-    def _create_validator_from_rule(self, rule: ArchitectureRule) -> Callable[[GraphNode], bool]:
+        if rule_ids:
+            rules = (
+                (
+                    await session.execute(
+                        select(ArchitectureRule).where(
+                            ArchitectureRule.project_id == project_id, ArchitectureRule.id.in_(rule_ids)
+                        )
+                    )
+                )
+                .scalars()
+                .all()
+            )
+            for rule_id in rule_ids:
+                if rule_id in self._rule_names:
+                    self._remove_rule(rule_id)
+            for rule in rules:
+                self._apply_rule(rule)
+                stats["rules_reloaded"] += 1
+            stats["rules_removed"] = len(rule_ids) - len(rules)
+
+        return stats
+
+    # ========================================================================
+    # Snapshots (warm start)
+    # ========================================================================
+
+    def export_snapshot(self) -> Dict[str, Any]:
         """
-        Create validator function from ArchitectureRule.
+        Export the hydrated graph and its refresh state as a JSON-safe dict.
+
+        Together with the watermarks, this lets a restarted process restore the
+        graph and catch up with refresh_from_database() instead of a full load.
         """
-        rule_def = rule.rule_definition or {}
-        rule_type = rule.rule_type
+        nodes: List[List[Any]] = []
+        dependencies: List[List[Any]] = []
+        edge_metadata: Dict[Tuple[str, str, str], Any] = {}
 
-        if rule_type == "naming":
-            condition = rule_def.get("condition", "")
+        for module_id in self._module_ids:
+            node = self.graph_system.get_node(str(module_id))
+            if not node:
+                continue
+            nodes.append([str(module_id), node.node_type, node.data])
+            for dep in node.get_dependencies(direction="outgoing"):
+                key = (str(module_id), str(dep.target_node_id), dep.dependency_type)
+                edge_metadata[key] = getattr(dep, "metadata", None)
 
-            def naming_validator(node: GraphNode) -> bool:
-                name: str = node.data.get("name", "")
-                if "endswith" in condition:
-                    suffix: str = condition.split("'")[1] if "'" in condition else ""
-                    return name.endswith(suffix)
-                return True
+        for dependency_id, (from_id, to_id, dependency_type) in self._dependencies.items():
+            metadata = edge_metadata.get((str(from_id), str(to_id), dependency_type))
+            dependencies.append([str(dependency_id), str(from_id), str(to_id), dependency_type, metadata])
 
-            return naming_validator
+        return {
+            "project_id": str(self.project_id),
+            "watermarks": {
+                "modules": _isoformat(self.modules_watermark),
+                "dependencies": _isoformat(self.dependencies_watermark),
+                "rules": _isoformat(self.rules_watermark),
+            },
+            "nodes": nodes,
+            "dependencies": dependencies,
+            "rules": [
+                [
+                    str(rule_id),
+                    str(row["module_id"]) if row["module_id"] else None,
+                    row["rule_type"],
+                    row["level"],
+                    row["rule_definition"],
+                ]
+                for rule_id, row in self._rule_rows.items()
+            ],
+        }
 
-        elif rule_type == "dependency":
-            max_deps: int = rule_def.get("max_dependencies", 999)
+    def restore_snapshot(self, snapshot: Dict[str, Any]) -> None:
+        """Rebuild the graph and refresh state from export_snapshot() output."""
+        self.project_id = UUID(snapshot["project_id"])
 
-            def dependency_validator(node: GraphNode) -> bool:
-                deps: list = node.get_dependencies(direction="outgoing")
-                return len(deps) <= max_deps
+        for node_id, node_type, data in snapshot["nodes"]:
+            self.graph_system.add_node(node_id=node_id, node_type=node_type, data=data)
+            self._module_ids.add(UUID(node_id))
 
-            return dependency_validator
+        for dependency_id, from_id, to_id, dependency_type, metadata in snapshot["dependencies"]:
+            from_node = self.graph_system.get_node(from_id)
+            if from_node:
+                from_node.add_dependency(
+                    target_node_id=to_id,
+                    dependency_type=dependency_type,
+                    metadata=metadata or {},
+                )
+                self._dependencies[UUID(dependency_id)] = (UUID(from_id), UUID(to_id), dependency_type)
 
-        elif rule_type == "layer":
+        for rule_id, module_id, rule_type, level, rule_definition in snapshot["rules"]:
+            self._apply_rule(
+                SimpleNamespace(
+                    id=UUID(rule_id),
+                    module_id=UUID(module_id) if module_id else None,
+                    rule_type=rule_type,
+                    level=level,
+                    rule_definition=rule_definition,
+                    updated_at=None,
+                )
+            )
 
-            def layer_validator(node: GraphNode) -> bool:
-                return True
+        watermarks = snapshot["watermarks"]
+        self.modules_watermark = _parse_timestamp(watermarks["modules"])
+        self.dependencies_watermark = _parse_timestamp(watermarks["dependencies"])
+        self.rules_watermark = _parse_timestamp(watermarks["rules"])
 
-            return layer_validator
+    # ========================================================================
+    # Row -> Graph application (shared by full and incremental hydration)
+    # ========================================================================
 
+    def _apply_module(self, module: Union[ArchitectureModule, Row[Any]]) -> bool:
+        """Add or update a module's node; False if the node already had this content."""
+        data = module_node_data(module)
+        changed = True
+        # Also covers nodes a write already added through the graph operations
+        node = self.graph_system.get_node(str(module.id))
+        if node:
+            changed = node.node_type != module.module_type or node.data != data
+            if changed:
+                node.node_type = module.module_type
+                node.data = data
         else:
+            self.graph_system.add_node(node_id=str(module.id), node_type=module.module_type, data=data)
+        self._module_ids.add(module.id)
+        self.modules_watermark = _advance_watermark(
+            self.modules_watermark, self._modules_at_watermark, module.updated_at, module.id
+        )
+        return changed
+
+    def _apply_dependency(self, dep: Union[ModuleDependency, Row[Any]]) -> None:
+        try:
+            from_node = self.graph_system.get_node(str(dep.from_module_id))
+            if from_node:
+                from_node.add_dependency(
+                    target_node_id=str(dep.to_module_id),
+                    dependency_type=dep.dependency_type,
+                    metadata=dependency_edge_metadata(dep),
+                )
+                self._dependencies[dep.id] = (dep.from_module_id, dep.to_module_id, dep.dependency_type)
+        except Exception as e:
+            print(f"  ⚠️  Failed to add dependency: {e}")
+        self._advance_dependencies_watermark(dep)
+
+    def _has_edge(self, dep: ModuleDependency) -> bool:
+        from_node = self.graph_system.get_node(str(dep.from_module_id))
+        return bool(from_node) and any(
+            str(edge.target_node_id) == str(dep.to_module_id) and edge.dependency_type == dep.dependency_type
+            for edge in from_node.get_dependencies(direction="outgoing")
+        )
+
+    def _advance_dependencies_watermark(self, dep: Union[ModuleDependency, Row[Any]]) -> None:
+        self.dependencies_watermark = _advance_watermark(
+            self.dependencies_watermark, self._dependencies_at_watermark, dep.created_at, dep.id
+        )
+
+    def _apply_rule(self, rule: Union[ArchitectureRule, Row[Any], SimpleNamespace]) -> None:
+        name = f"{rule.rule_type}_{rule.id}"
+        try:
+            compiled = compile_rule(rule.id, rule.rule_type, rule.rule_definition, rule.level, rule.module_id, name)
+            self.graph_system.add_rule(
+                name=name,
+                rule_type=rule.rule_type,
+                validator=compiled.validator(self.graph_system),
+                severity=compiled.severity,
+                auto_fix=False,
+            )
+            self._rule_names[rule.id] = name
+            self.compiled_rules[rule.id] = compiled
+            self._rule_rows[rule.id] = _rule_row(rule)
+        except Exception as e:
+            print(f"  ⚠️  Failed to add rule: {e}")
+        self._advance_rules_watermark(rule)
+
+    def _advance_rules_watermark(self, rule: Union[ArchitectureRule, Row[Any], SimpleNamespace]) -> None:
+        self.rules_watermark = _advance_watermark(
+            self.rules_watermark, self._rules_at_watermark, rule.updated_at, rule.id
+        )
+
+    def _remove_module(self, module_id: UUID) -> None:
+        try:
+            self.graph_system.remove_node(str(module_id))
+        except Exception as e:
+            print(f"  ⚠️  Failed to remove node: {e}")
+        self._module_ids.discard(module_id)
+        # Edges of a removed node go with it
+        for dependency_id, (from_id, to_id, _) in list(self._dependencies.items()):
+            if module_id in (from_id, to_id):
+                del self._dependencies[dependency_id]
+
+    def _remove_dependency(self, dependency_id: UUID) -> None:
+        from_id, to_id, dependency_type = self._dependencies.pop(dependency_id)
+        try:
+            from_node = self.graph_system.get_node(str(from_id))
+            if from_node:
+                from_node.remove_dependency(target_node_id=str(to_id), dependency_type=dependency_type)
+        except Exception as e:
+            print(f"  ⚠️  Failed to remove dependency: {e}")
+
+    def _remove_rule(self, rule_id: UUID) -> None:
+        name = self._rule_names.pop(rule_id)
+        self._rule_rows.pop(rule_id, None)
+        self.compiled_rules.pop(rule_id, None)
+        try:
+            self.graph_system.remove_rule(name)
+        except Exception as e:
+            print(f"  ⚠️  Failed to remove rule: {e}")
+
+
+def module_node_data(module: Union[ArchitectureModule, Row[Any]]) -> Dict[str, Any]:
+    """Node payload a hydrated module gets in the project graph."""
+    return {
+        "name": module.name,
+        "description": module.description,
+        "level": module.level,
+        "status": module.status,
+        "ai_generated": module.ai_generated,
+        "metadata": module.module_metadata or {},
+    }
+
+
+def dependency_edge_metadata(dep: Union[ModuleDependency, Row[Any]]) -> Dict[str, Any]:
+    """Edge metadata a hydrated dependency gets in the project graph."""
+    return {
+        "description": dep.description,
+        "metadata": dep.dependency_metadata or {},
+        "created_at": dep.created_at.isoformat() if dep.created_at else None,
+    }
+
+
+def _rule_row(rule: Union[ArchitectureRule, Row[Any], SimpleNamespace]) -> Dict[str, Any]:
+    """The rule columns the graph is built from (snapshots, manager view, change detection)."""
+    return {
+        "module_id": rule.module_id,
+        "rule_type": rule.rule_type,
+        "level": rule.level,
+        "rule_definition": rule.rule_definition,
+    }
+
+
+def _advance_watermark(
+    current: Optional[datetime], at_watermark: Set[UUID], candidate: Optional[datetime], row_id: UUID
+) -> Optional[datetime]:
+    """New high-water mark after applying a row; at_watermark (updated in place) tracks the ids applied at it."""
+    if candidate is None:
+        return current
+    if current is None or candidate > current:
+        at_watermark.clear()
+        at_watermark.add(row_id)
+        return candidate
+    if candidate == current:
+        at_watermark.add(row_id)
+    return current
+
+
+def _changed_since(
+    column: QueryableAttribute[datetime],
+    id_column: QueryableAttribute[UUID],
+    watermark: Optional[datetime],
+    at_watermark: Set[UUID],
+    missing: AbstractSet[UUID] = frozenset(),
+) -> ColumnElement[bool]:
+    """
+    Rows newer than the watermark, rows at it that were not applied yet, and
+    missing rows (ids in the table the graph does not hold, whatever their
+    timestamp).
+    """
+    if watermark is None:
+        return true()
+    changed: ColumnElement[bool]
+    if not at_watermark:
+        changed = column >= watermark
+    else:
+        changed = or_(column > watermark, and_(column == watermark, id_column.not_in(at_watermark)))
+    if missing:
+        changed = or_(changed, id_column.in_(missing))
+    return changed
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
 
-            def default_validator(node: GraphNode) -> bool:
-                return True
 
-            return default_validator
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
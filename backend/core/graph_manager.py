@@ -1,35 +1,347 @@
-from typing import Dict, Optional, List, Any, Tuple, cast
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Iterable, List, Any, Sequence, Tuple, cast
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.core.config import settings
+from backend.core.graph_hash import (
+    NODE_KEY_PREFIX,
+    RULE_KEY_PREFIX,
+    GraphMerkleHash,
+    combine_hashes,
+    database_tree,
+    database_watermarks,
+)
 from backend.core.graph_hydration_service import GraphHydrationService
-from backend.core.graph_operations_service import GraphOperationsService
+from backend.core.graph_operations_service import GraphOperation, GraphOperationsService
+from backend.core.graph_overlay import GraphOverlay
+from backend.core.graph_revision import GraphRevision
+from backend.core.graph_snapshot_store import GraphSnapshotStore
 from backend.core.graph_analytics_service import GraphAnalyticsService
 from backend.core.graph_versioning_service import GraphVersioningService
+from backend.core.refmemtree_advanced import RefMemTreeManager
+from backend.core.refmemtree_loader import RefMemTreeView
 from refmemtree import GraphSystem
 
+ProjectServices = Tuple[GraphHydrationService, GraphOperationsService, GraphAnalyticsService, GraphVersioningService]
+
+# Rough per-element costs used for the memory budget. They do not need to be
+# exact - they only have to rank projects consistently against each other.
+NODE_OVERHEAD_BYTES = 1024
+EDGE_OVERHEAD_BYTES = 256
+
+
+def estimate_graph_size(graph_system: GraphSystem) -> int:
+    """Approximate the in-memory footprint of a hydrated GraphSystem in bytes."""
+    total = 0
+    try:
+        for node in graph_system.get_all_nodes():
+            total += NODE_OVERHEAD_BYTES + len(str(node.data))
+            total += EDGE_OVERHEAD_BYTES * len(node.get_dependencies(direction="outgoing"))
+    except Exception as e:
+        print(f"Failed to estimate graph size: {e}")
+    return total
+
+
+def _estimated_delta(operation: GraphOperation) -> int:
+    """Memory budget change for one applied operation (same costs as the single-element methods)."""
+    if operation.kind == GraphOperation.ADD_NODE:
+        return NODE_OVERHEAD_BYTES + len(str(operation.data))
+    if operation.kind == GraphOperation.REMOVE_NODE:
+        return -NODE_OVERHEAD_BYTES
+    if operation.kind == GraphOperation.ADD_DEPENDENCY:
+        return EDGE_OVERHEAD_BYTES
+    return 0
+
 
 class GraphManagerService:
-    def __init__(self) -> None:
-        self._graph_cache: Dict[UUID, GraphSystem] = {}
+    """
+    Per-project cache of hydrated RefMemTree graphs and their services.
+
+    This is the single project graph store: the RefMemTreeManager used by
+    ArchitectureService is a view over the same hydrated graph, so there is
+    one hydration, one invalidation and one memory budget per project.
+
+    The cache is bounded by project count, an approximate memory budget and an
+    idle TTL. Evicted projects are rehydrated transparently on next access.
+    """
+
+    def __init__(
+        self,
+        max_projects: Optional[int] = None,
+        max_memory_bytes: Optional[int] = None,
+        idle_ttl_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        snapshot_store: Optional[GraphSnapshotStore] = None,
+    ) -> None:
+        # All per-project dicts share keys; _graph_cache order is LRU order.
+        self._graph_cache: "OrderedDict[UUID, GraphSystem]" = OrderedDict()
         self._hydration_services: Dict[UUID, GraphHydrationService] = {}
         self._operations_services: Dict[UUID, GraphOperationsService] = {}
         self._analytics_services: Dict[UUID, GraphAnalyticsService] = {}
         self._versioning_services: Dict[UUID, GraphVersioningService] = {}
+        # Built lazily on first get_refmemtree_manager() / get_graph_hash() call
+        self._manager_views: Dict[UUID, RefMemTreeView] = {}
+        self._graph_hashes: Dict[UUID, GraphMerkleHash] = {}
+
+        # Eviction policy (0 disables a limit)
+        self.max_projects = settings.REFMEMTREE_CACHE_SIZE if max_projects is None else max_projects
+        self.max_memory_bytes = settings.REFMEMTREE_CACHE_MAX_BYTES if max_memory_bytes is None else max_memory_bytes
+        self.idle_ttl_seconds = settings.REFMEMTREE_CACHE_TTL_SECONDS if idle_ttl_seconds is None else idle_ttl_seconds
+        self._clock = clock
+        self._snapshot_store = snapshot_store
+        self._last_access: Dict[UUID, float] = {}
+        self._estimated_sizes: Dict[UUID, int] = {}
+
+        # Single-flight hydration: one in-flight load per cold project
+        self._inflight: Dict[UUID, "asyncio.Future[ProjectServices]"] = {}
+        # Serialises batched mutations per project
+        self._locks: Dict[UUID, asyncio.Lock] = {}
+
+        # Counters
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._coalesced = 0
+
+    async def get_or_create_services(self, project_id: UUID, session: AsyncSession) -> ProjectServices:
+        """
+        Get cached services for a project, hydrating the graph on first access.
+
+        Concurrent callers for a cold project share a single hydration; the
+        graph is published to the cache only after hydration completes, so no
+        caller ever sees a half-hydrated graph.
+        """
+        while True:
+            now = self._clock()
+            self._evict_idle(now)
+
+            if project_id in self._graph_cache:
+                self._hits += 1
+                self._touch(project_id, now)
+                return self._services_for(project_id)
+
+            inflight = self._inflight.get(project_id)
+            if inflight is None:
+                break
+
+            # Another request is already loading this project - wait for it
+            self._coalesced += 1
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if inflight.cancelled():
+                    continue  # The loading request was cancelled; retry (possibly as the loader)
+                raise
+
+        self._misses += 1
+        future: "asyncio.Future[ProjectServices]" = asyncio.get_running_loop().create_future()
+        # Avoid "exception was never retrieved" warnings when nobody is waiting
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[project_id] = future
+
+        try:
+            graph_system, services = await self._load_project(project_id, session)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._inflight.pop(project_id, None)
+
+        self._publish(project_id, graph_system, services)
+        future.set_result(services)
+        return services
 
-    async def get_or_create_services(
-        self, project_id: UUID, session: AsyncSession
-    ) -> Tuple[GraphHydrationService, GraphOperationsService, GraphAnalyticsService, GraphVersioningService]:
+    async def _load_project(self, project_id: UUID, session: AsyncSession) -> Tuple[GraphSystem, ProjectServices]:
+        """
+        Build and fully hydrate a project's graph without publishing it.
+
+        With a snapshot store, a usable on-disk snapshot is restored and only
+        the DB delta since its watermarks is applied; otherwise (or if that
+        fails) the graph is hydrated from scratch and a fresh snapshot written.
+        """
+        if self._snapshot_store is not None:
+            snapshot = await asyncio.to_thread(self._snapshot_store.load, project_id)
+            if snapshot is not None:
+                graph_system = GraphSystem()
+                hydration = GraphHydrationService(graph_system)
+                try:
+                    hydration.restore_snapshot(snapshot)
+                    await hydration.refresh_from_database(project_id, session)
+                    return graph_system, self._build_services(graph_system, hydration)
+                except Exception as e:
+                    print(f"⚠️  Graph snapshot restore failed, falling back to full hydration: {e}")
+                    self._snapshot_store.delete(project_id)
+
+        graph_system = GraphSystem()
+        hydration = GraphHydrationService(graph_system)
+        await hydration.hydrate_streaming(project_id, session)
+        if self._snapshot_store is not None:
+            await self._save_snapshot(project_id, hydration)
+        return graph_system, self._build_services(graph_system, hydration)
+
+    def _build_services(self, graph_system: GraphSystem, hydration: GraphHydrationService) -> ProjectServices:
+        revision = GraphRevision()  # Shared: ops/versioning bump it, analytics caches key on it
+        return (
+            hydration,
+            GraphOperationsService(graph_system, revision),
+            GraphAnalyticsService(graph_system, revision, rules=hydration.compiled_rules),
+            GraphVersioningService(graph_system, revision, project_id=hydration.project_id),
+        )
+
+    async def _save_snapshot(self, project_id: UUID, hydration: GraphHydrationService) -> None:
+        """Export on the event loop (consistent view), compress and write in a worker thread."""
+        if self._snapshot_store is None or not hydration.is_hydrated:
+            return
+        try:
+            snapshot = hydration.export_snapshot()
+            await asyncio.to_thread(self._snapshot_store.save, project_id, snapshot)
+        except Exception as e:
+            print(f"⚠️  Failed to save graph snapshot for {project_id}: {e}")
+
+    async def save_snapshots(self) -> int:
+        """Persist snapshots of all cached projects (e.g. on shutdown). Returns count saved."""
+        saved = 0
+        for project_id, hydration in list(self._hydration_services.items()):
+            await self._save_snapshot(project_id, hydration)
+            saved += 1
+        return saved
+
+    def _publish(self, project_id: UUID, graph_system: GraphSystem, services: ProjectServices) -> None:
+        """Atomically insert a hydrated project into all per-project dicts."""
+        hydration, operations, analytics, versioning = services
+        self._graph_cache[project_id] = graph_system
+        self._hydration_services[project_id] = hydration
+        self._operations_services[project_id] = operations
+        self._analytics_services[project_id] = analytics
+        self._versioning_services[project_id] = versioning
+        self._estimated_sizes[project_id] = estimate_graph_size(graph_system)
+        self._touch(project_id, self._clock())
+        self._enforce_limits(keep=project_id)
+
+    async def get_refmemtree_manager(
+        self, project_id: UUID, session: AsyncSession, force_reload: bool = False
+    ) -> RefMemTreeManager:
+        """
+        RefMemTreeManager view of the project graph (impact analysis, node rules).
+
+        Derived from the cached GraphSystem and kept in step with its
+        mutations; force_reload applies database changes first.
+        """
+        if force_reload:
+            await self.refresh_project(project_id, session)
+        hydration, ops, _, _ = await self.get_or_create_services(project_id, session)
+
+        view = self._manager_views.get(project_id)
+        if view is None:
+            view = RefMemTreeView(self._graph_cache[project_id], hydration, ops.revision)
+            self._manager_views[project_id] = view
+        previous_size = view.size_bytes
+        manager = view.manager()
+        if view.size_bytes != previous_size:
+            self._adjust_size(project_id, view.size_bytes - previous_size)
+        return manager
+
+    async def get_graph_hash(self, project_id: UUID, session: AsyncSession) -> GraphMerkleHash:
+        """Merkle hash of the project graph, kept in step with its mutations."""
+        hydration, ops, _, _ = await self.get_or_create_services(project_id, session)
+
+        graph_hash = self._graph_hashes.get(project_id)
+        if graph_hash is None:
+            graph_hash = GraphMerkleHash(self._graph_cache[project_id], hydration, ops.revision)
+            self._graph_hashes[project_id] = graph_hash
+        previous_size = graph_hash.size_bytes
+        graph_hash.refresh()
+        if graph_hash.size_bytes != previous_size:
+            self._adjust_size(project_id, graph_hash.size_bytes - previous_size)
+        return graph_hash
+
+    async def get_project_etag(self, project_id: UUID, session: AsyncSession) -> str:
+        """
+        Strong ETag for responses derived from the project graph.
+
+        Combines the in-memory graph hash with a database watermark probe
+        (latest timestamp and row count per table, one aggregate query), so
+        the tag also covers row columns the graph does not hold (timestamps,
+        approvals, ...) and writes made by other workers. When the probe
+        shows rows this graph has not applied, the graph is delta-refreshed
+        first, so the tag never pairs new rows with a stale graph.
+        """
+        graph_hash = await self.get_graph_hash(project_id, session)
+        watermarks = await database_watermarks(project_id, session)
+        if watermarks != self._hydration_services[project_id].applied_watermarks:
+            await self.refresh_project(project_id, session)
+            graph_hash = await self.get_graph_hash(project_id, session)
+        return combine_hashes(graph_hash.root, *watermarks)
+
+    async def check_drift(self, project_id: UUID, session: AsyncSession, repair: bool = True) -> Dict[str, Any]:
+        """
+        Compare the cached graph with the database and reload what differs.
+
+        Builds a Merkle tree from the current rows and compares it with the
+        in-memory one top-down, so only differing buckets are inspected and
+        only the drifted modules and rules are re-read.
+        """
         if project_id not in self._graph_cache:
-            graph_system = GraphSystem()
-            self._graph_cache[project_id] = graph_system
-            self._hydration_services[project_id] = GraphHydrationService(graph_system)
-            self._operations_services[project_id] = GraphOperationsService(graph_system)
-            self._analytics_services[project_id] = GraphAnalyticsService(graph_system)
-            self._versioning_services[project_id] = GraphVersioningService(graph_system)
-            await self._hydration_services[project_id].hydrate_from_database(project_id, session)
+            return {"checked": False, "drifted": 0}
+
+        graph_hash = await self.get_graph_hash(project_id, session)
+        stored = await database_tree(project_id, session, graph_hash.buckets)
+        drifted = graph_hash.tree.diff_keys(stored)
+        result: Dict[str, Any] = {
+            "checked": True,
+            "drifted": len(drifted),
+            "root": graph_hash.root,
+            "database_root": stored.root,
+        }
+        if not drifted or not repair or project_id not in self._graph_cache:
+            return result
 
+        module_ids = {UUID(key[len(NODE_KEY_PREFIX) :]) for key in drifted if key.startswith(NODE_KEY_PREFIX)}
+        rule_ids = {UUID(key[len(RULE_KEY_PREFIX) :]) for key in drifted if key.startswith(RULE_KEY_PREFIX)}
+        result.update(await self.reload_rows(project_id, session, module_ids, rule_ids))
+        return result
+
+    async def reload_rows(
+        self,
+        project_id: UUID,
+        session: AsyncSession,
+        module_ids: Iterable[UUID] = (),
+        rule_ids: Iterable[UUID] = (),
+    ) -> Dict[str, int]:
+        """Re-read specific modules (with their outgoing dependencies) and rules from the database."""
+        if project_id not in self._graph_cache:
+            return {}  # Not cached: hydrated from current rows on next access
+        lock = self._locks.setdefault(project_id, asyncio.Lock())
+        async with lock:
+            hydration, ops, _, _ = await self.get_or_create_services(project_id, session)
+            stats = await hydration.reload_rows(session, set(module_ids), set(rule_ids))
+            ops.revision.bump()
+        return stats
+
+    async def run_drift_checks(
+        self, session_factory: Callable[[], Any], interval_seconds: Optional[float] = None
+    ) -> None:
+        """Periodically check every cached project for drift (background task; cancel to stop)."""
+        interval = settings.GRAPH_DRIFT_CHECK_INTERVAL_SECONDS if interval_seconds is None else interval_seconds
+        while True:
+            await asyncio.sleep(interval)
+            for project_id in list(self._graph_cache):
+                try:
+                    async with session_factory() as session:
+                        result = await self.check_drift(project_id, session)
+                    if result["drifted"]:
+                        print(f"⚠️  Graph drift in project {project_id}: reloaded {result['drifted']} entries")
+                except Exception as e:
+                    print(f"⚠️  Drift check failed for project {project_id}: {e}")
+
+    def _services_for(self, project_id: UUID) -> ProjectServices:
         return (
             self._hydration_services[project_id],
             self._operations_services[project_id],
@@ -37,17 +349,174 @@ class GraphManagerService:
             self._versioning_services[project_id],
         )
 
+    # ========================================================================
+    # Cache Management
+    # ========================================================================
+
+    async def refresh_project(self, project_id: UUID, session: AsyncSession) -> Dict[str, int]:
+        """
+        Apply rows changed in the database since the last load (delta refresh).
+
+        Cold projects are hydrated in full instead.
+        """
+        if project_id not in self._graph_cache:
+            await self.get_or_create_services(project_id, session)
+            return {"full_reload": 1}
+
+        hydration, ops, _, versioning = await self.get_or_create_services(project_id, session)
+        stats = await hydration.refresh_from_database(project_id, session)
+        if any(stats.values()):
+            ops.revision.bump()
+        if project_id in self._graph_cache:
+            view = self._manager_views.get(project_id)
+            graph_hash = self._graph_hashes.get(project_id)
+            self._estimated_sizes[project_id] = (
+                estimate_graph_size(self._graph_cache[project_id])
+                + (view.size_bytes if view else 0)
+                + (graph_hash.size_bytes if graph_hash else 0)
+                + versioning.size_bytes
+            )
+            self._enforce_limits(keep=project_id)
+        return stats
+
+    async def refresh_after_write(self, project_id: UUID, session: AsyncSession) -> Dict[str, int]:
+        """
+        Delta-refresh a cached project after a committed write.
+
+        Keeps the graph and the project ETag in step with writes the graph
+        does not mirror itself. Cold projects are left alone: they hydrate
+        from current rows on next access.
+        """
+        if project_id not in self._graph_cache:
+            return {}
+        return await self.refresh_project(project_id, session)
+
+    def invalidate_project(self, project_id: UUID) -> bool:
+        """Drop a project's graph and services; it is rehydrated on next access."""
+        if project_id not in self._graph_cache:
+            return False
+        self._drop(project_id)
+        return True
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get cache hit/miss/eviction counters and current usage."""
+        lookups = self._hits + self._misses
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "coalesced_loads": self._coalesced,
+            "loads_in_flight": len(self._inflight),
+            "hit_rate": self._hits / lookups if lookups else 0.0,
+            "cached_projects": len(self._graph_cache),
+            "estimated_bytes": sum(self._estimated_sizes.values()),
+            "max_projects": self.max_projects,
+            "max_memory_bytes": self.max_memory_bytes,
+            "idle_ttl_seconds": self.idle_ttl_seconds,
+        }
+
+    def _touch(self, project_id: UUID, now: float) -> None:
+        """Mark project as most recently used."""
+        self._graph_cache.move_to_end(project_id)
+        self._last_access[project_id] = now
+
+    def _adjust_size(self, project_id: UUID, delta: int) -> None:
+        """Track incremental size changes from graph mutations."""
+        if project_id in self._estimated_sizes:
+            self._estimated_sizes[project_id] = max(0, self._estimated_sizes[project_id] + delta)
+            self._enforce_limits(keep=project_id)
+
+    def _evict_idle(self, now: float) -> None:
+        """Evict projects idle for longer than the TTL (oldest first)."""
+        if not self.idle_ttl_seconds:
+            return
+        while self._graph_cache:
+            oldest = next(iter(self._graph_cache))
+            if now - self._last_access.get(oldest, now) <= self.idle_ttl_seconds:
+                break
+            self._evict(oldest)
+
+    def _enforce_limits(self, keep: Optional[UUID] = None) -> None:
+        """Evict least recently used projects until count and memory limits hold."""
+        while self._over_limits():
+            victim = next((pid for pid in self._graph_cache if pid != keep), None)
+            if victim is None:
+                # Only the project in use is left - never evict it from under the caller
+                break
+            self._evict(victim)
+
+    def _over_limits(self) -> bool:
+        return bool(self.max_projects and len(self._graph_cache) > self.max_projects) or bool(
+            self.max_memory_bytes and sum(self._estimated_sizes.values()) > self.max_memory_bytes
+        )
+
+    def _evict(self, project_id: UUID) -> None:
+        hydration = self._hydration_services.get(project_id)
+        self._drop(project_id)
+        self._evictions += 1
+        if self._snapshot_store is not None and hydration is not None and hydration.is_hydrated:
+            # The evicted graph is no longer reachable for mutation, so exporting it
+            # and writing the file can happen off the event loop.
+            self._persist_in_background(project_id, hydration)
+
+    def _persist_in_background(self, project_id: UUID, hydration: GraphHydrationService) -> None:
+        store = self._snapshot_store
+        if store is None:
+            return
+
+        def _write() -> None:
+            try:
+                store.save(project_id, hydration.export_snapshot())
+            except Exception as e:
+                print(f"⚠️  Failed to save graph snapshot for {project_id}: {e}")
+
+        try:
+            asyncio.get_running_loop().run_in_executor(None, _write)
+        except RuntimeError:
+            _write()  # No running loop - write synchronously
+
+    def _drop(self, project_id: UUID) -> None:
+        """Remove all per-project state together."""
+        self._graph_cache.pop(project_id, None)
+        self._hydration_services.pop(project_id, None)
+        self._operations_services.pop(project_id, None)
+        self._analytics_services.pop(project_id, None)
+        self._versioning_services.pop(project_id, None)
+        self._manager_views.pop(project_id, None)
+        self._graph_hashes.pop(project_id, None)
+        self._last_access.pop(project_id, None)
+        self._estimated_sizes.pop(project_id, None)
+        lock = self._locks.get(project_id)
+        if lock is not None and not lock.locked():
+            del self._locks[project_id]
+
+    # ========================================================================
+    # Graph Operations
+    # ========================================================================
+
     async def add_node_to_graph(
         self, project_id: UUID, session: AsyncSession, node_id: UUID, node_type: str, data: dict
     ) -> bool:
         _, ops, _, _ = await self.get_or_create_services(project_id, session)
-        return await ops.add_node_to_graph(node_id, node_type, data)
+        added = await ops.add_node_to_graph(node_id, node_type, data)
+        if added:
+            self._adjust_size(project_id, NODE_OVERHEAD_BYTES + len(str(data)))
+        return added
 
     async def add_dependency_to_graph(
-        self, project_id: UUID, session: AsyncSession, from_node_id: UUID, to_node_id: UUID, dependency_type: str
+        self,
+        project_id: UUID,
+        session: AsyncSession,
+        from_node_id: UUID,
+        to_node_id: UUID,
+        dependency_type: str,
+        metadata: Optional[dict] = None,
     ) -> bool:
         _, ops, _, _ = await self.get_or_create_services(project_id, session)
-        return await ops.add_dependency_to_graph(from_node_id, to_node_id, dependency_type)
+        added = await ops.add_dependency_to_graph(from_node_id, to_node_id, dependency_type, metadata)
+        if added:
+            self._adjust_size(project_id, EDGE_OVERHEAD_BYTES + len(str(metadata or {})))
+        return added
 
     async def update_node_in_graph(
         self, project_id: UUID, session: AsyncSession, node_id: UUID, node_type: str, data: dict
@@ -57,7 +526,42 @@ class GraphManagerService:
 
     async def remove_node_from_graph(self, project_id: UUID, session: AsyncSession, node_id: UUID) -> bool:
         _, ops, _, _ = await self.get_or_create_services(project_id, session)
-        return await ops.remove_node_from_graph(node_id)
+        removed = await ops.remove_node_from_graph(node_id)
+        if removed:
+            self._adjust_size(project_id, -NODE_OVERHEAD_BYTES)
+        return removed
+
+    async def would_create_cycle(
+        self, project_id: UUID, session: AsyncSession, from_node_id: UUID, to_node_id: UUID
+    ) -> Optional[List[str]]:
+        _, ops, _, _ = await self.get_or_create_services(project_id, session)
+        return await ops.would_create_cycle(from_node_id, to_node_id)
+
+    async def apply_batch(
+        self, project_id: UUID, session: AsyncSession, operations: Sequence[GraphOperation]
+    ) -> Dict[str, Any]:
+        """
+        Apply many node/edge operations to a project graph in one step.
+
+        Services are resolved once, the batch runs under the project's lock,
+        and the graph revision is bumped once (one cache invalidation, one
+        coalesced change event). Returns applied/failed counts.
+        """
+        if not operations:
+            return {"applied": 0, "failed": [], "version": None}
+
+        lock = self._locks.setdefault(project_id, asyncio.Lock())
+        async with lock:
+            _, ops, _, _ = await self.get_or_create_services(project_id, session)
+            result = await ops.apply_batch(operations)
+
+        if result["applied"] and project_id in self._graph_cache:
+            failed = {failure["index"] for failure in result["failed"]}
+            delta = sum(
+                _estimated_delta(operation) for index, operation in enumerate(operations) if index not in failed
+            )
+            self._adjust_size(project_id, delta)
+        return result
 
     async def detect_circular_dependencies(self, project_id: UUID, session: AsyncSession) -> List[List[str]]:
         _, _, analytics, _ = await self.get_or_create_services(project_id, session)
@@ -75,21 +579,41 @@ class GraphManagerService:
         _, _, analytics, _ = await self.get_or_create_services(project_id, session)
         return await analytics.simulate_change(node_id, proposed_change)
 
+    async def simulate_changes(
+        self, project_id: UUID, session: AsyncSession, changes: Sequence[Tuple[UUID, dict]]
+    ) -> dict:
+        _, _, analytics, _ = await self.get_or_create_services(project_id, session)
+        return await analytics.simulate_changes(changes)
+
+    async def create_overlay(self, project_id: UUID, session: AsyncSession) -> GraphOverlay:
+        """Copy-on-write what-if view over the project graph; changes to it never reach the shared graph."""
+        _, _, analytics, _ = await self.get_or_create_services(project_id, session)
+        return analytics.overlay()
+
     async def validate_rules(self, project_id: UUID, session: AsyncSession) -> dict:
         _, _, analytics, _ = await self.get_or_create_services(project_id, session)
         return await analytics.validate_rules()
 
     async def create_snapshot(self, project_id: UUID, session: AsyncSession, name: str, description: str) -> str:
         _, _, _, versioning = await self.get_or_create_services(project_id, session)
-        return await versioning.create_snapshot(name, description)
+        previous_size = versioning.size_bytes
+        version_id = await versioning.create_snapshot(name, description, session)
+        self._adjust_size(project_id, versioning.size_bytes - previous_size)
+        return version_id
 
     async def rollback_to_snapshot(self, project_id: UUID, session: AsyncSession, version_id: str) -> Dict:
         _, _, _, versioning = await self.get_or_create_services(project_id, session)
-        return await versioning.rollback_to_snapshot(version_id)
+        return await versioning.rollback_to_snapshot(version_id, session)
 
     async def list_snapshots(self, project_id: UUID, session: AsyncSession) -> List[Dict]:
         _, _, _, versioning = await self.get_or_create_services(project_id, session)
-        return await versioning.list_snapshots()
+        return await versioning.list_snapshots(session)
+
+    async def diff_snapshots(
+        self, project_id: UUID, session: AsyncSession, from_version: str, to_version: Optional[str] = None
+    ) -> Dict:
+        _, _, _, versioning = await self.get_or_create_services(project_id, session)
+        return await versioning.diff(from_version, to_version, session)
 
     async def get_transitive_dependencies(
         self, project_id: UUID, session: AsyncSession, node_id: UUID, max_depth: int = 10
@@ -104,7 +628,7 @@ _graph_manager_instance: Optional["GraphManagerService"] = None
 def get_graph_manager() -> GraphManagerService:
     global _graph_manager_instance
     if _graph_manager_instance is None:
-        _graph_manager_instance = GraphManagerService()
+        _graph_manager_instance = GraphManagerService(snapshot_store=GraphSnapshotStore.from_settings())
     return _graph_manager_instance
 
 
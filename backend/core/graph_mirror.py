@@ -0,0 +1,154 @@
+"""
+rustworkx mirror of a project graph for native analytics.
+
+RefMemTree keeps the authoritative graph; analytics that traverse the whole
+graph (cycles, SCCs, topological order, closure, centrality, shortest
+paths) run much faster on a rustworkx PyDiGraph than as per-node Python
+loops over GraphNode objects. The mirror is built once from the
+GraphSystem and then follows GraphOperationsService mutations through the
+project's GraphRevision.
+
+rustworkx is optional: when it is not installed RUSTWORKX_AVAILABLE is
+False and GraphAnalyticsService falls back to core/graph_algorithms.py.
+"""
+
+import itertools
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.core.graph_revision import GraphChange
+
+try:
+    import rustworkx as rx
+
+    RUSTWORKX_AVAILABLE = True
+except ImportError:
+    rx = None  # type: ignore[assignment]
+    RUSTWORKX_AVAILABLE = False
+
+
+def _unit_weight(_: Any) -> float:
+    return 1.0
+
+
+class RustworkxGraphMirror:
+    """PyDiGraph copy of a RefMemTree GraphSystem, keyed by node id strings."""
+
+    def __init__(self) -> None:
+        if not RUSTWORKX_AVAILABLE:
+            raise RuntimeError("rustworkx is not installed")
+        self.graph = rx.PyDiGraph(multigraph=True)
+        self._index: Dict[str, int] = {}
+
+    @classmethod
+    def from_graph_system(cls, graph_system: Any) -> "RustworkxGraphMirror":
+        mirror = cls()
+        nodes = list(graph_system.get_all_nodes())
+        for node in nodes:
+            mirror.add_node(str(node.id))
+        edges: List[Tuple[int, int, Dict[str, Any]]] = []
+        for node in nodes:
+            source = mirror._index[str(node.id)]
+            for dep in node.get_dependencies(direction="outgoing"):
+                target = mirror._ensure(str(dep.target_node_id))
+                edges.append((source, target, mirror._payload(dep.dependency_type, getattr(dep, "strength", 1.0))))
+        mirror.graph.add_edges_from(edges)
+        return mirror
+
+    # ------------------------------------------------------------------
+    # Mutations
+    # ------------------------------------------------------------------
+
+    def apply(self, change: GraphChange) -> None:
+        """Apply one GraphOperationsService mutation."""
+        if change.kind == GraphChange.ADD_NODE:
+            self.add_node(change.node_id)
+        elif change.kind == GraphChange.REMOVE_NODE:
+            self.remove_node(change.node_id)
+        elif change.kind == GraphChange.ADD_DEPENDENCY and change.target_id is not None:
+            self.add_edge(change.node_id, change.target_id, change.dependency_type or "")
+
+    def add_node(self, node_id: str) -> None:
+        self._ensure(node_id)
+
+    def remove_node(self, node_id: str) -> None:
+        index = self._index.pop(node_id, None)
+        if index is not None:
+            self.graph.remove_node(index)
+
+    def add_edge(self, from_id: str, to_id: str, dependency_type: str, strength: float = 1.0) -> None:
+        self.graph.add_edge(self._ensure(from_id), self._ensure(to_id), self._payload(dependency_type, strength))
+
+    # ------------------------------------------------------------------
+    # Analytics
+    # ------------------------------------------------------------------
+
+    def node_ids(self) -> List[str]:
+        return list(self._index)
+
+    def simple_cycles(self, limit: int) -> List[List[str]]:
+        """Up to `limit` elementary cycles."""
+        return [self._ids(cycle) for cycle in itertools.islice(rx.simple_cycles(self.graph), limit)]
+
+    def strongly_connected_components(self) -> List[List[str]]:
+        return [self._ids(component) for component in rx.strongly_connected_components(self.graph)]
+
+    def topological_order(self) -> Optional[List[str]]:
+        """Topological order, or None if the graph has a cycle."""
+        try:
+            return self._ids(rx.topological_sort(self.graph))
+        except rx.DAGHasCycle:
+            return None
+
+    def dependency_depths(self, node_id: str, max_depth: Optional[int] = None) -> Dict[str, int]:
+        """Shortest hop distance to every transitive dependency of node_id."""
+        source = self._index.get(node_id)
+        if source is None:
+            return {}
+        lengths = rx.digraph_dijkstra_shortest_path_lengths(self.graph, source, _unit_weight)
+        depths = {self.graph[index]: int(length) for index, length in lengths.items()}
+        if max_depth is not None:
+            depths = {dep_id: depth for dep_id, depth in depths.items() if depth <= max_depth}
+        return depths
+
+    def shortest_path(self, from_id: str, to_id: str) -> Optional[List[str]]:
+        source, target = self._index.get(from_id), self._index.get(to_id)
+        if source is None or target is None:
+            return None
+        if source == target:
+            return [from_id]
+        paths = rx.digraph_dijkstra_shortest_paths(self.graph, source, target=target, weight_fn=_unit_weight)
+        return self._ids(paths[target]) if target in paths else None
+
+    def betweenness_centrality(self) -> Dict[str, float]:
+        centrality = rx.digraph_betweenness_centrality(self.graph)
+        return {self.graph[index]: value for index, value in centrality.items()}
+
+    def degree_stats(self) -> Dict[str, Dict[str, float]]:
+        """In/out degree and summed incoming dependency strength per node."""
+        stats: Dict[str, Dict[str, float]] = {}
+        for node_id, index in self._index.items():
+            incoming = self.graph.in_edges(index)
+            stats[node_id] = {
+                "in_degree": len(incoming),
+                "out_degree": self.graph.out_degree(index),
+                "in_weight": sum(payload["strength"] for _, _, payload in incoming),
+            }
+        return stats
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _ensure(self, node_id: str) -> int:
+        index = self._index.get(node_id)
+        if index is None:
+            index = self.graph.add_node(node_id)
+            self._index[node_id] = index
+        return index
+
+    def _ids(self, indices: Any) -> List[str]:
+        return [self.graph[index] for index in indices]
+
+    @staticmethod
+    def _payload(dependency_type: str, strength: float) -> Dict[str, Any]:
+        return {"type": dependency_type, "strength": strength}
@@ -1,14 +1,68 @@
-from typing import Dict, Optional, List, Any, Callable, Type
+from typing import Dict, Optional, List, Any, Callable, Sequence, Tuple, Type
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.core.dynamic_topology import DynamicTopologicalOrder
+from backend.core.graph_revision import GraphChange, GraphRevision
 from refmemtree import GraphSystem, GraphNode
 
 
+class GraphOperation:
+    """One node or edge mutation for GraphOperationsService.apply_batch()."""
+
+    ADD_NODE = GraphChange.ADD_NODE
+    UPDATE_NODE = GraphChange.UPDATE_NODE
+    REMOVE_NODE = GraphChange.REMOVE_NODE
+    ADD_DEPENDENCY = GraphChange.ADD_DEPENDENCY
+
+    def __init__(
+        self,
+        kind: str,
+        node_id: UUID,
+        node_type: Optional[str] = None,
+        data: Optional[dict] = None,
+        target_id: Optional[UUID] = None,
+        dependency_type: Optional[str] = None,
+    ) -> None:
+        self.kind = kind
+        self.node_id = node_id
+        self.node_type = node_type
+        self.data = data
+        self.target_id = target_id
+        self.dependency_type = dependency_type
+
+    @classmethod
+    def add_node(cls, node_id: UUID, node_type: str, data: dict) -> "GraphOperation":
+        return cls(cls.ADD_NODE, node_id, node_type=node_type, data=data)
+
+    @classmethod
+    def update_node(cls, node_id: UUID, node_type: str, data: dict) -> "GraphOperation":
+        return cls(cls.UPDATE_NODE, node_id, node_type=node_type, data=data)
+
+    @classmethod
+    def remove_node(cls, node_id: UUID) -> "GraphOperation":
+        return cls(cls.REMOVE_NODE, node_id)
+
+    @classmethod
+    def add_dependency(
+        cls, from_node_id: UUID, to_node_id: UUID, dependency_type: str, metadata: Optional[dict] = None
+    ) -> "GraphOperation":
+        # data carries the edge metadata for dependency operations
+        return cls(
+            cls.ADD_DEPENDENCY, from_node_id, data=metadata, target_id=to_node_id, dependency_type=dependency_type
+        )
+
+
 class GraphOperationsService:
-    def __init__(self, graph_system: GraphSystem):
+    def __init__(self, graph_system: GraphSystem, revision: Optional[GraphRevision] = None):
         self.graph_system = graph_system
+        self.revision = revision or GraphRevision()
+        # Topological order kept in step with mutations made through this service;
+        # rebuilt on demand after changes made elsewhere (delta refresh, rollback).
+        self._topology: Optional[DynamicTopologicalOrder[str]] = None
+        self._topology_version = -1
+        self.revision.subscribe(self._on_graph_change)
 
     async def add_node_to_graph(
         self,
@@ -18,7 +72,7 @@ class GraphOperationsService:
     ) -> bool:
         """Add node to RefMemTree graph."""
         try:
-            self.graph_system.add_node(node_id=str(node_id), node_type=node_type, data=data)
+            self.revision.bump(self._add_node(node_id, node_type, data))
             return True
         except Exception as e:
             print(f"Failed to add node to RefMemTree: {e}")
@@ -29,15 +83,13 @@ class GraphOperationsService:
         from_node_id: UUID,
         to_node_id: UUID,
         dependency_type: str,
+        metadata: Optional[dict] = None,
     ) -> bool:
         """Add dependency to RefMemTree graph."""
         try:
-            from_node = self.graph_system.get_node(str(from_node_id))
-            if from_node:
-                from_node.add_dependency(
-                    target_node_id=str(to_node_id),
-                    dependency_type=dependency_type,
-                )
+            change = self._add_dependency(from_node_id, to_node_id, dependency_type, metadata)
+            if change:
+                self.revision.bump(change)
                 return True
         except Exception as e:
             print(f"Failed to add dependency to RefMemTree: {e}")
@@ -52,12 +104,9 @@ class GraphOperationsService:
     ) -> bool:
         """Update node in RefMemTree graph."""
         try:
-            node = self.graph_system.get_node(str(node_id))
-            if node:
-                node.node_type = node_type
-                node.data = data
-                # Trigger change analysis in RefMemTree if needed
-                # node.on_change()
+            change = self._update_node(node_id, node_type, data)
+            if change:
+                self.revision.bump(change)
                 return True
             return False
         except Exception as e:
@@ -70,8 +119,118 @@ class GraphOperationsService:
     ) -> bool:
         """Remove node from RefMemTree graph."""
         try:
-            self.graph_system.remove_node(str(node_id))
+            self.revision.bump(self._remove_node(node_id))
             return True
         except Exception as e:
             print(f"Failed to remove node from RefMemTree: {e}")
             return False
+
+    async def apply_batch(self, operations: Sequence[GraphOperation]) -> Dict[str, Any]:
+        """
+        Apply many node/edge operations as one graph change.
+
+        The revision is bumped once, so derived caches are invalidated once and
+        subscribers get a single event carrying every change. Operations that
+        fail are skipped and reported; the rest are still applied.
+        """
+        changes: List[GraphChange] = []
+        failed: List[Dict[str, Any]] = []
+        for index, operation in enumerate(operations):
+            try:
+                change = self._apply(operation)
+            except Exception as e:
+                failed.append({"index": index, "kind": operation.kind, "error": str(e)})
+                continue
+            if change is None:
+                failed.append({"index": index, "kind": operation.kind, "error": "node not found"})
+            else:
+                changes.append(change)
+
+        if changes:
+            self.revision.bump(*changes)
+        return {"applied": len(changes), "failed": failed, "version": self.revision.version}
+
+    def _apply(self, operation: GraphOperation) -> Optional[GraphChange]:
+        if operation.kind == GraphOperation.ADD_NODE:
+            return self._add_node(operation.node_id, operation.node_type or "module", operation.data or {})
+        if operation.kind == GraphOperation.UPDATE_NODE:
+            return self._update_node(operation.node_id, operation.node_type or "module", operation.data or {})
+        if operation.kind == GraphOperation.REMOVE_NODE:
+            return self._remove_node(operation.node_id)
+        if operation.kind == GraphOperation.ADD_DEPENDENCY and operation.target_id is not None:
+            return self._add_dependency(
+                operation.node_id, operation.target_id, operation.dependency_type or "depends_on", operation.data
+            )
+        raise ValueError(f"Unsupported graph operation: {operation.kind}")
+
+    # Mutations without revision bump; they raise on failure and return None if the node is missing
+
+    def _add_node(self, node_id: UUID, node_type: str, data: dict) -> GraphChange:
+        self.graph_system.add_node(node_id=str(node_id), node_type=node_type, data=data)
+        return GraphChange(GraphChange.ADD_NODE, str(node_id))
+
+    def _add_dependency(
+        self, from_node_id: UUID, to_node_id: UUID, dependency_type: str, metadata: Optional[dict] = None
+    ) -> Optional[GraphChange]:
+        from_node = self.graph_system.get_node(str(from_node_id))
+        if not from_node:
+            return None
+        from_node.add_dependency(
+            target_node_id=str(to_node_id),
+            dependency_type=dependency_type,
+            metadata=metadata or {},
+        )
+        return GraphChange(GraphChange.ADD_DEPENDENCY, str(from_node_id), str(to_node_id), dependency_type)
+
+    def _update_node(self, node_id: UUID, node_type: str, data: dict) -> Optional[GraphChange]:
+        node = self.graph_system.get_node(str(node_id))
+        if not node:
+            return None
+        node.node_type = node_type
+        node.data = data
+        # Trigger change analysis in RefMemTree if needed
+        # node.on_change()
+        return GraphChange(GraphChange.UPDATE_NODE, str(node_id))
+
+    def _remove_node(self, node_id: UUID) -> GraphChange:
+        self.graph_system.remove_node(str(node_id))
+        return GraphChange(GraphChange.REMOVE_NODE, str(node_id))
+
+    async def would_create_cycle(
+        self,
+        from_node_id: UUID,
+        to_node_id: UUID,
+    ) -> Optional[List[str]]:
+        """
+        Check whether adding from -> to would close a dependency cycle.
+
+        Returns the cycle as [from, to, ..., from] or None. Uses the maintained
+        topological order, so the check only visits nodes between the two
+        endpoints in that order. The graph is not modified.
+        """
+        return self._current_topology().would_create_cycle(str(from_node_id), str(to_node_id))
+
+    def _current_topology(self) -> DynamicTopologicalOrder[str]:
+        if self._topology is None or self._topology_version != self.revision.version:
+            nodes: List[str] = []
+            edges: List[Tuple[str, str]] = []
+            for node in self.graph_system.get_all_nodes():
+                nodes.append(str(node.id))
+                for dep in node.get_dependencies(direction="outgoing"):
+                    edges.append((str(node.id), str(dep.target_node_id)))
+            self._topology = DynamicTopologicalOrder.from_edges(nodes, edges)
+            self._topology_version = self.revision.version
+        return self._topology
+
+    def _on_graph_change(self, version: int, changes: Optional[Sequence[GraphChange]]) -> None:
+        """Apply mutations to the topological order if it was current, else leave it stale."""
+        if self._topology is None or changes is None or self._topology_version != version - 1:
+            return
+        for change in changes:
+            if change.kind == GraphChange.ADD_NODE:
+                self._topology.add_node(change.node_id)
+            elif change.kind == GraphChange.REMOVE_NODE:
+                self._topology.remove_node(change.node_id)
+            elif change.kind == GraphChange.ADD_DEPENDENCY and change.target_id is not None:
+                self._topology.add_edge(change.node_id, change.target_id)
+        self._topology_version = version
@@ -0,0 +1,309 @@
+"""
+Copy-on-write what-if view over a project graph.
+
+A GraphOverlay records pending node and edge changes on top of a shared
+GraphSystem and answers reads (nodes, successors, predecessors) as base plus
+delta. Nothing is copied: untouched nodes are read straight from the base
+graph, so building an overlay costs O(size of the delta). Cycle, impact and
+rule checks run against the combined view; the base graph is never modified.
+
+An overlay describes the base at the revision it was created for - `stale`
+tells callers that the base has changed since. Base adjacency is memoized on
+first read and shared with forks, so many what-if variants of one snapshot
+walk the base graph once; overlays are meant to be short-lived.
+"""
+
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+from uuid import UUID
+
+from backend.core.graph_algorithms import find_cycles, shortest_path
+from backend.core.graph_operations_service import GraphOperation
+from backend.core.graph_revision import GraphRevision
+from backend.core.rule_engine import CompiledRule, node_layer
+from refmemtree import GraphSystem
+
+# (node_type, data)
+NodeState = Tuple[str, Dict[str, Any]]
+
+# Keys of a simulate_change() request that are not node data updates
+_CHANGE_KEYS = {"delete", "node_type", "data", "add_dependencies", "remove_dependencies"}
+
+
+class GraphOverlay:
+    """Pending node/edge deltas over a shared base graph (node ids are strings)."""
+
+    def __init__(
+        self,
+        graph_system: GraphSystem,
+        rules: Optional[Mapping[UUID, CompiledRule]] = None,
+        revision: Optional[GraphRevision] = None,
+    ) -> None:
+        self.graph_system = graph_system
+        self.rules: Mapping[UUID, CompiledRule] = rules if rules is not None else {}
+        self.revision = revision
+        self.base_version = revision.version if revision is not None else None
+        self._nodes: Dict[str, NodeState] = {}  # Added or updated nodes
+        self._removed: Set[str] = set()
+        self._added_edges: Dict[str, Dict[str, str]] = {}  # source -> target -> dependency_type
+        self._removed_edges: Dict[str, Set[str]] = {}  # source -> targets
+        self._added_incoming: Dict[str, Set[str]] = {}  # target -> sources of added edges
+        # Base adjacency memo, shared with forks (the base does not change under a fresh overlay)
+        self._base_outgoing: Dict[str, Dict[str, str]] = {}
+        self._base_incoming: Dict[str, List[str]] = {}
+
+    @property
+    def stale(self) -> bool:
+        """True once the base graph has changed since the overlay was created."""
+        return self.revision is not None and self.revision.version != self.base_version
+
+    def base(self) -> "GraphOverlay":
+        """Empty overlay over the same base snapshot (shares the base adjacency memo)."""
+        child = GraphOverlay(self.graph_system, self.rules, self.revision)
+        child.base_version = self.base_version
+        child._base_outgoing = self._base_outgoing
+        child._base_incoming = self._base_incoming
+        return child
+
+    def fork(self) -> "GraphOverlay":
+        """Independent overlay with the same delta (copies the delta, never the base)."""
+        child = self.base()
+        child._nodes = dict(self._nodes)
+        child._removed = set(self._removed)
+        child._added_edges = {source: dict(targets) for source, targets in self._added_edges.items()}
+        child._removed_edges = {source: set(targets) for source, targets in self._removed_edges.items()}
+        child._added_incoming = {target: set(sources) for target, sources in self._added_incoming.items()}
+        return child
+
+    # ------------------------------------------------------------------
+    # Mutations (recorded in the delta only)
+    # ------------------------------------------------------------------
+
+    def add_node(self, node_id: str, node_type: str, data: Optional[Dict[str, Any]] = None) -> None:
+        self._removed.discard(node_id)
+        self._nodes[node_id] = (node_type, dict(data or {}))
+
+    def update_node(self, node_id: str, node_type: Optional[str] = None, data: Optional[Dict[str, Any]] = None) -> None:
+        """Change a node's type and/or merge data into it. KeyError if the node does not exist."""
+        current = self.node(node_id)
+        if current is None:
+            raise KeyError(node_id)
+        merged = {**current[1], **(data or {})}
+        self._nodes[node_id] = (node_type or current[0], merged)
+
+    def remove_node(self, node_id: str) -> None:
+        """Remove a node; its edges (both directions) disappear with it."""
+        if not self.has_node(node_id):
+            raise KeyError(node_id)
+        self._nodes.pop(node_id, None)
+        self._removed.add(node_id)
+        for target in self._added_edges.pop(node_id, {}):
+            self._added_incoming.get(target, set()).discard(node_id)
+        for source in self._added_incoming.pop(node_id, set()):
+            self._added_edges.get(source, {}).pop(node_id, None)
+
+    def add_dependency(self, from_id: str, to_id: str, dependency_type: str = "depends_on") -> None:
+        if not self.has_node(from_id):
+            raise KeyError(from_id)
+        if not self.has_node(to_id):
+            raise KeyError(to_id)
+        self._removed_edges.get(from_id, set()).discard(to_id)
+        self._added_edges.setdefault(from_id, {})[to_id] = dependency_type
+        self._added_incoming.setdefault(to_id, set()).add(from_id)
+
+    def remove_dependency(self, from_id: str, to_id: str) -> None:
+        if self._added_edges.get(from_id, {}).pop(to_id, None) is not None:
+            self._added_incoming.get(to_id, set()).discard(from_id)
+        self._removed_edges.setdefault(from_id, set()).add(to_id)
+
+    def apply(self, operation: GraphOperation) -> None:
+        """Record one GraphOperation (same kinds as GraphOperationsService.apply_batch)."""
+        node_id = str(operation.node_id)
+        if operation.kind == GraphOperation.ADD_NODE:
+            self.add_node(node_id, operation.node_type or "module", operation.data)
+        elif operation.kind == GraphOperation.UPDATE_NODE:
+            self.update_node(node_id, operation.node_type, operation.data)
+        elif operation.kind == GraphOperation.REMOVE_NODE:
+            self.remove_node(node_id)
+        elif operation.kind == GraphOperation.ADD_DEPENDENCY:
+            self.add_dependency(node_id, str(operation.target_id), operation.dependency_type or "depends_on")
+        else:
+            raise ValueError(f"Unknown graph operation: {operation.kind}")
+
+    def apply_change(self, node_id: str, change: Mapping[str, Any]) -> None:
+        """
+        Record a simulate_change() request for one node.
+
+        Recognised keys: delete (bool), node_type, data (merged into the node
+        data), add_dependencies ([{"target_id", "dependency_type"}]) and
+        remove_dependencies ([target_id]); any other key is a data update.
+        """
+        if change.get("delete"):
+            self.remove_node(node_id)
+            return
+        data = {key: value for key, value in change.items() if key not in _CHANGE_KEYS}
+        data.update(change.get("data") or {})
+        if data or change.get("node_type"):
+            self.update_node(node_id, change.get("node_type"), data)
+        for target_id in change.get("remove_dependencies") or []:
+            self.remove_dependency(node_id, str(target_id))
+        for dependency in change.get("add_dependencies") or []:
+            self.add_dependency(node_id, str(dependency["target_id"]), dependency.get("dependency_type", "depends_on"))
+
+    # ------------------------------------------------------------------
+    # Reads (base plus delta)
+    # ------------------------------------------------------------------
+
+    def has_node(self, node_id: str) -> bool:
+        if node_id in self._removed:
+            return False
+        return node_id in self._nodes or self.graph_system.get_node(node_id) is not None
+
+    def node(self, node_id: str) -> Optional[NodeState]:
+        if node_id in self._removed:
+            return None
+        if node_id in self._nodes:
+            return self._nodes[node_id]
+        base = self.graph_system.get_node(node_id)
+        return (base.node_type, base.data or {}) if base is not None else None
+
+    def node_ids(self) -> List[str]:
+        ids = [str(node.id) for node in self.graph_system.get_all_nodes()]
+        base = set(ids)
+        ids = [node_id for node_id in ids if node_id not in self._removed]
+        ids.extend(node_id for node_id in self._nodes if node_id not in base)
+        return ids
+
+    def edges_from(self, node_id: str) -> Dict[str, str]:
+        """target_id -> dependency_type of a node's outgoing edges."""
+        if node_id in self._removed:
+            return {}
+        removed = self._removed_edges.get(node_id, set())
+        edges = {
+            target: dependency_type
+            for target, dependency_type in self._base_edges_from(node_id).items()
+            if target not in removed and target not in self._removed
+        }
+        edges.update(self._added_edges.get(node_id, {}))
+        return edges
+
+    def successors(self, node_id: str) -> List[str]:
+        return list(self.edges_from(node_id))
+
+    def predecessors(self, node_id: str) -> List[str]:
+        if node_id in self._removed:
+            return []
+        sources: Set[str] = set(self._added_incoming.get(node_id, set()))
+        for source in self._base_sources(node_id):
+            if source not in self._removed and node_id not in self._removed_edges.get(source, set()):
+                sources.add(source)
+        return list(sources)
+
+    def _base_edges_from(self, node_id: str) -> Dict[str, str]:
+        edges = self._base_outgoing.get(node_id)
+        if edges is None:
+            base = self.graph_system.get_node(node_id)
+            edges = {}
+            if base is not None:
+                for dep in base.get_dependencies(direction="outgoing"):
+                    edges[str(dep.target_node_id)] = dep.dependency_type
+            self._base_outgoing[node_id] = edges
+        return edges
+
+    def _base_sources(self, node_id: str) -> List[str]:
+        sources = self._base_incoming.get(node_id)
+        if sources is None:
+            base = self.graph_system.get_node(node_id)
+            sources = []
+            if base is not None:
+                sources = [str(dep.source_node_id) for dep in base.get_dependencies(direction="incoming")]
+            self._base_incoming[node_id] = sources
+        return sources
+
+    def changed_nodes(self) -> Set[str]:
+        """Nodes whose own state or outgoing edges differ from the base."""
+        changed = set(self._nodes) | self._removed
+        changed |= {source for source, targets in self._added_edges.items() if targets}
+        changed |= {source for source, targets in self._removed_edges.items() if targets}
+        return changed
+
+    # ------------------------------------------------------------------
+    # Analytics against base plus delta
+    # ------------------------------------------------------------------
+
+    def would_create_cycle(self, from_id: str, to_id: str) -> Optional[List[str]]:
+        """The cycle [from, to, ..., from] that adding from -> to would close, or None."""
+        if from_id == to_id:
+            return [from_id, from_id]
+        path = shortest_path(to_id, from_id, self.successors)
+        return [from_id] + path if path is not None else None
+
+    def new_cycles(self) -> List[List[str]]:
+        """Cycles closed by the overlay's added edges (one per closing edge; only the delta is searched from)."""
+        cycles: List[List[str]] = []
+        for source, targets in self._added_edges.items():
+            for target in targets:
+                path = shortest_path(target, source, self.successors)
+                if path is not None:
+                    cycles.append([source] + path)
+        return cycles
+
+    def cycles(self) -> List[List[str]]:
+        """One representative cycle per tangle in the whole combined graph."""
+        return find_cycles(self.node_ids(), self.successors)
+
+    def impact(self, node_id: str, max_depth: int = 10) -> Dict[str, int]:
+        """Modules depending on node_id (transitively, up to max_depth) -> shortest distance."""
+        distances: Dict[str, int] = {}
+        queue: Deque[Tuple[str, int]] = deque([(node_id, 0)])
+        while queue:
+            current, depth = queue.popleft()
+            if depth >= max_depth:
+                continue
+            for source in self.predecessors(current):
+                if source != node_id and source not in distances:
+                    distances[source] = depth + 1
+                    queue.append((source, depth + 1))
+        return distances
+
+    def touched_nodes(self) -> Set[str]:
+        """Nodes whose rule results may differ from the base: changed nodes and their dependents."""
+        touched = set(self.changed_nodes())
+        # A node's layer feeds the layer rules of everything pointing at it
+        for node_id in self._nodes:
+            touched.update(self.predecessors(node_id))
+        for node_id in self._removed:
+            touched.update(self._base_sources(node_id))
+        return {node_id for node_id in touched if self.has_node(node_id)}
+
+    def rule_violations(self, node_ids: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """Compiled-rule violations of the given nodes (default: touched nodes) in the combined graph."""
+        violations: List[Dict[str, Any]] = []
+        for node_id in sorted(self.touched_nodes() if node_ids is None else set(node_ids)):
+            state = self.node(node_id)
+            if state is None:
+                continue
+            node_type, data = state
+            targets = self.successors(node_id)
+            layer = node_layer(node_type, data)
+            target_layers = [node_layer(*target) for target in map(self.node, targets) if target is not None]
+            for rule_id, rule in self.rules.items():
+                if not rule.applies_to(node_id):
+                    continue
+                if not rule.check_values(str(data.get("name", "")), len(targets), layer, target_layers):
+                    violations.append(
+                        {
+                            "rule": rule.name,
+                            "rule_id": str(rule_id),
+                            "node_id": node_id,
+                            "message": rule.message,
+                            "severity": rule.severity,
+                        }
+                    )
+        return violations
+
+    def introduced_violations(self) -> List[Dict[str, Any]]:
+        """Violations on touched nodes that the base graph does not already have."""
+        touched = self.touched_nodes()
+        before = {(violation["rule_id"], violation["node_id"]) for violation in self.base().rule_violations(touched)}
+        return [v for v in self.rule_violations(touched) if (v["rule_id"], v["node_id"]) not in before]
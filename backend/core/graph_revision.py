@@ -0,0 +1,57 @@
+"""
+Graph revision counter.
+
+Every project graph has one GraphRevision shared by its services. Mutations
+bump it; derived data (analytics caches, indexes, mirrors) records the
+version it was computed at and is discarded once the graph has moved on.
+
+Structures that can follow mutations incrementally subscribe to the
+revision and receive the list of GraphChanges with every bump (a batch of
+mutations is one bump). A bump without changes (delta refresh, rollback)
+means "unknown change" - subscribers must rebuild.
+"""
+
+from typing import Callable, List, Optional, Sequence
+
+
+class GraphChange:
+    """One mutation applied to a project graph."""
+
+    ADD_NODE = "add_node"
+    UPDATE_NODE = "update_node"
+    REMOVE_NODE = "remove_node"
+    ADD_DEPENDENCY = "add_dependency"
+
+    def __init__(
+        self,
+        kind: str,
+        node_id: str,
+        target_id: Optional[str] = None,
+        dependency_type: Optional[str] = None,
+    ) -> None:
+        self.kind = kind
+        self.node_id = node_id
+        self.target_id = target_id  # ADD_DEPENDENCY only
+        self.dependency_type = dependency_type
+
+
+GraphListener = Callable[[int, Optional[Sequence[GraphChange]]], None]
+
+
+class GraphRevision:
+    """Monotonic version number of one project graph."""
+
+    def __init__(self) -> None:
+        self.version = 0
+        self._listeners: List[GraphListener] = []
+
+    def subscribe(self, listener: GraphListener) -> None:
+        """Call listener(new_version, changes) after every bump."""
+        self._listeners.append(listener)
+
+    def bump(self, *changes: GraphChange) -> int:
+        """Advance the version once for the given changes (none = unknown change)."""
+        self.version += 1
+        for listener in self._listeners:
+            listener(self.version, changes or None)
+        return self.version
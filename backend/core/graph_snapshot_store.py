@@ -0,0 +1,133 @@
+"""
+On-disk graph snapshots for warm start.
+
+Each project's hydrated graph is persisted under REFMEMTREE_STORAGE_PATH as
+one compact binary file:
+
+    MAGIC (4 bytes) | FORMAT VERSION (uint16) | SAVED AT (float64, unix time)
+    | SHA-256 of payload (32 bytes) | zlib-compressed JSON payload
+
+The payload carries the DB watermarks, so after a restart the graph is
+restored from disk and only the delta since the snapshot is read from
+PostgreSQL. Stale or corrupt snapshots are discarded and the caller falls
+back to a full hydration.
+"""
+
+import hashlib
+import json
+import os
+import struct
+import tempfile
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from backend.core.config import settings
+
+SNAPSHOT_MAGIC = b"CDRG"
+SNAPSHOT_FORMAT_VERSION = 2  # 2: rules carry module_id
+SNAPSHOT_SUFFIX = ".rmtg"
+
+_HEADER = struct.Struct(">4sHd32s")
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot file is corrupt or unusable."""
+
+
+class GraphSnapshotStore:
+    """Reads and writes per-project graph snapshots on local disk."""
+
+    def __init__(self, base_path: str, max_age_seconds: float = 0, compression_level: int = 6) -> None:
+        self.base_path = Path(base_path)
+        self.max_age_seconds = max_age_seconds  # 0 = snapshots never go stale by age
+        self.compression_level = compression_level
+
+    @classmethod
+    def from_settings(cls) -> Optional["GraphSnapshotStore"]:
+        """Build the store from settings, or None when snapshots are disabled."""
+        if not settings.REFMEMTREE_SNAPSHOTS_ENABLED:
+            return None
+        return cls(settings.REFMEMTREE_STORAGE_PATH, settings.REFMEMTREE_SNAPSHOT_MAX_AGE_SECONDS)
+
+    def path_for(self, project_id: UUID) -> Path:
+        return self.base_path / f"{project_id}{SNAPSHOT_SUFFIX}"
+
+    def save(self, project_id: UUID, snapshot: Dict[str, Any]) -> int:
+        """
+        Atomically write a snapshot (temp file + rename).
+
+        Each write gets its own temp file, so concurrent saves of one project
+        (background eviction vs shutdown) never share one; the last rename wins.
+        Returns the number of bytes written.
+        """
+        payload = zlib.compress(
+            json.dumps(snapshot, separators=(",", ":"), default=str).encode("utf-8"),
+            self.compression_level,
+        )
+        header = _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION, time.time(), hashlib.sha256(payload).digest())
+
+        self.base_path.mkdir(parents=True, exist_ok=True)
+        path = self.path_for(project_id)
+        with tempfile.NamedTemporaryFile(
+            dir=self.base_path, prefix=f"{project_id}.", suffix=f"{SNAPSHOT_SUFFIX}.tmp", delete=False
+        ) as f:
+            tmp_path = f.name
+            f.write(header)
+            f.write(payload)
+        try:
+            os.replace(tmp_path, path)
+        except OSError:
+            os.unlink(tmp_path)
+            raise
+        return len(header) + len(payload)
+
+    def load(self, project_id: UUID) -> Optional[Dict[str, Any]]:
+        """
+        Load a snapshot if it exists and is usable.
+
+        Returns None (and removes the file) when the snapshot is corrupt,
+        written by another format version, stale or for another project.
+        """
+        path = self.path_for(project_id)
+        if not path.exists():
+            return None
+
+        try:
+            snapshot = self._read(path)
+            if snapshot.get("project_id") != str(project_id):
+                raise SnapshotError("snapshot belongs to a different project")
+            return snapshot
+        except SnapshotError as e:
+            print(f"⚠️  Discarding graph snapshot {path.name}: {e}")
+            self.delete(project_id)
+            return None
+
+    def delete(self, project_id: UUID) -> None:
+        self.path_for(project_id).unlink(missing_ok=True)
+
+    def _read(self, path: Path) -> Dict[str, Any]:
+        with open(path, "rb") as f:
+            data = f.read()
+
+        if len(data) < _HEADER.size:
+            raise SnapshotError("truncated header")
+        magic, version, saved_at, checksum = _HEADER.unpack_from(data)
+        if magic != SNAPSHOT_MAGIC:
+            raise SnapshotError("bad magic")
+        if version != SNAPSHOT_FORMAT_VERSION:
+            raise SnapshotError(f"format version {version} != {SNAPSHOT_FORMAT_VERSION}")
+        if self.max_age_seconds and time.time() - saved_at > self.max_age_seconds:
+            raise SnapshotError("stale")
+
+        payload = data[_HEADER.size :]
+        if hashlib.sha256(payload).digest() != checksum:
+            raise SnapshotError("checksum mismatch")
+
+        try:
+            snapshot: Dict[str, Any] = json.loads(zlib.decompress(payload).decode("utf-8"))
+        except (zlib.error, UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise SnapshotError(f"undecodable payload: {e}") from e
+        return snapshot
@@ -1,55 +1,601 @@
-from typing import Dict, Optional, List, Any, Callable, Type
+"""
+Graph versioning: cheap snapshots of a project graph for rollback.
+
+A version records only what changed since the version it was taken after
+(its parent): the nodes touched by GraphOperationsService mutations, with
+their data and complete outgoing edge lists. Every CHECKPOINT_INTERVAL
+versions (or after a change of unknown extent, e.g. a delta refresh) a
+checkpoint holds the full graph instead; checkpoints built from an earlier
+version share its unchanged node entries rather than copying them.
+
+Versions are bounded per project (settings.GRAPH_VERSION_RETENTION). When
+the oldest one is dropped its delta children are folded into checkpoints,
+so every kept version stays restorable. With a session, versions are also
+written to the graph_versions table (flushed into the caller's transaction,
+which commits them), so rollbacks survive restarts.
+
+Each stored node carries a content hash (type, data and outgoing edges).
+diff() only looks at nodes that can differ - those touched by the deltas
+between two versions of one chain, plus nodes changed since the head for
+the live graph - and skips any whose hashes match, so reviewing a plan
+result costs O(changed nodes) instead of a deep comparison of both graphs.
+"""
+
+import copy
+import hashlib
+import json
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional, List, Any, Sequence, Set, Tuple
 from uuid import UUID, uuid4
 
+from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.core.config import settings
+from backend.core.graph_revision import GraphChange, GraphRevision
+from backend.db.models import GraphVersion
 from refmemtree import GraphSystem
 
+# Longest delta chain before the next version is stored as a checkpoint
+CHECKPOINT_INTERVAL = 16
+
+# node_id -> [node_type, data] (None: removed in this delta)
+NodeEntries = Dict[str, Optional[List[Any]]]
+# node_id -> [[target_id, dependency_type, metadata], ...] (complete outgoing list)
+EdgeEntries = Dict[str, Optional[List[List[Any]]]]
+
+
+class SnapshotVersion:
+    """One stored graph version (checkpoint or delta against parent_id)."""
+
+    def __init__(
+        self,
+        version_id: str,
+        name: str,
+        description: str,
+        parent_id: Optional[str],
+        nodes: NodeEntries,
+        edges: EdgeEntries,
+        node_count: int,
+        depth: int = 0,
+        created_at: Optional[datetime] = None,
+        hashes: Optional[Dict[str, str]] = None,
+    ) -> None:
+        self.version_id = version_id
+        self.name = name
+        self.description = description
+        self.parent_id = parent_id  # None: checkpoint
+        self.nodes = nodes
+        self.edges = edges
+        self.node_count = node_count
+        self.depth = depth  # Deltas between this version and its checkpoint
+        self.created_at = created_at or datetime.utcnow()
+        self.size_bytes = len(json.dumps(self.payload(), default=str))
+        # Content hash of every node present in this version's entries
+        self.hashes = (
+            hashes
+            if hashes is not None
+            else {node_id: content_hash(entry, edges.get(node_id)) for node_id, entry in nodes.items() if entry}
+        )
+
+    @property
+    def is_checkpoint(self) -> bool:
+        return self.parent_id is None
+
+    def payload(self) -> Dict[str, Any]:
+        return {"nodes": self.nodes, "edges": self.edges}
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "version_id": self.version_id,
+            "name": self.name,
+            "description": self.description,
+            "created_at": self.created_at.isoformat(),
+            "node_count": self.node_count,
+            "size_bytes": self.size_bytes,
+            "kind": "checkpoint" if self.is_checkpoint else "delta",
+            "parent_id": self.parent_id,
+        }
+
 
 class GraphVersioningService:
-    def __init__(self, graph_system: GraphSystem):
+    def __init__(
+        self,
+        graph_system: GraphSystem,
+        revision: Optional[GraphRevision] = None,
+        project_id: Optional[UUID] = None,
+        retention: Optional[int] = None,
+    ):
         self.graph_system = graph_system
+        self.revision = revision or GraphRevision()
+        self.project_id = project_id  # Enables persistence to graph_versions
+        self.retention = settings.GRAPH_VERSION_RETENTION if retention is None else retention
+
+        self._versions: "OrderedDict[str, SnapshotVersion]" = OrderedDict()  # Oldest first
+        self._deleted: List[str] = []  # Pruned ids not yet removed from the database
+        self._loaded = False
+        # Graph state relative to the head version (the last one taken or restored)
+        self._head: Optional[str] = None
+        self._head_ids: Set[str] = set()
+        self._dirty: Set[str] = set()
+        self._all_dirty = True
+        # target -> sources with an edge into it (head version plus edges added since); a removed
+        # node takes those edges with it, so its sources' stored outgoing lists become dirty too
+        self._incoming: Dict[str, Set[str]] = {}
+        self._seen_version = self.revision.version  # Last revision event applied to the dirty set
+        self.revision.subscribe(self._on_graph_change)
+
+    @property
+    def size_bytes(self) -> int:
+        """Serialized size of all kept versions."""
+        return sum(version.size_bytes for version in self._versions.values())
 
     async def create_snapshot(
         self,
         name: str,
         description: str,
+        session: Optional[AsyncSession] = None,
     ) -> str:
         """
-        Create architecture snapshot using RefMemTree.
+        Snapshot the current graph.
+
+        Costs O(nodes changed since the previous snapshot) except for
+        checkpoints; see the module docstring.
         """
-        version_id = str(uuid4())
-        self.graph_system.create_version(version_id=version_id, description=description)
-        return version_id
+        await self._ensure_loaded(session)
+        parent = self._versions.get(self._head) if self._head else None
+
+        if parent is None or self._all_dirty:
+            nodes, edges = self._capture_all()
+            version = SnapshotVersion(str(uuid4()), name, description, None, nodes, edges, len(nodes))
+        else:
+            delta_nodes, delta_edges = self._capture(self._dirty)
+            node_count = len(self._head_ids)
+            if parent.depth + 1 >= CHECKPOINT_INTERVAL:
+                nodes, edges, hashes = self._materialize(parent.version_id)
+                delta_hashes = _hashes(delta_nodes, delta_edges)
+                _apply_delta(nodes, edges, delta_nodes, delta_edges, hashes, delta_hashes)
+                version = SnapshotVersion(
+                    str(uuid4()), name, description, None, nodes, edges, node_count, hashes=hashes
+                )
+            else:
+                version = SnapshotVersion(
+                    str(uuid4()),
+                    name,
+                    description,
+                    parent.version_id,
+                    delta_nodes,
+                    delta_edges,
+                    node_count,
+                    depth=parent.depth + 1,
+                )
+
+        self._versions[version.version_id] = version
+        self._head = version.version_id
+        self._dirty = set()
+        self._all_dirty = False
+
+        changed = [version] + self._enforce_retention()
+        await self._persist(session, changed)
+        return version.version_id
 
     async def rollback_to_snapshot(
         self,
         version_id: str,
+        session: Optional[AsyncSession] = None,
     ) -> Dict:
         """
         Rollback architecture to previous snapshot.
         """
-        success = self.graph_system.rollback_to_version(version_id)
-        if success:
-            return {
-                "status": "success",
-                "version_id": version_id,
-            }
-        else:
+        await self._ensure_loaded(session)
+        if version_id not in self._versions:
             return {"status": "failed", "error": f"Failed to rollback to version {version_id}"}
 
-    async def list_snapshots(self) -> List[Dict]:
-        """
-        List all snapshots for project.
-        """
-        versions = self.graph_system.list_versions()
-        return [
-            {
-                "version_id": v.get("version_id"),
-                "name": v.get("version_id"),  # No name in this version
-                "description": v.get("description"),
-                "created_at": v.get("created_at"),
-                "node_count": 0,  # Not available in this version
-            }
-            for v in versions
-        ]
+        nodes, edges, _ = self._materialize(version_id)
+        try:
+            self._restore(nodes, edges)
+        except Exception as e:
+            print(f"⚠️  Graph rollback to {version_id} failed: {e}")
+            self.revision.bump()
+            return {"status": "failed", "error": f"Failed to rollback to version {version_id}: {e}"}
+
+        self.revision.bump()
+        # The graph now is exactly that version: later snapshots are deltas against it
+        self._head = version_id
+        self._head_ids = set(nodes)
+        self._incoming = {}
+        self._index_edges(edges)
+        self._dirty = set()
+        self._all_dirty = False
+        return {
+            "status": "success",
+            "version_id": version_id,
+        }
+
+    async def list_snapshots(self, session: Optional[AsyncSession] = None) -> List[Dict]:
+        """
+        List all snapshots for project (oldest first).
+        """
+        await self._ensure_loaded(session)
+        return [version.summary() for version in self._versions.values()]
+
+    async def diff(
+        self,
+        from_version: str,
+        to_version: Optional[str] = None,
+        session: Optional[AsyncSession] = None,
+    ) -> Dict[str, Any]:
+        """
+        Added, removed and changed nodes and edges between two versions.
+
+        Without to_version the live graph is compared against from_version.
+        Raises ValueError for unknown versions.
+        """
+        await self._ensure_loaded(session)
+        for version_id in (from_version, to_version):
+            if version_id is not None and version_id not in self._versions:
+                raise ValueError(f"Graph version {version_id} not found")
+
+        old_nodes, old_edges, old_hashes = self._materialize(from_version)
+        candidates: Optional[Set[str]]
+        if to_version is not None:
+            new_nodes, new_edges, new_hashes = self._materialize(to_version)
+            candidates = self._touched_between(from_version, to_version)
+        elif self._head in self._versions and not self._all_dirty:
+            # Live graph = head version + the nodes changed since it was taken
+            new_nodes, new_edges, new_hashes = self._materialize(self._head)  # type: ignore[arg-type]
+            live_nodes, live_edges = self._read(self._dirty)
+            _apply_delta(new_nodes, new_edges, live_nodes, live_edges, new_hashes, _hashes(live_nodes, live_edges))
+            candidates = self._touched_between(from_version, self._head)  # type: ignore[arg-type]
+            if candidates is not None:
+                candidates |= self._dirty
+        else:
+            new_nodes, new_edges = self._read_all()
+            new_hashes = _hashes(new_nodes, new_edges)
+            candidates = None
+
+        if candidates is None:
+            # Unrelated versions: compare every node, but by hash only
+            candidates = set(old_hashes) | set(new_hashes)
+        result = _diff_tables(old_nodes, old_edges, old_hashes, new_nodes, new_edges, new_hashes, candidates)
+        result["from_version"] = from_version
+        result["to_version"] = to_version or "live"
+        return result
+
+    # ========================================================================
+    # Capture / restore
+    # ========================================================================
+
+    def _read_all(self) -> Tuple[NodeEntries, EdgeEntries]:
+        nodes: NodeEntries = {}
+        edges: EdgeEntries = {}
+        for node in self.graph_system.get_all_nodes():
+            node_id = str(node.id)
+            nodes[node_id] = [node.node_type, copy.deepcopy(node.data)]
+            edges[node_id] = _outgoing(node)
+        return nodes, edges
+
+    def _read(self, node_ids: Set[str]) -> Tuple[NodeEntries, EdgeEntries]:
+        """Copy the given nodes from the live graph (None for ones that no longer exist)."""
+        nodes: NodeEntries = {}
+        edges: EdgeEntries = {}
+        for node_id in node_ids:
+            node = self.graph_system.get_node(node_id)
+            if node is None:
+                nodes[node_id] = edges[node_id] = None
+            else:
+                nodes[node_id] = [node.node_type, copy.deepcopy(node.data)]
+                edges[node_id] = _outgoing(node)
+        return nodes, edges
+
+    def _capture_all(self) -> Tuple[NodeEntries, EdgeEntries]:
+        nodes, edges = self._read_all()
+        self._head_ids = set(nodes)
+        self._incoming = {}
+        self._index_edges(edges)
+        return nodes, edges
+
+    def _capture(self, node_ids: Set[str]) -> Tuple[NodeEntries, EdgeEntries]:
+        """Copy only the given nodes (copy-on-write: everything else is shared with the parent)."""
+        nodes, edges = self._read(node_ids)
+        for node_id, entry in nodes.items():
+            if entry is None:
+                self._head_ids.discard(node_id)
+            else:
+                self._head_ids.add(node_id)
+        self._index_edges(edges)
+        return nodes, edges
+
+    def _index_edges(self, edges: EdgeEntries) -> None:
+        for source_id, outgoing in edges.items():
+            for target_id, _, _ in outgoing or []:
+                self._incoming.setdefault(target_id, set()).add(source_id)
+
+    def _chain(self, version_id: str) -> List[SnapshotVersion]:
+        """The version and its ancestors back to (and including) its checkpoint, newest first."""
+        chain: List[SnapshotVersion] = []
+        version: Optional[SnapshotVersion] = self._versions[version_id]
+        while version is not None:
+            chain.append(version)
+            version = self._versions.get(version.parent_id) if version.parent_id else None
+        return chain
+
+    def _materialize(self, version_id: str) -> Tuple[NodeEntries, EdgeEntries, Dict[str, str]]:
+        """Full node/edge/hash tables of a version: its checkpoint plus the deltas after it."""
+        nodes: NodeEntries = {}
+        edges: EdgeEntries = {}
+        hashes: Dict[str, str] = {}
+        for version in reversed(self._chain(version_id)):
+            _apply_delta(nodes, edges, version.nodes, version.edges, hashes, version.hashes)
+        return nodes, edges, hashes
+
+    def _touched_between(self, first: str, second: str) -> Optional[Set[str]]:
+        """
+        Node ids written by the deltas between two versions of one chain.
+
+        Only these can differ between the two. None if neither version is an
+        ancestor of the other through deltas.
+        """
+        for ancestor, descendant in ((first, second), (second, first)):
+            touched: Set[str] = set()
+            for version in self._chain(descendant):
+                if version.version_id == ancestor:
+                    return touched
+                touched.update(version.nodes)
+        return None
+
+    def _restore(self, nodes: NodeEntries, edges: EdgeEntries) -> None:
+        """Make the graph equal to the given tables, touching only what differs."""
+        current = {str(node.id): node for node in self.graph_system.get_all_nodes()}
+        for node_id in set(current) - set(nodes):
+            self.graph_system.remove_node(node_id)
+
+        for node_id, entry in nodes.items():
+            node_type, data = entry  # type: ignore[misc]
+            node = current.get(node_id)
+            if node is None:
+                self.graph_system.add_node(node_id=node_id, node_type=node_type, data=copy.deepcopy(data))
+            elif node.node_type != node_type or node.data != data:
+                node.node_type = node_type
+                node.data = copy.deepcopy(data)
+
+        for node_id in nodes:
+            node = self.graph_system.get_node(node_id)
+            wanted = [edge for edge in edges.get(node_id) or [] if edge[0] in nodes]
+            existing = _outgoing(node)
+            if sorted(e[:2] for e in existing) == sorted(e[:2] for e in wanted):
+                continue
+            for target_id, dependency_type, _ in existing:
+                node.remove_dependency(target_node_id=target_id, dependency_type=dependency_type)
+            for target_id, dependency_type, metadata in wanted:
+                node.add_dependency(target_node_id=target_id, dependency_type=dependency_type, metadata=metadata or {})
+
+    # ========================================================================
+    # Retention and persistence
+    # ========================================================================
+
+    def _enforce_retention(self) -> List[SnapshotVersion]:
+        """Drop the oldest versions past retention. Returns versions rewritten as checkpoints."""
+        rewritten: List[SnapshotVersion] = []
+        while self.retention and len(self._versions) > self.retention:
+            oldest_id = next(iter(self._versions))
+            for version in list(self._versions.values()):
+                if version.parent_id == oldest_id:
+                    nodes, edges, hashes = self._materialize(version.version_id)
+                    folded = SnapshotVersion(
+                        version.version_id,
+                        version.name,
+                        version.description,
+                        None,
+                        nodes,
+                        edges,
+                        version.node_count,
+                        created_at=version.created_at,
+                        hashes=hashes,
+                    )
+                    self._versions[version.version_id] = folded
+                    self._rebase_depths()
+                    rewritten.append(folded)
+            del self._versions[oldest_id]
+            self._deleted.append(oldest_id)
+            if self._head == oldest_id:
+                self._head = None
+                self._all_dirty = True
+        return rewritten
+
+    def _rebase_depths(self) -> None:
+        for version in self._versions.values():  # Oldest first, so parents come before children
+            if version.parent_id is not None and version.parent_id in self._versions:
+                version.depth = self._versions[version.parent_id].depth + 1
+
+    async def _ensure_loaded(self, session: Optional[AsyncSession]) -> None:
+        """Load persisted versions once (e.g. after a restart)."""
+        if self._loaded or session is None or self.project_id is None:
+            return
+        self._loaded = True
+        try:
+            rows = (
+                (
+                    await session.execute(
+                        select(GraphVersion)
+                        .where(GraphVersion.project_id == self.project_id)
+                        .order_by(GraphVersion.created_at)
+                    )
+                )
+                .scalars()
+                .all()
+            )
+        except Exception as e:
+            print(f"⚠️  Failed to load graph versions for {self.project_id}: {e}")
+            return
+
+        persisted: "OrderedDict[str, SnapshotVersion]" = OrderedDict()
+        for row in rows:
+            persisted[str(row.id)] = SnapshotVersion(
+                str(row.id),
+                row.name,
+                row.description or "",
+                str(row.parent_id) if row.parent_id else None,
+                row.payload.get("nodes", {}),
+                row.payload.get("edges", {}),
+                row.node_count,
+                created_at=row.created_at,
+            )
+        # Versions taken in this process before the first load are newer
+        persisted.update(self._versions)
+        self._versions = persisted
+        self._rebase_depths()
+
+    async def _persist(self, session: Optional[AsyncSession], changed: Sequence[SnapshotVersion]) -> None:
+        """Write versions through the caller's session (flushed only - the caller owns the commit)."""
+        deleted, self._deleted = self._deleted, []
+        if session is None or self.project_id is None:
+            return
+        try:
+            if deleted:
+                await session.execute(delete(GraphVersion).where(GraphVersion.id.in_([UUID(v) for v in deleted])))
+            for version in changed:
+                await session.merge(
+                    GraphVersion(
+                        id=UUID(version.version_id),
+                        project_id=self.project_id,
+                        parent_id=UUID(version.parent_id) if version.parent_id else None,
+                        name=version.name,
+                        description=version.description,
+                        is_checkpoint=version.is_checkpoint,
+                        node_count=version.node_count,
+                        size_bytes=version.size_bytes,
+                        payload=version.payload(),
+                        created_at=version.created_at,
+                    )
+                )
+            await session.flush()
+        except Exception as e:
+            print(f"⚠️  Failed to persist graph versions for {self.project_id}: {e}")
+
+    def _on_graph_change(self, version: int, changes: Optional[Sequence[GraphChange]]) -> None:
+        # A skipped version means a missed change list: the dirty set can no longer be trusted
+        missed = version != self._seen_version + 1
+        self._seen_version = version
+        if changes is None or missed:
+            self._all_dirty = True
+            return
+        for change in changes:
+            self._dirty.add(change.node_id)  # Edge changes: the source node's outgoing list
+            if change.kind == GraphChange.REMOVE_NODE:
+                self._dirty |= self._incoming.pop(change.node_id, set())
+            elif change.kind == GraphChange.ADD_DEPENDENCY and change.target_id is not None:
+                self._incoming.setdefault(change.target_id, set()).add(change.node_id)
+
+
+def _outgoing(node: Any) -> List[List[Any]]:
+    return [
+        [str(dep.target_node_id), dep.dependency_type, getattr(dep, "metadata", None)]
+        for dep in node.get_dependencies(direction="outgoing")
+    ]
+
+
+def content_hash(entry: List[Any], edges: Optional[List[List[Any]]]) -> str:
+    """Stable hash of a node's type, data and outgoing edges."""
+    content = [entry, sorted(edges or [], key=lambda edge: (edge[0], edge[1]))]
+    return hashlib.blake2b(json.dumps(content, sort_keys=True, default=str).encode(), digest_size=16).hexdigest()
+
+
+def _hashes(nodes: NodeEntries, edges: EdgeEntries) -> Dict[str, str]:
+    return {node_id: content_hash(entry, edges.get(node_id)) for node_id, entry in nodes.items() if entry}
+
+
+def _apply_delta(
+    nodes: NodeEntries,
+    edges: EdgeEntries,
+    delta_nodes: NodeEntries,
+    delta_edges: EdgeEntries,
+    hashes: Optional[Dict[str, str]] = None,
+    delta_hashes: Optional[Dict[str, str]] = None,
+) -> None:
+    for node_id, entry in delta_nodes.items():
+        if entry is None:
+            nodes.pop(node_id, None)
+            edges.pop(node_id, None)
+            if hashes is not None:
+                hashes.pop(node_id, None)
+        else:
+            nodes[node_id] = entry
+            if hashes is not None and delta_hashes is not None:
+                hashes[node_id] = delta_hashes[node_id]
+    for node_id, entry in delta_edges.items():
+        if entry is not None:
+            edges[node_id] = entry
+
+
+def _diff_tables(
+    old_nodes: NodeEntries,
+    old_edges: EdgeEntries,
+    old_hashes: Dict[str, str],
+    new_nodes: NodeEntries,
+    new_edges: EdgeEntries,
+    new_hashes: Dict[str, str],
+    candidates: Set[str],
+) -> Dict[str, Any]:
+    """
+    Compare the candidate nodes; ones with equal hashes are skipped without a deep comparison.
+
+    Edges are keyed by (target, type); a metadata-only difference is reported
+    under edges.changed. Edges into removed nodes are reported for every
+    source, including sources that are not candidates themselves.
+    """
+    added: List[Dict[str, Any]] = []
+    removed: List[Dict[str, Any]] = []
+    changed: List[Dict[str, Any]] = []
+    edges_added: List[Dict[str, Any]] = []
+    edges_removed: List[Dict[str, Any]] = []
+    edges_changed: List[Dict[str, Any]] = []
+    compared: Set[str] = set()
+
+    for node_id in sorted(candidates):
+        old_hash, new_hash = old_hashes.get(node_id), new_hashes.get(node_id)
+        if old_hash == new_hash:
+            continue
+        compared.add(node_id)
+        old_entry, new_entry = old_nodes.get(node_id), new_nodes.get(node_id)
+        if old_entry is None:
+            added.append({"node_id": node_id, "node_type": new_entry[0], "data": new_entry[1]})  # type: ignore[index]
+        elif new_entry is None:
+            removed.append({"node_id": node_id, "node_type": old_entry[0], "data": old_entry[1]})
+        elif old_entry != new_entry:
+            old_data, new_data = old_entry[1] or {}, new_entry[1] or {}
+            fields = sorted(key for key in set(old_data) | set(new_data) if old_data.get(key) != new_data.get(key))
+            if old_entry[0] != new_entry[0]:
+                fields.insert(0, "node_type")
+            changed.append({"node_id": node_id, "node_type": new_entry[0], "changed_fields": fields})
+
+        old_out = {(edge[0], edge[1]): edge[2] for edge in old_edges.get(node_id) or [] if edge[0] in old_nodes}
+        new_out = {(edge[0], edge[1]): edge[2] for edge in new_edges.get(node_id) or [] if edge[0] in new_nodes}
+        for target_id, dependency_type in sorted(new_out.keys() - old_out.keys()):
+            edges_added.append(_edge_entry(node_id, target_id, dependency_type))
+        for target_id, dependency_type in sorted(old_out.keys() - new_out.keys()):
+            edges_removed.append(_edge_entry(node_id, target_id, dependency_type))
+        for key in sorted(old_out.keys() & new_out.keys()):
+            if old_out[key] != new_out[key]:
+                edges_changed.append({**_edge_entry(node_id, *key), "metadata": new_out[key]})
+
+    removed_ids = {entry["node_id"] for entry in removed}
+    if removed_ids:
+        # A removed node takes the edges into it along, also from sources that were not compared
+        for source_id in sorted(set(old_edges) - compared):
+            if source_id not in new_nodes:
+                continue
+            for target_id, dependency_type, _ in old_edges[source_id] or []:
+                if target_id in removed_ids:
+                    edges_removed.append(_edge_entry(source_id, target_id, dependency_type))
+
+    return {
+        "nodes": {"added": added, "removed": removed, "changed": changed},
+        "edges": {"added": edges_added, "removed": edges_removed, "changed": edges_changed},
+        "examined_nodes": len(candidates),
+    }
+
+
+def _edge_entry(from_node_id: str, to_node_id: str, dependency_type: str) -> Dict[str, Any]:
+    return {"from_node_id": from_node_id, "to_node_id": to_node_id, "dependency_type": dependency_type}
@@ -0,0 +1,67 @@
+"""
+Materialized paths for self-referencing hierarchies (ArchitectureModule, TreeNode).
+
+Every row stores the ids from its root down to itself as "/<root>/.../<id>/".
+A subtree is then one prefix scan (path LIKE '/.../<id>/%', served by a
+text_pattern_ops index), ancestors are read off the path itself, and moving a
+subtree rewrites the prefix of all its rows in one UPDATE - no per-level
+parent_id lookups on deep hierarchies.
+"""
+
+from typing import Any, List, Optional, cast
+from uuid import UUID
+
+from sqlalchemy import CursorResult, func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+PATH_SEPARATOR = "/"
+
+
+def build_path(parent_path: Optional[str], node_id: UUID) -> str:
+    """Path of node_id under a parent with parent_path (None: a root)."""
+    return f"{parent_path or PATH_SEPARATOR}{node_id}{PATH_SEPARATOR}"
+
+
+def path_ids(path: Optional[str]) -> List[UUID]:
+    """Ids along a path, from the root down to the node itself."""
+    return [UUID(part) for part in (path or "").split(PATH_SEPARATOR) if part]
+
+
+def path_level(path: str) -> int:
+    """Depth of the node at path (roots are level 0)."""
+    return path.count(PATH_SEPARATOR) - 2
+
+
+def require_path(path: Optional[str], label: str) -> str:
+    """path itself; ValueError if the row has none yet (not backfilled)."""
+    if path is None:
+        raise ValueError(f"{label} has no materialized path")
+    return path
+
+
+def is_within(path: str, ancestor_path: str) -> bool:
+    """True if path is ancestor_path itself or lies below it."""
+    return path.startswith(ancestor_path)
+
+
+async def move_subtree(session: AsyncSession, model: Any, old_path: str, new_path: str) -> int:
+    """
+    Re-root the subtree at old_path to new_path (one UPDATE, not committed).
+
+    model is a mapped class with path and level columns; levels shift by the
+    change in depth. Returns the number of rows rewritten.
+    """
+    level_delta = path_level(new_path) - path_level(old_path)
+    result = cast(
+        CursorResult[Any],
+        await session.execute(
+            update(model)
+            .where(model.path.startswith(old_path))
+            .values(
+                path=func.concat(new_path, func.substr(model.path, len(old_path) + 1)),
+                level=model.level + level_delta,
+            )
+            .execution_options(synchronize_session="fetch")
+        ),
+    )
+    return int(result.rowcount)
@@ -12,14 +12,33 @@ This module provides FULL utilization of RefMemTree capabilities:
 8. Branch management
 """
 
-from typing import Any, Optional, Callable, List, Dict
+from typing import Any, Optional, Callable, Iterator, List, Dict, MutableMapping
 from uuid import UUID, uuid4
 from datetime import datetime
 
+from backend.core.compact_graph import CompactLinkStore
+from backend.core.rule_engine import compile_condition, node_layer
+from backend.core.graph_algorithms import (
+    DEFAULT_MAX_PATHS,
+    DEFAULT_TIME_BUDGET_SECONDS,
+    PathSearchLimits,
+    PathSearchResult,
+    ReachabilitySummary,
+    enumerate_paths,
+    k_shortest_paths,
+    reachability_summary,
+)
+
+# Approximate per-element memory for estimate_size_bytes() (CPython 3.11, tracemalloc)
+NODE_ENTRY_BYTES = 512  # dict slot + node data dict with a few short fields
+LINK_OBJECT_BYTES = 500  # DependencyLink with its UUIDs, datetime and both index list slots
+
 
 class NodeRule:
     """Rule definition for a node."""
 
+    __slots__ = ("rule_id", "rule_type", "condition", "action", "priority", "created_at")
+
     def __init__(
         self,
         rule_id: UUID,
@@ -39,6 +58,8 @@ class NodeRule:
 class NodeChangeEvent:
     """Event representing a change to a node."""
 
+    __slots__ = ("event_id", "node_id", "change_type", "old_value", "new_value", "timestamp", "changed_by")
+
     def __init__(
         self,
         node_id: UUID,
@@ -60,6 +81,8 @@ class NodeChangeEvent:
 class DependencyLink:
     """Represents a dependency between nodes."""
 
+    __slots__ = ("link_id", "from_node_id", "to_node_id", "dependency_type", "strength", "created_at")
+
     def __init__(
         self,
         from_node_id: UUID,
@@ -78,6 +101,18 @@ class DependencyLink:
 class ImpactAnalysisResult:
     """Result of impact analysis for a node change."""
 
+    __slots__ = (
+        "target_node_id",
+        "change_type",
+        "affected_nodes",
+        "impact_scores",
+        "propagation_path",
+        "recommendations",
+        "reachability",
+        "paths_truncated",
+        "analyzed_at",
+    )
+
     def __init__(
         self,
         target_node_id: UUID,
@@ -86,6 +121,8 @@ class ImpactAnalysisResult:
         impact_scores: dict[UUID, float],
         propagation_path: list[list[UUID]],
         recommendations: list[str],
+        reachability: Optional[ReachabilitySummary] = None,
+        paths_truncated: bool = False,
     ):
         self.target_node_id = target_node_id
         self.change_type = change_type
@@ -93,12 +130,24 @@ class ImpactAnalysisResult:
         self.impact_scores = impact_scores  # node_id -> impact score (0.0-1.0)
         self.propagation_path = propagation_path  # chains of affected nodes
         self.recommendations = recommendations
+        self.reachability = reachability  # transitive dependents summary (path_mode="summary")
+        self.paths_truncated = paths_truncated  # propagation_path hit a path/time limit
         self.analyzed_at = datetime.utcnow()
 
 
 class ChangeSimulation:
     """Simulation result of a proposed change."""
 
+    __slots__ = (
+        "simulation_id",
+        "change_description",
+        "affected_nodes",
+        "side_effects",
+        "risk_level",
+        "success_probability",
+        "simulated_at",
+    )
+
     def __init__(
         self,
         simulation_id: UUID,
@@ -137,6 +186,7 @@ class RefMemTreeManager:
         self.nodes: Dict[UUID, Dict[str, Any]] = {}
         self.rules: Dict[UUID, List[NodeRule]] = {}  # node_id -> rules
         self.dependencies: Dict[UUID, List[DependencyLink]] = {}  # node_id -> dependencies
+        self.dependents: Dict[UUID, List[DependencyLink]] = {}  # node_id -> incoming links (reverse index)
         self.change_history: Dict[UUID, List[NodeChangeEvent]] = {}  # node_id -> events
         self.context_versions: Dict[UUID, List[Dict[str, Any]]] = {}  # node_id -> versions
 
@@ -161,17 +211,33 @@ class RefMemTreeManager:
         violations = []
 
         for rule in rules:
-            if rule.rule_type == "validation":
+            if rule.rule_type not in ("transformation", "notification"):
                 # Check condition
-                if not self._evaluate_rule_condition(rule.condition, proposed_change):
+                if not self._evaluate_rule_condition(rule.condition, proposed_change, node_id):
                     violations.append(f"Rule violation: {rule.action}")
 
         return len(violations) == 0, violations
 
-    def _evaluate_rule_condition(self, condition: str, change: dict[str, Any]) -> bool:
-        """Evaluate rule condition (simplified)."""
-        # In real implementation, this would parse and evaluate conditions
-        return True
+    def _evaluate_rule_condition(
+        self, condition: str, change: dict[str, Any], node_id: Optional[UUID] = None
+    ) -> bool:
+        """
+        Evaluate rule condition against the node as it would be after the change.
+
+        Conditions are compiled once per distinct string (core/rule_engine.py);
+        ones that cannot be checked mechanically pass.
+        """
+        rule = compile_condition(condition)
+        if rule is None:
+            return True
+        data = {**(self.nodes.get(node_id) or {}), **change} if node_id is not None else change
+        targets = self._dependency_targets(node_id) if node_id is not None else []
+        return rule.check_values(
+            name=data.get("name"),
+            out_degree=len(targets),
+            layer=node_layer(data.get("type"), data),
+            target_layers=[node_layer(target.get("type"), target) for target in map(self.nodes.get, targets) if target],
+        )
 
     # ========================================================================
     # 2. NODE CHANGE MONITORING
@@ -216,47 +282,116 @@ class RefMemTreeManager:
             self.dependencies[link.from_node_id] = []
         self.dependencies[link.from_node_id].append(link)
 
+        # Keep the reverse index in sync
+        if link.to_node_id not in self.dependents:
+            self.dependents[link.to_node_id] = []
+        self.dependents[link.to_node_id].append(link)
+
+    def remove_dependency(
+        self,
+        from_node_id: UUID,
+        to_node_id: UUID,
+        dependency_type: Optional[str] = None,
+    ) -> int:
+        """
+        Remove dependency links from -> to (optionally only of one type).
+
+        Returns number of links removed.
+        """
+
+        def matches(link: DependencyLink) -> bool:
+            return link.to_node_id == to_node_id and (
+                dependency_type is None or link.dependency_type == dependency_type
+            )
+
+        outgoing = self.dependencies.get(from_node_id, [])
+        kept = [link for link in outgoing if not matches(link)]
+        removed = len(outgoing) - len(kept)
+        if not removed:
+            return 0
+
+        if kept:
+            self.dependencies[from_node_id] = kept
+        else:
+            del self.dependencies[from_node_id]
+
+        incoming = [
+            link
+            for link in self.dependents.get(to_node_id, [])
+            if not (link.from_node_id == from_node_id and matches(link))
+        ]
+        if incoming:
+            self.dependents[to_node_id] = incoming
+        else:
+            self.dependents.pop(to_node_id, None)
+
+        return removed
+
     def get_dependencies(self, node_id: UUID) -> list[DependencyLink]:
         """Get all dependencies FROM this node."""
         return self.dependencies.get(node_id, [])
 
     def get_dependents(self, node_id: UUID) -> list[DependencyLink]:
-        """Get all nodes that depend ON this node."""
-        dependents = []
-        for from_node, links in self.dependencies.items():
-            for link in links:
-                if link.to_node_id == node_id:
-                    dependents.append(link)
-        return dependents
-
-    def get_dependency_chain(self, node_id: UUID, max_depth: int = 5) -> List[List[UUID]]:
-        """Get all dependency chains from this node."""
-        chains: List[List[UUID]] = []
-        self._build_dependency_chains(node_id, [], chains, max_depth)
-        return chains
-
-    def _build_dependency_chains(
+        """Get all nodes that depend ON this node (O(in-degree) via reverse index)."""
+        return list(self.dependents.get(node_id, []))
+
+    def get_dependency_chain(
         self,
-        current_id: UUID,
-        current_chain: List[UUID],
-        all_chains: List[List[UUID]],
-        max_depth: int,
-    ) -> None:
-        """Recursively build dependency chains."""
-        if len(current_chain) >= max_depth:
-            return
+        node_id: UUID,
+        max_depth: int = 5,
+        max_paths: int = DEFAULT_MAX_PATHS,
+        time_budget_seconds: float = DEFAULT_TIME_BUDGET_SECONDS,
+        mode: str = "all",
+    ) -> List[List[UUID]]:
+        """
+        Get dependency chains from this node (bounded).
+
+        mode="all" enumerates chains depth-first, mode="shortest" returns the
+        max_paths shortest chains. Enumeration stops after max_paths chains or
+        time_budget_seconds; use search_dependency_chains() to know whether
+        the result was truncated.
+        """
+        return self.search_dependency_chains(node_id, max_depth, max_paths, time_budget_seconds, mode).paths
+
+    def search_dependency_chains(
+        self,
+        node_id: UUID,
+        max_depth: int = 5,
+        max_paths: int = DEFAULT_MAX_PATHS,
+        time_budget_seconds: float = DEFAULT_TIME_BUDGET_SECONDS,
+        mode: str = "all",
+    ) -> PathSearchResult:
+        """Like get_dependency_chain(), but also reports truncation."""
+        limits = PathSearchLimits(max_depth, max_paths, time_budget_seconds)
+        return self._search_paths(node_id, self._dependency_targets, limits, mode)
+
+    def get_dependency_reachability(self, node_id: UUID, max_depth: Optional[int] = None) -> ReachabilitySummary:
+        """
+        Aggregate view of everything this node depends on, transitively.
 
-        current_chain = current_chain + [current_id]
-        dependencies = self.get_dependencies(current_id)
+        O(V + E): per-node shortest depth, plus longest depth and number of
+        distinct chains when the reachable subgraph is acyclic.
+        """
+        return reachability_summary(node_id, self._dependency_targets, max_depth)
+
+    def _dependency_targets(self, node_id: UUID) -> List[UUID]:
+        return [dep.to_node_id for dep in self.dependencies.get(node_id, [])]
 
-        if not dependencies:
-            # Leaf node - save chain
-            all_chains.append(current_chain)
-            return
+    def _dependent_sources(self, node_id: UUID) -> List[UUID]:
+        return [dep.from_node_id for dep in self.dependents.get(node_id, [])]
 
-        for dep in dependencies:
-            if dep.to_node_id not in current_chain:  # Avoid cycles
-                self._build_dependency_chains(dep.to_node_id, current_chain, all_chains, max_depth)
+    @staticmethod
+    def _search_paths(
+        node_id: UUID,
+        successors: Callable[[UUID], List[UUID]],
+        limits: PathSearchLimits,
+        mode: str,
+    ) -> PathSearchResult:
+        if mode == "all":
+            return enumerate_paths(node_id, successors, limits)
+        if mode == "shortest":
+            return k_shortest_paths(node_id, successors, limits)
+        raise ValueError(f"Unknown path mode: {mode}")
 
     # ========================================================================
     # 4. IMPACT ANALYSIS
@@ -267,11 +402,17 @@ class RefMemTreeManager:
         node_id: UUID,
         change_type: str,
         change_details: Optional[dict[str, Any]] = None,
+        limits: Optional[PathSearchLimits] = None,
+        path_mode: str = "all",
     ) -> ImpactAnalysisResult:
         """
         Analyze impact of changing a node.
 
         Returns which nodes would be affected and how severely.
+
+        path_mode selects how propagation is reported: "all" (bounded path
+        enumeration), "shortest" (k shortest paths) or "summary" (no paths,
+        aggregated reachability over all transitive dependents instead).
         """
         # Find all dependent nodes
         dependents = self.get_dependents(node_id)
@@ -294,7 +435,16 @@ class RefMemTreeManager:
             impact_scores[dep.from_node_id] = min(1.0, base_score)
 
         # Build propagation paths
-        propagation_path = self._get_propagation_paths(node_id)
+        limits = limits or PathSearchLimits(max_depth=3)
+        reachability: Optional[ReachabilitySummary] = None
+        paths_truncated = False
+        if path_mode == "summary":
+            propagation_path: List[List[UUID]] = []
+            reachability = reachability_summary(node_id, self._dependent_sources, limits.max_depth)
+        else:
+            search = self._search_paths(node_id, self._dependent_sources, limits, path_mode)
+            propagation_path = search.paths
+            paths_truncated = search.truncated
 
         # Generate recommendations
         recommendations = []
@@ -314,36 +464,10 @@ class RefMemTreeManager:
             impact_scores=impact_scores,
             propagation_path=propagation_path,
             recommendations=recommendations,
+            reachability=reachability,
+            paths_truncated=paths_truncated,
         )
 
-    def _get_propagation_paths(self, node_id: UUID, max_depth: int = 3) -> List[List[UUID]]:
-        """Get paths showing how changes propagate."""
-        paths: List[List[UUID]] = []
-        self._trace_propagation(node_id, [], paths, max_depth)
-        return paths
-
-    def _trace_propagation(
-        self,
-        current_id: UUID,
-        current_path: List[UUID],
-        all_paths: List[List[UUID]],
-        max_depth: int,
-    ) -> None:
-        """Recursively trace change propagation."""
-        if len(current_path) >= max_depth:
-            return
-
-        current_path = current_path + [current_id]
-        dependents = self.get_dependents(current_id)
-
-        if not dependents:
-            all_paths.append(current_path)
-            return
-
-        for dep in dependents:
-            if dep.from_node_id not in current_path:  # Avoid cycles
-                self._trace_propagation(dep.from_node_id, current_path, all_paths, max_depth)
-
     # ========================================================================
     # 5. CHANGE SIMULATION
     # ========================================================================
@@ -538,6 +662,142 @@ class RefMemTreeManager:
         """Get node data."""
         return self.nodes.get(node_id)
 
+    def remove_node(self, node_id: UUID) -> None:
+        """Remove node with its rules and all links to and from it."""
+        self.nodes.pop(node_id, None)
+        self.rules.pop(node_id, None)
+        for link in self.dependencies.get(node_id, [])[:]:
+            self.remove_dependency(node_id, link.to_node_id)
+        for link in self.dependents.get(node_id, [])[:]:
+            self.remove_dependency(link.from_node_id, node_id)
+
+    def link_count(self) -> int:
+        """Number of dependency links."""
+        return sum(len(links) for links in self.dependencies.values())
+
+    def estimate_size_bytes(self) -> int:
+        """Approximate memory held by nodes and links (for cache budgets)."""
+        return NODE_ENTRY_BYTES * len(self.nodes) + LINK_OBJECT_BYTES * self.link_count()
+
+
+class _NodeTable(MutableMapping[UUID, Dict[str, Any]]):
+    """Node data of CompactRefMemTreeManager, in a list indexed by interned node id."""
+
+    __slots__ = ("_store", "_data", "_count")
+
+    def __init__(self, store: CompactLinkStore) -> None:
+        self._store = store
+        self._data: List[Optional[Dict[str, Any]]] = []
+        self._count = 0
+
+    def __getitem__(self, node_id: UUID) -> Dict[str, Any]:
+        index = self._store.lookup(node_id)
+        data = self._data[index] if index is not None and index < len(self._data) else None
+        if data is None:
+            raise KeyError(node_id)
+        return data
+
+    def __setitem__(self, node_id: UUID, data: Dict[str, Any]) -> None:
+        index = self._store.intern(node_id)
+        if index >= len(self._data):
+            self._data.extend([None] * (index + 1 - len(self._data)))
+        if self._data[index] is None:
+            self._count += 1
+        self._data[index] = data
+
+    def __delitem__(self, node_id: UUID) -> None:
+        index = self._store.lookup(node_id)
+        if index is None or index >= len(self._data) or self._data[index] is None:
+            raise KeyError(node_id)
+        self._data[index] = None
+        self._count -= 1
+
+    def __iter__(self) -> Iterator[UUID]:
+        for index, data in enumerate(self._data):
+            if data is not None:
+                yield self._store.node_id(index)
+
+    def __len__(self) -> int:
+        return self._count
+
+
+class CompactRefMemTreeManager(RefMemTreeManager):
+    """
+    RefMemTreeManager with array-backed node and link storage.
+
+    Same public query methods, but links live in a CompactLinkStore
+    (interned node ids, typed-array columns, CSR indexes - see
+    core/compact_graph.py) instead of one DependencyLink object per link:
+    roughly 140 instead of 500 bytes per link. Path searches, reachability
+    and impact propagation walk the arrays directly; get_dependencies() and
+    get_dependents() build DependencyLink objects on demand, so their
+    link_id and created_at are not stable between calls.
+
+    There are no `dependencies` / `dependents` dicts in this mode.
+    """
+
+    def __init__(self) -> None:
+        self._links = CompactLinkStore()
+        self.nodes: MutableMapping[UUID, Dict[str, Any]] = _NodeTable(self._links)  # type: ignore[assignment]
+        self.rules: Dict[UUID, List[NodeRule]] = {}
+        self.change_history: Dict[UUID, List[NodeChangeEvent]] = {}
+        self.context_versions: Dict[UUID, List[Dict[str, Any]]] = {}
+
+    def add_dependency(self, link: DependencyLink) -> None:
+        """Add dependency link between nodes."""
+        self._links.add(link.from_node_id, link.to_node_id, link.dependency_type, link.strength)
+
+    def remove_dependency(
+        self,
+        from_node_id: UUID,
+        to_node_id: UUID,
+        dependency_type: Optional[str] = None,
+    ) -> int:
+        """Remove dependency links from -> to (optionally only of one type)."""
+        return self._links.remove(from_node_id, to_node_id, dependency_type)
+
+    def get_dependencies(self, node_id: UUID) -> list[DependencyLink]:
+        """Get all dependencies FROM this node."""
+        index = self._links.lookup(node_id)
+        return [] if index is None else [self._materialize(edge) for edge in self._links.out_edges(index)]
+
+    def get_dependents(self, node_id: UUID) -> list[DependencyLink]:
+        """Get all nodes that depend ON this node."""
+        index = self._links.lookup(node_id)
+        return [] if index is None else [self._materialize(edge) for edge in self._links.in_edges(index)]
+
+    def _dependency_targets(self, node_id: UUID) -> List[UUID]:
+        index = self._links.lookup(node_id)
+        if index is None:
+            return []
+        node_ids = self._links.node_id
+        return [node_ids(target) for target in self._links.successors(index)]
+
+    def _dependent_sources(self, node_id: UUID) -> List[UUID]:
+        index = self._links.lookup(node_id)
+        if index is None:
+            return []
+        node_ids = self._links.node_id
+        return [node_ids(source) for source in self._links.predecessors(index)]
+
+    def remove_node(self, node_id: UUID) -> None:
+        """Remove node with its rules and all links to and from it."""
+        self.nodes.pop(node_id, None)
+        self.rules.pop(node_id, None)
+        self._links.remove_node_edges(node_id)
+
+    def link_count(self) -> int:
+        """Number of dependency links."""
+        return len(self._links)
+
+    def estimate_size_bytes(self) -> int:
+        """Approximate memory held by nodes and links (for cache budgets)."""
+        return NODE_ENTRY_BYTES * len(self.nodes) + self._links.size_bytes()
+
+    def _materialize(self, edge: int) -> DependencyLink:
+        source, target, dependency_type, strength = self._links.edge(edge)
+        return DependencyLink(self._links.node_id(source), self._links.node_id(target), dependency_type, strength)
+
 
 # ============================================================================
 # High-Level Helper Functions
@@ -548,18 +808,31 @@ def analyze_architecture_change_impact(
     manager: RefMemTreeManager,
     module_id: UUID,
     change_type: str,
+    limits: Optional[PathSearchLimits] = None,
+    path_mode: str = "all",
 ) -> dict[str, Any]:
     """
     Analyze impact of changing an architecture module.
 
     Use case: Before modifying/deleting a module, see what breaks.
+    limits and path_mode are passed to RefMemTreeManager.analyze_change_impact().
     """
-    impact = manager.analyze_change_impact(module_id, change_type)
+    impact = manager.analyze_change_impact(module_id, change_type, limits=limits, path_mode=path_mode)
+
+    if impact.propagation_path:
+        propagation_depth = max(len(path) for path in impact.propagation_path)
+    elif impact.reachability is not None:
+        propagation_depth = impact.reachability.depth + 1  # Same unit as path length
+    else:
+        propagation_depth = 0
 
     return {
         "affected_modules": [str(nid) for nid in impact.affected_nodes],
         "high_impact_count": sum(1 for score in impact.impact_scores.values() if score > 0.7),
-        "propagation_depth": max(len(path) for path in impact.propagation_path) if impact.propagation_path else 0,
+        "propagation_depth": propagation_depth,
+        "propagation_truncated": impact.paths_truncated,
+        "path_mode": path_mode,
+        "transitive_affected_count": len(impact.reachability.reachable) if impact.reachability is not None else None,
         "recommendations": impact.recommendations,
         "safe_to_proceed": len([s for s in impact.impact_scores.values() if s > 0.9]) == 0,
     }
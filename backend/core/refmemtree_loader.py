@@ -1,129 +1,96 @@
 """
-RefMemTree Loader - Loads existing database data into RefMemTree on project open.
+RefMemTree Loader - RefMemTreeManager view of a project's hydrated graph.
 
-This is the CRITICAL component that bridges PostgreSQL ↔ RefMemTree.
+Projects are hydrated once, into the GraphManagerService project graph
+store. The RefMemTreeManager used by ArchitectureService (impact analysis,
+rule tracking, context) is derived from that same GraphSystem instead of
+a second load from PostgreSQL, and shares its invalidation and memory
+budget.
 """
 
-from typing import Dict, Optional
+from typing import Any, Dict, Optional, Sequence
 from uuid import UUID
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.core.refmemtree_advanced import DependencyLink, NodeRule, RefMemTreeManager
+from backend.core.config import settings
+from backend.core.graph_hydration_service import GraphHydrationService
+from backend.core.graph_revision import GraphChange, GraphRevision
+from backend.core.refmemtree_advanced import CompactRefMemTreeManager, DependencyLink, NodeRule, RefMemTreeManager
 from backend.db.models import ArchitectureModule, ArchitectureRule, ModuleDependency
+from refmemtree import GraphSystem
+
+# Strength mapping based on dependency type
+DEPENDENCY_STRENGTH = {
+    "extends": 1.0,  # Highest coupling - inheritance
+    "import": 0.9,  # High coupling - direct import
+    "implements": 0.8,  # High coupling - interface implementation
+    "uses": 0.6,  # Medium coupling - service usage
+    "depends_on": 0.4,  # Low coupling - general dependency
+}
+DEFAULT_DEPENDENCY_STRENGTH = 0.5
 
 
 class RefMemTreeLoader:
     """
-    Loads project data from PostgreSQL into RefMemTree.
+    Builds a RefMemTreeManager from a hydrated project graph.
 
-    Call this when:
-    - Project is first opened
-    - User refreshes architecture
-    - After major changes
+    No database queries: nodes and edges come from the GraphSystem, rules
+    from the hydration state. Projects with at least compact_min_links
+    links get the array-backed CompactRefMemTreeManager (0 disables).
     """
 
-    async def load_project(
-        self,
-        project_id: UUID,
-        session: AsyncSession,
-    ) -> RefMemTreeManager:
-        """
-        Load complete project into RefMemTree.
-
-        Returns initialized RefMemTreeManager with all data loaded.
-        """
-        manager = RefMemTreeManager()
-
-        # Step 1: Load all architecture modules
-        await self._load_modules(project_id, session, manager)
-
-        # Step 2: Load all module dependencies
-        await self._load_dependencies(project_id, session, manager)
-
-        # Step 3: Load all architecture rules
-        await self._load_rules(project_id, session, manager)
-
-        return manager
-
-    async def _load_modules(
-        self,
-        project_id: UUID,
-        session: AsyncSession,
-        manager: RefMemTreeManager,
-    ) -> None:
-        """Load all architecture modules into RefMemTree."""
-        result = await session.execute(select(ArchitectureModule).where(ArchitectureModule.project_id == project_id))
-        modules = result.scalars().all()
-
-        for module in modules:
-            # Register module in RefMemTree
-            module_data = {
-                "name": module.name,
-                "type": module.module_type,
-                "level": module.level,
-                "status": module.status,
-                "description": module.description,
-                "ai_generated": module.ai_generated,
-            }
-
-            manager.register_node(module.id, module_data)
-
-    async def _load_dependencies(
-        self,
-        project_id: UUID,
-        session: AsyncSession,
-        manager: RefMemTreeManager,
-    ) -> None:
-        """Load all module dependencies into RefMemTree."""
-        result = await session.execute(select(ModuleDependency).where(ModuleDependency.project_id == project_id))
-        dependencies = result.scalars().all()
-
-        # Strength mapping based on dependency type
-        strength_map = {
-            "extends": 1.0,  # Highest coupling - inheritance
-            "import": 0.9,  # High coupling - direct import
-            "implements": 0.8,  # High coupling - interface implementation
-            "uses": 0.6,  # Medium coupling - service usage
-            "depends_on": 0.4,  # Low coupling - general dependency
-        }
-
-        for dep in dependencies:
-            strength = strength_map.get(dep.dependency_type, 0.5)
+    def __init__(self, compact_min_links: Optional[int] = None) -> None:
+        self.compact_min_links = (
+            settings.REFMEMTREE_COMPACT_MIN_LINKS if compact_min_links is None else compact_min_links
+        )
 
-            link = DependencyLink(
-                from_node_id=dep.from_module_id,
-                to_node_id=dep.to_module_id,
-                dependency_type=dep.dependency_type,
-                strength=strength,
+    def build(self, graph_system: GraphSystem, hydration: GraphHydrationService) -> RefMemTreeManager:
+        nodes = list(graph_system.get_all_nodes())
+        links = [
+            (str(node.id), str(dep.target_node_id), dep.dependency_type)
+            for node in nodes
+            for dep in node.get_dependencies(direction="outgoing")
+        ]
+        compact = bool(self.compact_min_links) and len(links) >= self.compact_min_links
+        manager = CompactRefMemTreeManager() if compact else RefMemTreeManager()
+
+        # Step 1: Modules
+        for node in nodes:
+            self._register(manager, node)
+
+        # Step 2: Module dependencies
+        for from_id, to_id, dependency_type in links:
+            self._link(manager, from_id, to_id, dependency_type)
+
+        # Step 3: Architecture rules
+        for rule_id, row in hydration._rule_rows.items():
+            definition = row["rule_definition"] or {}
+            node_rule = NodeRule(
+                rule_id=rule_id,
+                rule_type=row["rule_type"],
+                condition=str(definition.get("condition", "")),
+                action=str(definition.get("action", "")),
+                priority=definition.get("priority", 0),
             )
 
-            manager.add_dependency(link)
+            # Add to specific module; global rules are enforced by the GraphSystem
+            if row.get("module_id"):
+                manager.add_rule(row["module_id"], node_rule)
 
-    async def _load_rules(
-        self,
-        project_id: UUID,
-        session: AsyncSession,
-        manager: RefMemTreeManager,
-    ) -> None:
-        """Load all architecture rules into RefMemTree."""
-        result = await session.execute(select(ArchitectureRule).where(ArchitectureRule.project_id == project_id))
-        rules = result.scalars().all()
-
-        for rule in rules:
-            node_rule = NodeRule(
-                rule_id=rule.id,
-                rule_type=rule.rule_type,
-                condition=str(rule.rule_definition.get("condition", "")),
-                action=str(rule.rule_definition.get("action", "")),
-                priority=rule.rule_definition.get("priority", 0),
-            )
+        return manager
 
-            # Add to specific module or store for global rules
-            if rule.module_id:
-                manager.add_rule(rule.module_id, node_rule)
-            # Global rules would be stored separately
+    def apply(self, manager: RefMemTreeManager, graph_system: GraphSystem, change: GraphChange) -> None:
+        """Apply one GraphOperationsService mutation to a built manager."""
+        if change.kind in (GraphChange.ADD_NODE, GraphChange.UPDATE_NODE):
+            node = graph_system.get_node(change.node_id)
+            if node:
+                self._register(manager, node)
+        elif change.kind == GraphChange.REMOVE_NODE:
+            manager.remove_node(UUID(change.node_id))
+        elif change.kind == GraphChange.ADD_DEPENDENCY and change.target_id is not None:
+            self._link(manager, change.node_id, change.target_id, change.dependency_type or "depends_on")
 
     async def get_loading_stats(
         self,
@@ -152,13 +119,53 @@ class RefMemTreeLoader:
             "estimated_load_time": f"{(modules_count + deps_count + rules_count) * 0.01:.2f}s",
         }
 
+    @staticmethod
+    def _register(manager: RefMemTreeManager, node: Any) -> None:
+        manager.register_node(UUID(str(node.id)), {**(node.data or {}), "type": node.node_type})
+
+    @staticmethod
+    def _link(manager: RefMemTreeManager, from_id: str, to_id: str, dependency_type: str) -> None:
+        manager.add_dependency(
+            DependencyLink(
+                from_node_id=UUID(from_id),
+                to_node_id=UUID(to_id),
+                dependency_type=dependency_type,
+                strength=DEPENDENCY_STRENGTH.get(dependency_type, DEFAULT_DEPENDENCY_STRENGTH),
+            )
+        )
 
-# ============================================================================
-# Global RefMemTree Manager Cache
-# ============================================================================
 
-# In-memory cache of RefMemTree managers per project
-_refmem_cache: Dict[UUID, RefMemTreeManager] = {}
+class RefMemTreeView:
+    """
+    RefMemTreeManager kept in step with one project graph.
+
+    Built lazily, updated incrementally from GraphOperationsService changes
+    and rebuilt after changes it cannot follow (delta refresh, rollback).
+    """
+
+    def __init__(self, graph_system: GraphSystem, hydration: GraphHydrationService, revision: GraphRevision) -> None:
+        self.graph_system = graph_system
+        self.hydration = hydration
+        self.revision = revision
+        self.size_bytes = 0
+        self._loader = RefMemTreeLoader()
+        self._manager: Optional[RefMemTreeManager] = None
+        self._version = -1
+        revision.subscribe(self._on_graph_change)
+
+    def manager(self) -> RefMemTreeManager:
+        if self._manager is None or self._version != self.revision.version:
+            self._manager = self._loader.build(self.graph_system, self.hydration)
+            self._version = self.revision.version
+            self.size_bytes = self._manager.estimate_size_bytes()
+        return self._manager
+
+    def _on_graph_change(self, version: int, changes: Optional[Sequence[GraphChange]]) -> None:
+        if self._manager is None or changes is None or self._version != version - 1:
+            return
+        for change in changes:
+            self._loader.apply(self._manager, self.graph_system, change)
+        self._version = version
 
 
 async def get_refmemtree_manager(
@@ -167,43 +174,33 @@ async def get_refmemtree_manager(
     force_reload: bool = False,
 ) -> RefMemTreeManager:
     """
-    Get or create RefMemTreeManager for a project.
-
-    Caches managers in memory for performance.
+    Get the RefMemTreeManager view of a project from the shared graph store.
 
     Args:
         project_id: Project UUID
         session: Database session
-        force_reload: Force reload from DB
+        force_reload: Apply database changes since the last load first
 
     Returns:
         RefMemTreeManager instance with all data loaded
     """
-    # Check cache
-    if not force_reload and project_id in _refmem_cache:
-        return _refmem_cache[project_id]
-
-    # Load from database
-    loader = RefMemTreeLoader()
-    manager = await loader.load_project(project_id, session)
-
-    # Cache it
-    _refmem_cache[project_id] = manager
+    from backend.core.graph_manager import get_graph_manager
 
-    return manager
+    return await get_graph_manager().get_refmemtree_manager(project_id, session, force_reload)
 
 
 def clear_refmemtree_cache(project_id: Optional[UUID] = None) -> None:
     """
-    Clear RefMemTree cache.
+    Drop cached project graphs (and their manager views).
 
     Args:
         project_id: Specific project to clear, or None for all
     """
-    global _refmem_cache
+    from backend.core.graph_manager import get_graph_manager
 
+    graph_manager = get_graph_manager()
     if project_id:
-        if project_id in _refmem_cache:
-            del _refmem_cache[project_id]
+        graph_manager.invalidate_project(project_id)
     else:
-        _refmem_cache.clear()
+        for cached_id in list(graph_manager._graph_cache):
+            graph_manager.invalidate_project(cached_id)
@@ -0,0 +1,427 @@
+"""
+Compiled architecture rules.
+
+ArchitectureRule.rule_definition is parsed once into a CompiledRule - a
+name suffix/prefix/regex check, a maximum number of dependencies, or a
+layer constraint - instead of re-parsing the condition string on every
+node evaluation. Supported definitions:
+
+    naming:      {"suffix": "Service"} | {"prefix": "I"} | {"pattern": "^[A-Z]"}
+                 {"condition": "name.endswith('Service')"} / "name must end with 'Service'"
+    dependency:  {"max_dependencies": 5} | {"condition": "max_dependencies <= 5"}
+    layer:       {"layers": ["ui", "api", "service", "data"]}  (top first: a module may only
+                 depend on its own layer or layers below it)
+                 {"forbidden": [["ui", "data"], ["*", "legacy"]]}
+                 {"condition": "UI components cannot depend on database layer"}
+
+A module's layer is metadata["layer"], else data["layer"], else its node
+type. Layer names compare case-insensitively. Rules that cannot be checked
+mechanically (tech, security, free text) compile to UNCHECKED and pass.
+
+RuleEngine evaluates every rule over a project graph in one pass over
+columnar node data (names, out-degrees, layers, one edge list), using
+a sorted suffix index for naming rules, and afterwards re-evaluates only
+the nodes touched by each GraphRevision change.
+"""
+
+import re
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+from uuid import UUID
+
+from backend.core.graph_revision import GraphChange, GraphRevision
+
+_ENDSWITH = re.compile(r"""(?:endswith\(\s*|ends? with\s+)['"](.+?)['"]""", re.IGNORECASE)
+_STARTSWITH = re.compile(r"""(?:startswith\(\s*|starts? with\s+)['"](.+?)['"]""", re.IGNORECASE)
+_MAX_DEPENDENCIES = re.compile(r"(?:max_)?dependencies\s*(<=|<)\s*(\d+)|at most (\d+) dependencies", re.IGNORECASE)
+_FORBIDDEN_LAYER = re.compile(
+    r"^\s*(?:(\w+)(?:\s+(?:layer|modules?|components?|services?))?\s+)?"
+    r"(?:cannot|can't|must not|may not|should not)\s+depend\s+on\s+(?:the\s+)?(\w+)",
+    re.IGNORECASE,
+)
+
+ANY_LAYER = "*"
+
+
+def node_layer(node_type: Optional[str], data: Optional[Mapping[str, Any]]) -> str:
+    """Layer of a module: metadata["layer"], data["layer"] or its node type."""
+    data = data or {}
+    metadata = data.get("metadata") or {}
+    layer = metadata.get("layer") or data.get("layer") or node_type or ""
+    return str(layer).lower()
+
+
+class CompiledRule:
+    """One architecture rule in evaluable form."""
+
+    NAMING = "naming"
+    MAX_DEPENDENCIES = "max_dependencies"
+    LAYER = "layer"
+    UNCHECKED = "unchecked"
+
+    __slots__ = (
+        "rule_id",
+        "name",
+        "kind",
+        "severity",
+        "module_id",
+        "message",
+        "suffix",
+        "prefix",
+        "pattern",
+        "max_dependencies",
+        "layer_rank",
+        "forbidden",
+    )
+
+    def __init__(
+        self,
+        rule_id: Optional[UUID],
+        name: str,
+        kind: str,
+        severity: str = "warning",
+        module_id: Optional[UUID] = None,
+        message: str = "",
+    ) -> None:
+        self.rule_id = rule_id
+        self.name = name
+        self.kind = kind
+        self.severity = severity
+        self.module_id = str(module_id) if module_id else None  # None: applies to every node
+        self.message = message
+        self.suffix: Optional[str] = None
+        self.prefix: Optional[str] = None
+        self.pattern: Optional["re.Pattern[str]"] = None
+        self.max_dependencies: Optional[int] = None
+        self.layer_rank: Dict[str, int] = {}
+        self.forbidden: Set[Tuple[str, str]] = set()
+
+    @property
+    def checkable(self) -> bool:
+        return self.kind != self.UNCHECKED
+
+    def applies_to(self, node_id: str) -> bool:
+        return self.module_id is None or self.module_id == node_id
+
+    # ------------------------------------------------------------------
+    # Predicates
+    # ------------------------------------------------------------------
+
+    def check_name(self, name: str) -> bool:
+        if self.suffix is not None and not name.endswith(self.suffix):
+            return False
+        if self.prefix is not None and not name.startswith(self.prefix):
+            return False
+        return self.pattern is None or self.pattern.search(name) is not None
+
+    def allows_edge(self, from_layer: str, to_layer: str) -> bool:
+        if (from_layer, to_layer) in self.forbidden or (ANY_LAYER, to_layer) in self.forbidden:
+            return False
+        from_rank, to_rank = self.layer_rank.get(from_layer), self.layer_rank.get(to_layer)
+        if from_rank is None or to_rank is None:
+            return True  # Layers outside the declared order are unconstrained
+        return from_rank <= to_rank
+
+    def check_values(self, name: Optional[str], out_degree: int, layer: str, target_layers: Iterable[str]) -> bool:
+        """Evaluate against plain values (name None skips naming checks)."""
+        if self.kind == self.NAMING:
+            return name is None or self.check_name(name)
+        if self.kind == self.MAX_DEPENDENCIES:
+            return self.max_dependencies is None or out_degree <= self.max_dependencies
+        if self.kind == self.LAYER:
+            return all(self.allows_edge(layer, target) for target in target_layers)
+        return True
+
+    def check_node(self, node: Any, layer_of: Callable[[str], Optional[str]]) -> bool:
+        """Evaluate against a RefMemTree GraphNode; layer_of maps node ids to layers."""
+        data = node.data or {}
+        if self.kind == self.NAMING:
+            return self.check_name(str(data.get("name", "")))
+        deps = node.get_dependencies(direction="outgoing")
+        if self.kind == self.MAX_DEPENDENCIES:
+            return self.max_dependencies is None or len(deps) <= self.max_dependencies
+        if self.kind == self.LAYER:
+            layer = node_layer(node.node_type, data)
+            for dep in deps:
+                target = layer_of(str(dep.target_node_id))
+                if target is not None and not self.allows_edge(layer, target):
+                    return False
+        return True
+
+    def validator(self, graph_system: Any) -> Callable[[Any], bool]:
+        """GraphSystem validator closure (no parsing at evaluation time)."""
+
+        def layer_of(node_id: str) -> Optional[str]:
+            target = graph_system.get_node(node_id)
+            return node_layer(target.node_type, target.data) if target else None
+
+        def compiled_validator(node: Any) -> bool:
+            return not self.applies_to(str(node.id)) or self.check_node(node, layer_of)
+
+        return compiled_validator
+
+
+def compile_rule(
+    rule_id: Optional[UUID],
+    rule_type: str,
+    rule_definition: Optional[Mapping[str, Any]],
+    level: str = "module",
+    module_id: Optional[UUID] = None,
+    name: Optional[str] = None,
+) -> CompiledRule:
+    """Parse an ArchitectureRule definition into a CompiledRule."""
+    definition = rule_definition or {}
+    condition = str(definition.get("condition", ""))
+    rule = CompiledRule(
+        rule_id,
+        name or f"{rule_type}_{rule_id}",
+        CompiledRule.UNCHECKED,
+        severity="error" if level == "global" else "warning",
+        module_id=module_id,
+        message=str(definition.get("action") or condition or f"{rule_type} rule violated"),
+    )
+
+    if rule_type == "naming":
+        rule.suffix = definition.get("suffix")
+        rule.prefix = definition.get("prefix")
+        if definition.get("pattern"):
+            rule.pattern = re.compile(definition["pattern"])
+        _parse_naming(rule, condition)
+        if rule.suffix is not None or rule.prefix is not None or rule.pattern is not None:
+            rule.kind = CompiledRule.NAMING
+    elif rule_type == "dependency":
+        limit = definition.get("max_dependencies")
+        rule.max_dependencies = int(limit) if limit is not None else _parse_max_dependencies(condition)
+        if rule.max_dependencies is not None:
+            rule.kind = CompiledRule.MAX_DEPENDENCIES
+        elif _parse_layer(rule, condition):
+            rule.kind = CompiledRule.LAYER  # e.g. "cannot depend on UI layer"
+    elif rule_type == "layer":
+        layers = definition.get("layers") or []
+        rule.layer_rank = {str(layer).lower(): rank for rank, layer in enumerate(layers)}
+        for from_layer, to_layer in definition.get("forbidden") or []:
+            rule.forbidden.add((str(from_layer).lower(), str(to_layer).lower()))
+        _parse_layer(rule, condition)
+        if rule.layer_rank or rule.forbidden:
+            rule.kind = CompiledRule.LAYER
+
+    return rule
+
+
+@lru_cache(maxsize=1024)
+def compile_condition(condition: str) -> Optional[CompiledRule]:
+    """
+    Compile a free-standing condition string (RefMemTreeManager NodeRule).
+
+    The rule kind is inferred from the text; returns None if nothing in it
+    can be checked. Results are cached per condition string.
+    """
+    for rule_type in ("naming", "dependency", "layer"):
+        rule = compile_rule(None, rule_type, {"condition": condition}, name=condition)
+        if rule.checkable:
+            return rule
+    return None
+
+
+def _parse_naming(rule: CompiledRule, condition: str) -> None:
+    suffix = _ENDSWITH.search(condition)
+    if suffix and rule.suffix is None:
+        rule.suffix = suffix.group(1)
+    prefix = _STARTSWITH.search(condition)
+    if prefix and rule.prefix is None:
+        rule.prefix = prefix.group(1)
+
+
+def _parse_max_dependencies(condition: str) -> Optional[int]:
+    match = _MAX_DEPENDENCIES.search(condition)
+    if not match:
+        return None
+    if match.group(3) is not None:
+        return int(match.group(3))
+    limit = int(match.group(2))
+    return limit - 1 if match.group(1) == "<" else limit
+
+
+def _parse_layer(rule: CompiledRule, condition: str) -> bool:
+    match = _FORBIDDEN_LAYER.search(condition)
+    if not match:
+        return False
+    from_layer = (match.group(1) or ANY_LAYER).lower()
+    rule.forbidden.add((from_layer, match.group(2).lower()))
+    return True
+
+
+class _SuffixIndex:
+    """Node names sorted by their reversal: all names with a given suffix form one contiguous range."""
+
+    def __init__(self, names: Sequence[str]) -> None:
+        entries = sorted((name[::-1], index) for index, name in enumerate(names))
+        self._keys = [key for key, _ in entries]
+        self._indices = [index for _, index in entries]
+
+    def matching(self, suffix: str) -> Set[int]:
+        key = suffix[::-1]
+        start = bisect_left(self._keys, key)
+        end = start
+        while end < len(self._keys) and self._keys[end].startswith(key):
+            end += 1
+        return set(self._indices[start:end])
+
+
+class RuleEngine:
+    """
+    Violations of a project's compiled rules, kept in step with the graph.
+
+    rules is a live mapping (the hydration's compiled rules); rule changes
+    arrive with a revision bump of unknown changes and trigger a full pass.
+    """
+
+    def __init__(self, graph_system: Any, rules: Mapping[UUID, CompiledRule], revision: GraphRevision) -> None:
+        self.graph_system = graph_system
+        self.rules = rules
+        self.revision = revision
+        self._violations: Dict[UUID, Set[str]] = {}
+        self._layers: Dict[str, str] = {}
+        self._dependents: Dict[str, Set[str]] = {}  # target -> sources (layer rules)
+        self._targets: Dict[str, Set[str]] = {}  # source -> targets (forward index for removals)
+        self._version = -1
+        revision.subscribe(self._on_graph_change)
+
+    def violations(self) -> Dict[UUID, Set[str]]:
+        """rule_id -> ids of nodes violating it."""
+        if self._version != self.revision.version:
+            self._evaluate_all()
+            self._version = self.revision.version
+        return self._violations
+
+    def report(self) -> Dict[str, Any]:
+        """Result in GraphAnalyticsService.validate_rules() format."""
+        violations = self.violations()
+        errors: List[Dict[str, Any]] = []
+        warnings: List[Dict[str, Any]] = []
+        for rule_id, node_ids in violations.items():
+            rule = self.rules.get(rule_id)
+            if rule is None:
+                continue
+            for node_id in sorted(node_ids):
+                if rule.severity == "error":
+                    errors.append(
+                        {
+                            "rule": rule.name,
+                            "node_id": node_id,
+                            "message": rule.message,
+                            "severity": rule.severity,
+                            "can_auto_fix": False,
+                        }
+                    )
+                else:
+                    warnings.append({"rule": rule.name, "node_id": node_id, "message": rule.message})
+        failed = sum(1 for rule_id, node_ids in violations.items() if node_ids and rule_id in self.rules)
+        return {
+            "valid": not errors,
+            "errors": errors,
+            "warnings": warnings,
+            "passed_rules": len(self.rules) - failed,
+            "failed_rules": failed,
+        }
+
+    # ------------------------------------------------------------------
+    # Evaluation
+    # ------------------------------------------------------------------
+
+    def _evaluate_all(self) -> None:
+        """One pass over all nodes and edges, then every rule over the columns."""
+        ids: List[str] = []
+        names: List[str] = []
+        layers: List[str] = []
+        out_degree: List[int] = []
+        edges: List[Tuple[int, str]] = []
+        for index, node in enumerate(self.graph_system.get_all_nodes()):
+            data = node.data or {}
+            ids.append(str(node.id))
+            names.append(str(data.get("name", "")))
+            layers.append(node_layer(node.node_type, data))
+            deps = node.get_dependencies(direction="outgoing")
+            out_degree.append(len(deps))
+            edges.extend((index, str(dep.target_node_id)) for dep in deps)
+
+        position = {node_id: index for index, node_id in enumerate(ids)}
+        self._layers = dict(zip(ids, layers, strict=True))
+        self._dependents = {}
+        self._targets = {}
+        for source, target in edges:
+            self._dependents.setdefault(target, set()).add(ids[source])
+            self._targets.setdefault(ids[source], set()).add(target)
+
+        suffix_index: Optional[_SuffixIndex] = None
+        self._violations = {}
+        for rule_id, rule in self.rules.items():
+            if rule.module_id is None:
+                scope: Iterable[int] = range(len(ids))
+            else:
+                scope = [position[rule.module_id]] if rule.module_id in position else []
+
+            failing: Set[int] = set()
+            if rule.kind == CompiledRule.NAMING:
+                scope = set(scope)
+                candidates = scope
+                if rule.suffix is not None:
+                    suffix_index = suffix_index or _SuffixIndex(names)
+                    candidates = scope & suffix_index.matching(rule.suffix)
+                failing = scope - {i for i in candidates if rule.check_name(names[i])}
+            elif rule.kind == CompiledRule.MAX_DEPENDENCIES and rule.max_dependencies is not None:
+                limit = rule.max_dependencies
+                failing = {i for i in scope if out_degree[i] > limit}
+            elif rule.kind == CompiledRule.LAYER:
+                in_scope = set(scope)
+                for source, target in edges:
+                    target_layer = self._layers.get(target)
+                    if (
+                        source in in_scope
+                        and target_layer is not None
+                        and not rule.allows_edge(layers[source], target_layer)
+                    ):
+                        failing.add(source)
+            self._violations[rule_id] = {ids[i] for i in failing}
+
+    def _evaluate_nodes(self, node_ids: Set[str]) -> None:
+        """Re-evaluate every rule for the given nodes only."""
+        for node_id in node_ids:
+            node = self.graph_system.get_node(node_id)
+            for rule_id, rule in self.rules.items():
+                failing = self._violations.setdefault(rule_id, set())
+                if node is not None and rule.applies_to(node_id) and not rule.check_node(node, self._layers.get):
+                    failing.add(node_id)
+                else:
+                    failing.discard(node_id)
+
+    def _on_graph_change(self, version: int, changes: Optional[Sequence[GraphChange]]) -> None:
+        if changes is None or self._version != version - 1:
+            return
+        touched: Set[str] = set()
+        for change in changes:
+            node_id = change.node_id
+            touched.add(node_id)
+            if change.kind == GraphChange.REMOVE_NODE:
+                self._layers.pop(node_id, None)
+                sources = self._dependents.pop(node_id, set())
+                touched |= sources
+                # Only the index entries that mention the node, via the forward index
+                for source in sources:
+                    self._targets.get(source, set()).discard(node_id)
+                for target in self._targets.pop(node_id, set()):
+                    self._dependents.get(target, set()).discard(node_id)
+                continue
+            if change.kind in (GraphChange.ADD_NODE, GraphChange.UPDATE_NODE):
+                node = self.graph_system.get_node(node_id)
+                if node is not None:
+                    layer = node_layer(node.node_type, node.data)
+                    if self._layers.get(node_id) != layer:
+                        touched |= self._dependents.get(node_id, set())  # Their edges now point at another layer
+                    self._layers[node_id] = layer
+            elif change.kind == GraphChange.ADD_DEPENDENCY and change.target_id is not None:
+                self._dependents.setdefault(change.target_id, set()).add(node_id)
+                self._targets.setdefault(node_id, set()).add(change.target_id)
+        self._evaluate_nodes(touched)
+        self._version = version
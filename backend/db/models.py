@@ -4,7 +4,7 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import JSON, Boolean, DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import JSON, Boolean, DateTime, Float, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -75,12 +75,15 @@ class TreeNode(Base):
     data: Mapped[dict] = mapped_column(JSON, nullable=False)
     position: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     level: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
-    path: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    path: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # Materialized path "/<root>/.../<id>/"
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
     )
 
+    # Prefix index for subtree scans (path LIKE '/.../<id>/%')
+    __table_args__ = (Index("ix_tree_nodes_path", "path", postgresql_ops={"path": "text_pattern_ops"}),)
+
     # Relationships
     project: Mapped["Project"] = relationship("Project", back_populates="tree_nodes")
     parent: Mapped[Optional["TreeNode"]] = relationship("TreeNode", remote_side=[id], back_populates="children")
@@ -334,6 +337,7 @@ class ArchitectureModule(Base):
         String(50), nullable=False, default="package"
     )  # package, class, interface, service, component, etc.
     level: Mapped[int] = mapped_column(Integer, default=0, nullable=False)  # Depth in tree
+    path: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # Materialized path "/<root>/.../<id>/"
 
     # Visual positioning (for canvas)
     position_x: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
@@ -357,6 +361,9 @@ class ArchitectureModule(Base):
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
     )
 
+    # Prefix index for subtree scans (path LIKE '/.../<id>/%')
+    __table_args__ = (Index("ix_architecture_modules_path", "path", postgresql_ops={"path": "text_pattern_ops"}),)
+
     # Relationships
     project: Mapped["Project"] = relationship("Project")
     parent: Mapped[Optional["ArchitectureModule"]] = relationship(
@@ -454,6 +461,34 @@ class ArchitectureRule(Base):
     module: Mapped[Optional["ArchitectureModule"]] = relationship("ArchitectureModule", back_populates="rules")
 
 
+class GraphVersion(Base):
+    """Graph version model - persisted architecture graph snapshots for rollback."""
+
+    __tablename__ = "graph_versions"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    project_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    parent_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True), nullable=True
+    )  # null = checkpoint, else delta against this version
+
+    # Version information
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    is_checkpoint: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    node_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    size_bytes: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)  # {"nodes": {...}, "edges": {...}}
+
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+    # Relationships
+    project: Mapped["Project"] = relationship("Project")
+
+
 # ============================================================================
 # Module 5: Requirements Definition Models
 # ============================================================================
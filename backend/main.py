@@ -1,5 +1,6 @@
 """Main FastAPI application entry point."""
 
+import asyncio
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
@@ -10,6 +11,8 @@ from fastapi.responses import JSONResponse
 from backend import __version__
 from backend.api.v1.router import api_router
 from backend.core.config import settings
+from backend.core.graph_manager import get_graph_manager
+from backend.db.base import AsyncSessionLocal
 
 
 @asynccontextmanager
@@ -19,9 +22,17 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     print("🚀 Codorch Backend starting...")
     print(f"   Environment: {settings.ENVIRONMENT}")
     print(f"   Debug: {settings.DEBUG}")
+    drift_checks = None
+    if settings.GRAPH_DRIFT_CHECK_INTERVAL_SECONDS > 0:
+        drift_checks = asyncio.create_task(get_graph_manager().run_drift_checks(AsyncSessionLocal))
     yield
     # Shutdown
     print("👋 Codorch Backend shutting down...")
+    if drift_checks is not None:
+        drift_checks.cancel()
+    saved = await get_graph_manager().save_snapshots()
+    if saved:
+        print(f"   Saved {saved} graph snapshot(s)")
 
 
 app = FastAPI(
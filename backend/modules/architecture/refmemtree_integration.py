@@ -11,6 +11,7 @@ This module demonstrates FULL use of RefMemTree capabilities:
 from uuid import UUID
 from typing import Any, Optional
 
+from backend.core.graph_algorithms import PathSearchLimits
 from backend.core.refmemtree_advanced import (
     RefMemTreeManager,
     NodeRule,
@@ -114,13 +115,15 @@ class ArchitectureRefMemTreeIntegration:
         """
         dependencies = self.manager.get_dependencies(module_id)
         dependents = self.manager.get_dependents(module_id)
-        chains = self.manager.get_dependency_chain(module_id)
+        chain_search = self.manager.search_dependency_chains(module_id)
+        chains = chain_search.paths
 
         return {
             "module_id": str(module_id),
             "direct_dependencies": len(dependencies),
             "modules_depend_on_this": len(dependents),
             "dependency_chains": len(chains),
+            "dependency_chains_truncated": chain_search.truncated,
             "max_chain_depth": max(len(chain) for chain in chains) if chains else 0,
             "coupling_score": sum(d.strength for d in dependencies) / max(1, len(dependencies)),
             "is_critical": len(dependents) > 5,  # Many modules depend on this
@@ -134,18 +137,24 @@ class ArchitectureRefMemTreeIntegration:
         self,
         module_id: UUID,
         modification_type: str = "update",
+        limits: Optional[PathSearchLimits] = None,
+        path_mode: str = "all",
     ) -> dict[str, Any]:
         """
         Analyze impact BEFORE modifying a module.
 
         Use case: User wants to change a module - show what will be affected.
 
-        Returns detailed impact analysis with recommendations.
+        path_mode is "all" (bounded paths), "shortest" (k shortest paths) or
+        "summary" (reachability counts only, for large graphs); limits bounds
+        the search. Returns detailed impact analysis with recommendations.
         """
         return analyze_architecture_change_impact(
             self.manager,
             module_id,
             modification_type,
+            limits=limits,
+            path_mode=path_mode,
         )
 
     def analyze_module_deletion_impact(self, module_id: UUID) -> dict[str, Any]:
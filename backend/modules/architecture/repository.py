@@ -1,12 +1,14 @@
 """Repository pattern for Architecture Module."""
 
-from typing import Optional, Sequence
-from uuid import UUID
+from typing import Any, Optional, Sequence
+from uuid import UUID, uuid4
 
-from sqlalchemy import func
+from sqlalchemy import Row, any_, delete, func, literal
+from sqlalchemy.dialects.postgresql import array
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from backend.core.materialized_path import build_path, is_within, move_subtree, path_ids, require_path
 from backend.db.models import ArchitectureModule, ArchitectureRule, ModuleDependency
 from backend.modules.architecture.schemas import (
     ArchitectureModuleCreate,
@@ -26,13 +28,54 @@ class ArchitectureModuleRepository:
         self.db = db
 
     async def create(self, data: ArchitectureModuleCreate) -> ArchitectureModule:
-        """Create a new architecture module."""
-        module = ArchitectureModule(**data.model_dump())
-        self.db.add(module)
+        """Create a new architecture module (level and materialized path follow the parent)."""
+        (module,) = await self.create_many([data])
         await self.db.commit()
         await self.db.refresh(module)
         return module
 
+    async def create_many(
+        self,
+        data: Sequence[ArchitectureModuleCreate],
+        ids: Optional[Sequence[UUID]] = None,
+        **fields: Any,
+    ) -> list[ArchitectureModule]:
+        """
+        Insert many modules in one batched INSERT (flushed, not committed).
+
+        Level and materialized path follow the parent, which must be in the
+        same project: an existing module (all fetched in one IN query) or an
+        earlier item of the batch. Ids are assigned up front (or taken from
+        ids) so callers can reference the new modules straight away; fields
+        are set on every module (e.g. ai_generated).
+        """
+        new_ids = list(ids) if ids is not None else [uuid4() for _ in data]
+        if len(new_ids) != len(data) or len(set(new_ids)) != len(new_ids):
+            raise ValueError("One unique id is needed per module")
+        parent_ids = {item.parent_id for item in data if item.parent_id} - set(new_ids)
+        parents: dict[UUID, ArchitectureModule] = {}
+        if parent_ids:
+            result = await self.db.execute(select(ArchitectureModule).filter(ArchitectureModule.id.in_(parent_ids)))
+            parents = {parent.id: parent for parent in result.scalars()}
+
+        modules: list[ArchitectureModule] = []
+        for item, module_id in zip(data, new_ids, strict=True):
+            module = ArchitectureModule(**item.model_dump(), **fields)
+            module.id = module_id
+            parent = parents.get(item.parent_id) if item.parent_id else None
+            if item.parent_id and parent is None:
+                raise ValueError("Parent module not found")
+            if parent is not None:
+                if parent.project_id != module.project_id:
+                    raise ValueError("Parent module belongs to another project")
+                module.level = parent.level + 1
+            module.path = build_path(parent.path if parent is not None else None, module.id)
+            parents[module.id] = module  # Later items may nest under it
+            modules.append(module)
+        self.db.add_all(modules)
+        await self.db.flush()
+        return modules
+
     async def get_by_id(self, module_id: UUID) -> Optional[ArchitectureModule]:
         """Get architecture module by ID."""
         result = await self.db.execute(select(ArchitectureModule).filter(ArchitectureModule.id == module_id))
@@ -77,13 +120,66 @@ class ArchitectureModuleRepository:
         result = await self.db.execute(select(ArchitectureModule).filter(ArchitectureModule.parent_id == parent_id))
         return result.scalars().all()
 
+    async def get_descendants(self, module: ArchitectureModule) -> Sequence[ArchitectureModule]:
+        """All modules below a module, shallowest first (one prefix scan on path)."""
+        result = await self.db.execute(
+            select(ArchitectureModule)
+            .filter(ArchitectureModule.path.startswith(module.path), ArchitectureModule.id != module.id)
+            .order_by(ArchitectureModule.level, ArchitectureModule.name)
+        )
+        return result.scalars().all()
+
+    async def count_descendants(self, module: ArchitectureModule) -> int:
+        """Number of modules below a module (one prefix scan on path)."""
+        result = await self.db.execute(
+            select(func.count())
+            .select_from(ArchitectureModule)
+            .filter(ArchitectureModule.path.startswith(module.path), ArchitectureModule.id != module.id)
+        )
+        return result.scalar_one()
+
+    async def get_ancestors(self, module: ArchitectureModule) -> Sequence[ArchitectureModule]:
+        """Modules above a module, root first (ids come from its path)."""
+        ancestor_ids = path_ids(module.path)[:-1]
+        if not ancestor_ids:
+            return []
+        result = await self.db.execute(
+            select(ArchitectureModule)
+            .filter(ArchitectureModule.id.in_(ancestor_ids))
+            .order_by(ArchitectureModule.level)
+        )
+        return result.scalars().all()
+
+    async def move(self, module: ArchitectureModule, parent_id: Optional[UUID]) -> None:
+        """
+        Re-parent a module; its whole subtree's paths and levels follow in one
+        UPDATE. Not committed.
+        """
+        parent = await self.get_by_id(parent_id) if parent_id else None
+        if parent_id and parent is None:
+            raise ValueError("Parent module not found")
+        if parent is not None and parent.project_id != module.project_id:
+            raise ValueError("Parent module belongs to another project")
+        old_path = require_path(module.path, "Module")
+        parent_path = require_path(parent.path, "Parent module") if parent is not None else None
+        if parent_path is not None and is_within(parent_path, old_path):
+            raise ValueError("Module cannot be moved under itself or its descendants")
+
+        new_path = build_path(parent_path, module.id)
+        if new_path != old_path:
+            await move_subtree(self.db, ArchitectureModule, old_path, new_path)
+        module.parent_id = parent_id
+
     async def update(self, module_id: UUID, data: ArchitectureModuleUpdate) -> Optional[ArchitectureModule]:
-        """Update architecture module."""
+        """Update architecture module (setting parent_id moves its subtree)."""
         module = await self.get_by_id(module_id)
         if not module:
             return None
 
         update_data = data.model_dump(exclude_unset=True)
+        if "parent_id" in update_data:
+            await self.move(module, update_data.pop("parent_id"))
+            update_data.pop("level", None)  # Derived from the new parent
         for key, value in update_data.items():
             setattr(module, key, value)
 
@@ -93,13 +189,27 @@ class ArchitectureModuleRepository:
 
     async def delete(self, module_id: UUID) -> bool:
         """Delete architecture module."""
+        return bool(await self.delete_subtree(module_id))
+
+    async def delete_subtree(self, module_id: UUID) -> list[UUID]:
+        """
+        Delete a module and everything below it in one statement (prefix scan
+        on path; dependencies and rules go with them by ON DELETE CASCADE).
+        Returns the deleted module ids, [] if the module does not exist.
+        """
         module = await self.get_by_id(module_id)
         if not module:
-            return False
+            return []
 
-        await self.db.delete(module)
+        result = await self.db.execute(
+            delete(ArchitectureModule)
+            .where(ArchitectureModule.path.startswith(module.path))
+            .returning(ArchitectureModule.id)
+            .execution_options(synchronize_session="fetch")
+        )
+        deleted_ids = list(result.scalars().all())
         await self.db.commit()
-        return True
+        return deleted_ids
 
     async def approve(self, module_id: UUID, approved_by: UUID) -> Optional[ArchitectureModule]:
         """Approve architecture module."""
@@ -124,6 +234,39 @@ class ArchitectureModuleRepository:
         )
         return result.scalar_one()
 
+    async def get_degree_stats(self, project_id: UUID) -> Sequence[Row[tuple[UUID, str, int, int, int]]]:
+        """
+        Id, name, level, out_degree and in_degree of every module in a project.
+
+        One query: dependency counts are grouped per endpoint and joined onto
+        the modules, instead of two dependency queries per module.
+        """
+        out_degree = (
+            select(ModuleDependency.from_module_id.label("module_id"), func.count().label("degree"))
+            .filter(ModuleDependency.project_id == project_id)
+            .group_by(ModuleDependency.from_module_id)
+            .subquery()
+        )
+        in_degree = (
+            select(ModuleDependency.to_module_id.label("module_id"), func.count().label("degree"))
+            .filter(ModuleDependency.project_id == project_id)
+            .group_by(ModuleDependency.to_module_id)
+            .subquery()
+        )
+        result = await self.db.execute(
+            select(
+                ArchitectureModule.id,
+                ArchitectureModule.name,
+                ArchitectureModule.level,
+                func.coalesce(out_degree.c.degree, 0).label("out_degree"),
+                func.coalesce(in_degree.c.degree, 0).label("in_degree"),
+            )
+            .outerjoin(out_degree, out_degree.c.module_id == ArchitectureModule.id)
+            .outerjoin(in_degree, in_degree.c.module_id == ArchitectureModule.id)
+            .filter(ArchitectureModule.project_id == project_id)
+        )
+        return result.all()
+
     async def get_by_level(self, project_id: UUID, level: int) -> Sequence[ArchitectureModule]:
         """Get modules by level in hierarchy."""
         result = await self.db.execute(
@@ -150,6 +293,13 @@ class ModuleDependencyRepository:
         await self.db.refresh(dependency)
         return dependency
 
+    async def create_many(self, data: Sequence[ModuleDependencyCreate]) -> list[ModuleDependency]:
+        """Insert many dependencies in one batched INSERT (flushed, not committed)."""
+        dependencies = [ModuleDependency(**item.model_dump()) for item in data]
+        self.db.add_all(dependencies)
+        await self.db.flush()
+        return dependencies
+
     async def get_by_id(self, dependency_id: UUID) -> Optional[ModuleDependency]:
         """Get module dependency by ID."""
         result = await self.db.execute(select(ModuleDependency).filter(ModuleDependency.id == dependency_id))
@@ -169,6 +319,127 @@ class ModuleDependencyRepository:
         result = await self.db.execute(query)
         return result.scalars().all()
 
+    async def count_by_project(self, project_id: UUID) -> int:
+        """Count dependencies in a project."""
+        result = await self.db.execute(
+            select(func.count()).select_from(ModuleDependency).filter(ModuleDependency.project_id == project_id)
+        )
+        return result.scalar_one()
+
+    async def get_edges(self, project_id: UUID) -> Sequence[tuple[UUID, UUID]]:
+        """(from_module_id, to_module_id) of every dependency in a project."""
+        result = await self.db.execute(
+            select(ModuleDependency.from_module_id, ModuleDependency.to_module_id).filter(
+                ModuleDependency.project_id == project_id
+            )
+        )
+        return result.tuples().all()
+
+    async def get_dependents(self, module_id: UUID) -> Sequence[Row[Any]]:
+        """Id, name, module_type and dependency_type of each module depending on module_id (one row per edge)."""
+        result = await self.db.execute(
+            select(
+                ArchitectureModule.id,
+                ArchitectureModule.name,
+                ArchitectureModule.module_type,
+                ModuleDependency.dependency_type,
+            )
+            .join(ArchitectureModule, ArchitectureModule.id == ModuleDependency.from_module_id)
+            .filter(ModuleDependency.to_module_id == module_id)
+        )
+        return result.all()
+
+    async def get_transitive_dependents(
+        self, module_id: UUID, max_depth: int
+    ) -> Sequence[Row[tuple[UUID, str, str, int, list[str]]]]:
+        """
+        Every module that depends on module_id within max_depth hops.
+
+        Rows carry id, name, module_type, distance (shortest) and edge_types
+        (dependency types along one shortest path, from the dependent towards
+        module_id). One round trip: a bounded recursive CTE joined to the
+        modules. Each walk carries the modules it has visited and never
+        re-enters one, so cycles end at once rather than at the depth bound,
+        and the outer DISTINCT ON keeps the shortest distance per module.
+        """
+        impact = (
+            select(
+                ModuleDependency.from_module_id.label("module_id"),
+                literal(1).label("distance"),
+                array([ModuleDependency.dependency_type]).label("edge_types"),
+                array([ModuleDependency.to_module_id, ModuleDependency.from_module_id]).label("visited"),
+            )
+            .filter(ModuleDependency.to_module_id == module_id)
+            .cte("impact", recursive=True)
+        )
+        impact = impact.union_all(
+            select(
+                ModuleDependency.from_module_id,
+                impact.c.distance + 1,
+                func.array_prepend(ModuleDependency.dependency_type, impact.c.edge_types),
+                func.array_append(impact.c.visited, ModuleDependency.from_module_id),
+            )
+            .join(impact, ModuleDependency.to_module_id == impact.c.module_id)
+            .filter(impact.c.distance < max_depth, ~(ModuleDependency.from_module_id == any_(impact.c.visited)))
+        )
+        result = await self.db.execute(
+            select(
+                ArchitectureModule.id,
+                ArchitectureModule.name,
+                ArchitectureModule.module_type,
+                impact.c.distance,
+                impact.c.edge_types,
+            )
+            .join(impact, impact.c.module_id == ArchitectureModule.id)
+            .filter(ArchitectureModule.id != module_id)
+            .distinct(ArchitectureModule.id)
+            .order_by(ArchitectureModule.id, impact.c.distance)
+        )
+        return result.all()
+
+    def _shared_targets(self, project_id: UUID) -> Any:
+        """Dependencies of a project grouped by target, keeping targets used more than once."""
+        return (
+            select(ModuleDependency.to_module_id.label("module_id"))
+            .filter(ModuleDependency.project_id == project_id)
+            .group_by(ModuleDependency.to_module_id)
+            .having(func.count() > 1)
+        )
+
+    async def get_shared_targets(
+        self, project_id: UUID, skip: int = 0, limit: Optional[int] = None
+    ) -> Sequence[Row[Any]]:
+        """
+        Id, name, usage_count and used_by of modules depended on more than once.
+
+        One GROUP BY ... HAVING query with array_agg, ordered by usage_count
+        descending (name breaks ties so pages are stable).
+        """
+        usage = (
+            self._shared_targets(project_id)
+            .add_columns(
+                func.count().label("usage_count"),
+                func.array_agg(ModuleDependency.from_module_id).label("used_by"),
+            )
+            .subquery()
+        )
+        query = (
+            select(ArchitectureModule.id, ArchitectureModule.name, usage.c.usage_count, usage.c.used_by)
+            .join(usage, usage.c.module_id == ArchitectureModule.id)
+            .order_by(usage.c.usage_count.desc(), ArchitectureModule.name, ArchitectureModule.id)
+            .offset(skip)
+        )
+        if limit is not None:
+            query = query.limit(limit)
+
+        result = await self.db.execute(query)
+        return result.all()
+
+    async def count_shared_targets(self, project_id: UUID) -> int:
+        """Count modules depended on more than once."""
+        result = await self.db.execute(select(func.count()).select_from(self._shared_targets(project_id).subquery()))
+        return result.scalar_one()
+
     async def get_dependencies_from(self, module_id: UUID) -> Sequence[ModuleDependency]:
         """Get dependencies FROM a module (what this module depends on)."""
         result = await self.db.execute(select(ModuleDependency).filter(ModuleDependency.from_module_id == module_id))
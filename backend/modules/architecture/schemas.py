@@ -38,6 +38,7 @@ class ArchitectureModuleUpdate(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=255)
     description: Optional[str] = None
     module_type: Optional[str] = Field(None, max_length=50)
+    parent_id: Optional[UUID] = Field(None, description="Move the module (and its subtree) under this parent")
     level: Optional[int] = Field(None, ge=0)
     position_x: Optional[float] = None
     position_y: Optional[float] = None
@@ -51,6 +52,7 @@ class ArchitectureModuleResponse(ArchitectureModuleBase):
     id: UUID
     project_id: UUID
     parent_id: Optional[UUID] = None
+    path: Optional[str] = None
     tree_node_id: Optional[UUID] = None
     ai_generated: bool
     generation_reasoning: Optional[dict[str, Any]] = None
@@ -251,6 +253,8 @@ class ImpactAnalysisRequest(BaseModel):
 
     module_id: UUID
     change_type: str = Field(..., pattern="^(modify|delete|add)$")
+    transitive: bool = Field(default=False, description="Include modules that depend on it indirectly")
+    max_depth: int = Field(default=5, ge=1, le=20, description="Maximum dependency distance when transitive")
 
 
 class AffectedModule(BaseModel):
@@ -260,6 +264,10 @@ class AffectedModule(BaseModel):
     module_name: str
     impact_level: str = Field(..., pattern="^(direct|indirect|cascading)$")
     affected_features: list[str] = Field(default_factory=list)
+    distance: int = Field(default=1, description="Dependency hops from the changed module")
+    path_edge_types: list[str] = Field(
+        default_factory=list, description="Dependency types from this module to the changed one"
+    )
 
 
 class ImpactAnalysisResponse(BaseModel):
@@ -273,6 +281,22 @@ class ImpactAnalysisResponse(BaseModel):
     recommendations: list[str] = Field(default_factory=list)
 
 
+class ProposedChange(BaseModel):
+    """Schema for one what-if change to a module (GraphOverlay.apply_change format)."""
+
+    module_id: UUID
+    change: dict[str, Any] = Field(
+        default_factory=dict,
+        description="delete, node_type, data, add_dependencies, remove_dependencies or data fields",
+    )
+
+
+class BatchSimulationRequest(BaseModel):
+    """Schema for simulating many changes against one graph snapshot."""
+
+    changes: list[ProposedChange] = Field(..., min_length=1, max_length=200)
+
+
 # ============================================================================
 # Shared Modules Schemas
 # ============================================================================
@@ -1,19 +1,23 @@
 """Service layer for Architecture Module."""
 
-from typing import Optional, List, Sequence
+from typing import Any, Dict, Optional, List, Sequence, Tuple
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.db.models import ArchitectureModule, User
+from backend.db.models import ArchitectureModule, ModuleDependency, User
 from backend.modules.architecture.repository import (
     ArchitectureModuleRepository,
     ArchitectureRuleRepository,
     ModuleDependencyRepository,
 )
 from backend.modules.architecture.refmemtree_integration import ArchitectureRefMemTreeIntegration
-from backend.core.refmemtree_loader import get_refmemtree_manager
+from backend.core.dynamic_topology import DynamicTopologicalOrder
+from backend.core.graph_algorithms import DEFAULT_MAX_PATHS, PathSearchLimits, find_cycles, shortest_path
+from backend.core.graph_hydration_service import dependency_edge_metadata, module_node_data
 from backend.core.graph_manager import get_graph_manager
+from backend.core.graph_operations_service import GraphOperation
+from backend.core.graph_overlay import GraphOverlay
 from backend.modules.architecture.schemas import (
     ArchitectureModuleCreate,
     ArchitectureModuleUpdate,
@@ -50,24 +54,25 @@ class ArchitectureService:
     async def set_project_context(self, project_id: UUID, session: AsyncSession):
         """Set project context and load RefMemTree data."""
         self._project_id = project_id
-        # Load RefMemTree manager (cached)
-        manager = await get_refmemtree_manager(project_id, session)
+        # RefMemTree manager view of the shared project graph (cached)
+        manager = await get_graph_manager().get_refmemtree_manager(project_id, session)
         self.refmem.manager = manager
 
     # ========================================================================
     # Module Operations
     # ========================================================================
 
-    async def create_module(self, data: ArchitectureModuleCreate) -> ArchitectureModule:
-        """Create a new architecture module."""
-        # Calculate level if parent exists
-        if data.parent_id:
-            parent = await self.module_repo.get_by_id(data.parent_id)
-            if parent:
-                # Set level to parent level + 1
-                data.level = parent.level + 1
+    async def create_module(self, data: ArchitectureModuleCreate, sync_graph: bool = True) -> ArchitectureModule:
+        """
+        Create a new architecture module.
 
+        With sync_graph=False the caller adds the node to the graph itself
+        (e.g. batched via GraphManagerService.apply_batch).
+        """
+        # Level and materialized path are derived from the parent
         module = await self.module_repo.create(data)
+        if not sync_graph:
+            return module
 
         # ⭐ REAL RefMemTree Integration: Add to GraphSystem
         try:
@@ -78,12 +83,7 @@ class ArchitectureService:
                 session=self.db,
                 node_id=module.id,
                 node_type=module.module_type,
-                data={
-                    "name": module.name,
-                    "description": module.description,
-                    "level": module.level,
-                    "status": module.status,
-                },
+                data=module_node_data(module),
             )
             print(f"✅ Module {module.name} added to RefMemTree GraphSystem")
         except Exception as e:
@@ -92,6 +92,99 @@ class ArchitectureService:
 
         return module
 
+    async def create_architecture_bulk(
+        self,
+        project_id: UUID,
+        modules: Sequence[ArchitectureModuleCreate],
+        dependencies: Sequence[Dict[str, Any]],
+        generation_reasoning: Optional[Any] = None,
+    ) -> Tuple[List[ArchitectureModule], List[ModuleDependency]]:
+        """
+        Materialize a generated architecture in one transaction.
+
+        dependencies name their modules as in an AI proposal: from_module,
+        to_module, dependency_type and an optional reason.
+
+        Modules are inserted in one batched INSERT, added to the graph in one
+        batch, then each proposed dependency is checked in memory (Rule Engine
+        and one incremental cycle check over the batch) and the accepted ones
+        are inserted in a second batched INSERT. One commit, one graph batch
+        for the edges. Dependencies on unknown names, duplicates,
+        self-dependencies and edges that would close a cycle or break a rule
+        are skipped.
+        """
+        graph_manager = get_graph_manager()
+        created_modules = await self.module_repo.create_many(
+            modules, ai_generated=True, generation_reasoning=generation_reasoning
+        )
+        try:
+            await graph_manager.apply_batch(
+                project_id,
+                self.db,
+                [GraphOperation.add_node(m.id, m.module_type, module_node_data(m)) for m in created_modules],
+            )
+            overlay: Optional[GraphOverlay] = await graph_manager.create_overlay(project_id, self.db)
+        except Exception as e:
+            print(f"⚠️ RefMemTree batch sync failed, skipping Rule Engine checks: {e}")
+            overlay = None
+
+        # All modules are new, so a cycle can only be closed by the batch's own edges
+        module_name_to_id = {module.name: module.id for module in created_modules}
+        accepted: List[ModuleDependencyCreate] = []
+        seen: set[tuple] = set()
+        proposed_edges: DynamicTopologicalOrder[UUID] = DynamicTopologicalOrder()
+        for dep_data in dependencies:
+            from_id = module_name_to_id.get(dep_data["from_module"])
+            to_id = module_name_to_id.get(dep_data["to_module"])
+            key = (from_id, to_id, dep_data["dependency_type"])
+            if not (from_id and to_id) or key in seen:
+                continue
+            data = ModuleDependencyCreate(
+                project_id=project_id,
+                from_module_id=from_id,
+                to_module_id=to_id,
+                dependency_type=dep_data["dependency_type"],
+                description=dep_data.get("reason"),
+            )
+            if proposed_edges.would_create_cycle(data.from_module_id, data.to_module_id):
+                continue  # Also covers self-dependencies
+            if overlay is not None:
+                try:
+                    self._check_dependency_rules(overlay, data)
+                    # Later edges are checked against the ones already accepted
+                    overlay.add_dependency(str(from_id), str(to_id), data.dependency_type)
+                except ValueError:
+                    continue
+                except Exception as e:
+                    print(f"⚠️ Rule Engine check failed, using fallback: {e}")
+            seen.add(key)
+            proposed_edges.add_edge(data.from_module_id, data.to_module_id)
+            accepted.append(data)
+
+        try:
+            created_dependencies = await self.dependency_repo.create_many(accepted)
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            graph_manager.invalidate_project(project_id)  # Drop the uncommitted nodes
+            raise
+
+        try:
+            await graph_manager.apply_batch(
+                project_id,
+                self.db,
+                [
+                    GraphOperation.add_dependency(
+                        d.from_module_id, d.to_module_id, d.dependency_type, dependency_edge_metadata(d)
+                    )
+                    for d in created_dependencies
+                ],
+            )
+        except Exception as e:
+            print(f"⚠️ RefMemTree batch sync failed (non-critical): {e}")
+
+        return created_modules, created_dependencies
+
     async def get_module(self, module_id: UUID) -> Optional[ArchitectureModule]:
         """Get module by ID."""
         return await self.module_repo.get_by_id(module_id)
@@ -127,6 +220,18 @@ class ArchitectureService:
         # Update in DB
         updated = await self.module_repo.update(module_id, data)
 
+        # A move changes the level of the whole subtree; refresh those graph nodes
+        if updated and "parent_id" in data.model_fields_set:
+            try:
+                subtree = [updated, *await self.module_repo.get_descendants(updated)]
+                await get_graph_manager().reload_rows(
+                    updated.project_id, self.db, module_ids=[module.id for module in subtree]
+                )
+            except Exception as e:
+                print(f"⚠️ RefMemTree subtree reload warning: {e}")
+        if updated:
+            await self._refresh_graph(updated.project_id)
+
         # ⭐ Record change in RefMemTree
         if old_module and updated:
             try:
@@ -172,22 +277,41 @@ class ArchitectureService:
             # If RefMemTree not available, proceed with warning
             print(f"RefMemTree impact check warning: {e}")
 
-        return await self.module_repo.delete(module_id)
+        module = await self.module_repo.get_by_id(module_id)
+        if not module:
+            return False
+        project_id = module.project_id
+        deleted_ids = await self.module_repo.delete_subtree(module_id)
+
+        # The database cascade removed the whole subtree; drop it from the graph in one batch
+        try:
+            await get_graph_manager().apply_batch(
+                project_id, self.db, [GraphOperation.remove_node(deleted_id) for deleted_id in deleted_ids]
+            )
+        except Exception as e:
+            print(f"⚠️ RefMemTree subtree removal warning: {e}")
+
+        return bool(deleted_ids)
 
     async def approve_module(self, module_id: UUID, user: User) -> Optional[ArchitectureModule]:
         """Approve module."""
-        return await self.module_repo.approve(module_id, user.id)
+        module = await self.module_repo.approve(module_id, user.id)
+        if module:
+            await self._refresh_graph(module.project_id)
+        return module
 
     # ========================================================================
     # Dependency Operations
     # ========================================================================
 
-    async def create_dependency(self, data: ModuleDependencyCreate):
+    async def create_dependency(self, data: ModuleDependencyCreate, sync_graph: bool = True):
         """
         Create module dependency with RefMemTree Rule Engine validation.
 
         CRITICAL: Uses RefMemTree to validate BEFORE writing to DB!
         This is the "immune system" - prevents invalid architecture!
+
+        With sync_graph=False the caller adds the edge to the graph itself.
         """
         # Check if dependency already exists
         if await self.dependency_repo.exists(data.from_module_id, data.to_module_id, data.dependency_type):
@@ -200,74 +324,35 @@ class ArchitectureService:
         # ⭐ CRITICAL: Validate against RefMemTree rules BEFORE DB write!
         try:
             graph_manager = get_graph_manager()
-            _, _, analytics, _ = await graph_manager.get_or_create_services(data.project_id, self.db)
-            graph = analytics.graph_system  # Or from any other service
-
-            if graph:
-                # Get nodes from RefMemTree
-                from_node = graph.get_node(str(data.from_module_id))
-                to_node = graph.get_node(str(data.to_module_id))
-
-                if from_node and to_node:
-                    # ⭐ SIMULATE adding dependency
-                    from_node_after = from_node.model_copy(deep=True)
-                    from_node_after.add_reference(str(data.to_module_id), data.dependency_type)
-
-                    # ⭐ USE REFMEMTREE RULE ENGINE!
-                    impact_signals = graph.impact_analyzer.analyze_change_impact(
-                        from_node, from_node_after  # Before  # After
-                    )
-
-                    # Check for BLOCKING errors from Rule Engine
-                    blocking_errors = [
-                        s for s in impact_signals if s.severity in ["ERROR", "CRITICAL"] and s.requires_action
-                    ]
-
-                    if blocking_errors:
-                        # ⭐ RULE ENGINE BLOCKS INVALID OPERATION!
-                        error_msg = blocking_errors[0].change_description
-                        raise ValueError(
-                            f"❌ Rule Engine blocked: {error_msg}\n"
-                            f"Rule: {blocking_errors[0].rule_name}\n"
-                            f"Fix: {blocking_errors[0].suggested_fix or 'Review architecture rules'}"
-                        )
+            overlay = await graph_manager.create_overlay(data.project_id, self.db)
+            self._check_dependency_rules(overlay, data)
         except ValueError:
             raise
         except Exception as e:
             print(f"⚠️ Rule Engine check failed, using fallback: {e}")
 
-        # ⭐ Check for circular dependency using REAL RefMemTree
+        # ⭐ Check for circular dependency: incremental check against the maintained topological order
         try:
             graph_manager = get_graph_manager()
-
-            # Temporarily add to check for cycles
-            temp_added = await graph_manager.add_dependency_to_graph(
+            cycle = await graph_manager.would_create_cycle(
                 project_id=data.project_id,
                 session=self.db,
                 from_node_id=data.from_module_id,
                 to_node_id=data.to_module_id,
-                dependency_type="temp_check",
             )
-
-            if temp_added:
-                # ⭐ REAL RefMemTree API: detect_cycles()
-                cycles = await graph_manager.detect_circular_dependencies(
-                    project_id=data.project_id,
-                    session=self.db,
-                )
-
-                if cycles:
-                    # Remove temp and raise error
-                    raise ValueError(f"Would create circular dependency: {cycles[0]}")
+            if cycle:
+                raise ValueError(f"Would create circular dependency: {cycle}")
         except ValueError:
             raise
         except Exception as e:
-            # Fallback to custom check if RefMemTree fails
+            # Fallback to custom check if the graph is unavailable
             print(f"RefMemTree cycle detection unavailable, using fallback: {e}")
-            if await self._would_create_circular_dependency(data.from_module_id, data.to_module_id):
+            if await self._would_create_circular_dependency(data.project_id, data.from_module_id, data.to_module_id):
                 raise ValueError("Would create circular dependency")
 
         dependency = await self.dependency_repo.create(data)
+        if not sync_graph:
+            return dependency
 
         # ⭐ REAL RefMemTree Integration: Add dependency to GraphSystem
         try:
@@ -279,6 +364,7 @@ class ArchitectureService:
                 from_node_id=data.from_module_id,
                 to_node_id=data.to_module_id,
                 dependency_type=data.dependency_type,
+                metadata=dependency_edge_metadata(dependency),
             )
             print(f"✅ Dependency added to RefMemTree GraphSystem")
         except Exception as e:
@@ -304,11 +390,27 @@ class ArchitectureService:
 
     async def update_dependency(self, dependency_id: UUID, data: ModuleDependencyUpdate):
         """Update dependency."""
-        return await self.dependency_repo.update(dependency_id, data)
+        dependency = await self.dependency_repo.update(dependency_id, data)
+        if dependency is None:
+            return None
+
+        # In-place edits are invisible to delta refresh (no updated_at): re-read the source module's edges
+        try:
+            await get_graph_manager().reload_rows(
+                dependency.project_id, self.db, module_ids=[dependency.from_module_id]
+            )
+        except Exception as e:
+            print(f"RefMemTree dependency sync warning: {e}")
+        return dependency
 
     async def delete_dependency(self, dependency_id: UUID) -> bool:
         """Delete dependency."""
-        return await self.dependency_repo.delete(dependency_id)
+        dependency = await self.dependency_repo.get_by_id(dependency_id)
+        if not dependency:
+            return False
+        deleted = await self.dependency_repo.delete(dependency_id)
+        await self._refresh_graph(dependency.project_id)
+        return deleted
 
     # ========================================================================
     # Rule Operations
@@ -316,7 +418,9 @@ class ArchitectureService:
 
     async def create_rule(self, data: ArchitectureRuleCreate):
         """Create architecture rule."""
-        return await self.rule_repo.create(data)
+        rule = await self.rule_repo.create(data)
+        await self._refresh_graph(rule.project_id)
+        return rule
 
     async def get_rule(self, rule_id: UUID):
         """Get rule by ID."""
@@ -339,15 +443,26 @@ class ArchitectureService:
 
     async def update_rule(self, rule_id: UUID, data: ArchitectureRuleUpdate):
         """Update rule."""
-        return await self.rule_repo.update(rule_id, data)
+        rule = await self.rule_repo.update(rule_id, data)
+        if rule:
+            await self._refresh_graph(rule.project_id)
+        return rule
 
     async def delete_rule(self, rule_id: UUID) -> bool:
         """Delete rule."""
-        return await self.rule_repo.delete(rule_id)
+        rule = await self.rule_repo.get_by_id(rule_id)
+        if not rule:
+            return False
+        deleted = await self.rule_repo.delete(rule_id)
+        await self._refresh_graph(rule.project_id)
+        return deleted
 
     async def deactivate_rule(self, rule_id: UUID):
         """Deactivate rule."""
-        return await self.rule_repo.deactivate(rule_id)
+        rule = await self.rule_repo.deactivate(rule_id)
+        if rule:
+            await self._refresh_graph(rule.project_id)
+        return rule
 
     # ========================================================================
     # Validation
@@ -386,19 +501,19 @@ class ArchitectureService:
     # ========================================================================
 
     async def analyze_complexity(self, project_id: UUID) -> ComplexityAnalysisResponse:
-        """Analyze architecture complexity."""
-        modules = await self.module_repo.get_by_project(project_id)
-        dependencies = await self.dependency_repo.get_by_project(project_id)
+        """Analyze architecture complexity (two aggregate queries, independent of module count)."""
+        modules = await self.module_repo.get_degree_stats(project_id)
+        dependency_count = await self.dependency_repo.count_by_project(project_id)
 
         module_count = len(modules)
-        avg_dependencies = len(dependencies) / module_count if module_count > 0 else 0
+        avg_dependencies = dependency_count / module_count if module_count > 0 else 0
         max_depth = max((m.level for m in modules), default=0)
 
         # Calculate coupling score (inversely related to avg dependencies)
         coupling_score = min(10.0, max(0.0, 10.0 - (avg_dependencies * 0.5)))
 
         # Simple cyclomatic complexity estimate
-        cyclomatic_complexity = len(dependencies) + module_count
+        cyclomatic_complexity = dependency_count + module_count
 
         metrics = ComplexityMetrics(
             module_count=module_count,
@@ -412,9 +527,7 @@ class ArchitectureService:
         # Find hotspots (modules with many dependencies)
         hotspots: list[ComplexityHotspot] = []
         for module in modules:
-            deps_from = await self.dependency_repo.get_dependencies_from(module.id)
-            deps_to = await self.dependency_repo.get_dependencies_to(module.id)
-            total_deps = len(deps_from) + len(deps_to)
+            total_deps = module.out_degree + module.in_degree
 
             if total_deps > avg_dependencies * 2:  # Significantly above average
                 hotspots.append(
@@ -430,6 +543,8 @@ class ArchitectureService:
                     )
                 )
 
+        hotspots.sort(key=lambda hotspot: hotspot.complexity_score, reverse=True)
+
         # Overall complexity (0-10 scale)
         overall_complexity = (
             (module_count / 50.0 * 3)  # More modules = more complex
@@ -464,38 +579,58 @@ class ArchitectureService:
         breaking_changes = False
 
         if request.change_type in ["modify", "delete"]:
-            # Find modules that depend on this module
-            dependencies_to = await self.dependency_repo.get_dependencies_to(request.module_id)
-
-            for dep in dependencies_to:
-                from_module = await self.module_repo.get_by_id(dep.from_module_id)
-                if from_module:
-                    impact_level = "direct" if dep.dependency_type in ["import", "extends"] else "indirect"
-
-                    if dep.dependency_type == "extends":
+            # Find modules that depend on this module (names fetched in the same query)
+            if request.transitive:
+                dependents = await self.dependency_repo.get_transitive_dependents(
+                    request.module_id, request.max_depth
+                )
+                for dependent in sorted(dependents, key=lambda row: (row.distance, row.name)):
+                    dependency_type = dependent.edge_types[-1] if dependent.distance == 1 else None
+                    affected_modules.append(
+                        AffectedModule(
+                            module_id=dependent.id,
+                            module_name=dependent.name,
+                            impact_level=self._impact_level(dependency_type),
+                            affected_features=[
+                                f"{' -> '.join(dependent.edge_types)} dependency",
+                                dependent.module_type,
+                            ],
+                            distance=dependent.distance,
+                            path_edge_types=list(dependent.edge_types),
+                        )
+                    )
+                # One path is kept per module, so look for direct "extends" edges separately
+                breaking_changes = any(
+                    dep.dependency_type == "extends"
+                    for dep in await self.dependency_repo.get_dependencies_to(request.module_id)
+                )
+            else:
+                for direct in await self.dependency_repo.get_dependents(request.module_id):
+                    if direct.dependency_type == "extends":
                         breaking_changes = True
 
                     affected_modules.append(
                         AffectedModule(
-                            module_id=from_module.id,
-                            module_name=from_module.name,
-                            impact_level=impact_level,
+                            module_id=direct.id,
+                            module_name=direct.name,
+                            impact_level=self._impact_level(direct.dependency_type),
                             affected_features=[
-                                f"{dep.dependency_type} dependency",
-                                from_module.module_type,
+                                f"{direct.dependency_type} dependency",
+                                direct.module_type,
                             ],
+                            path_edge_types=[direct.dependency_type],
                         )
                     )
 
-            # Find child modules (cascade effect)
-            children = await self.module_repo.get_children(request.module_id)
-            for child in children:
+            # Find modules below this one at any depth (cascade effect, one prefix scan)
+            for descendant in await self.module_repo.get_descendants(module):
                 affected_modules.append(
                     AffectedModule(
-                        module_id=child.id,
-                        module_name=child.name,
+                        module_id=descendant.id,
+                        module_name=descendant.name,
                         impact_level="cascading",
-                        affected_features=["Child module"],
+                        affected_features=["Child module" if descendant.parent_id == module.id else "Nested module"],
+                        distance=descendant.level - module.level,
                     )
                 )
 
@@ -526,31 +661,30 @@ class ArchitectureService:
     # Shared Modules
     # ========================================================================
 
-    async def get_shared_modules(self, project_id: UUID) -> SharedModulesResponse:
-        """Get shared modules (used by multiple modules)."""
-        modules = await self.module_repo.get_by_project(project_id)
-        shared_modules: list[SharedModuleInfo] = []
-
-        for module in modules:
-            dependencies_to = await self.dependency_repo.get_dependencies_to(module.id)
-
-            if len(dependencies_to) > 1:  # Used by more than one module
-                used_by = [dep.from_module_id for dep in dependencies_to]
-                shared_modules.append(
-                    SharedModuleInfo(
-                        module_id=module.id,
-                        module_name=module.name,
-                        usage_count=len(dependencies_to),
-                        used_by=used_by,
-                    )
-                )
+    async def get_shared_modules(
+        self, project_id: UUID, skip: int = 0, limit: Optional[int] = None
+    ) -> SharedModulesResponse:
+        """Get shared modules (used by multiple modules), most used first."""
+        rows = await self.dependency_repo.get_shared_targets(project_id, skip=skip, limit=limit)
+        shared_modules = [
+            SharedModuleInfo(
+                module_id=row.id,
+                module_name=row.name,
+                usage_count=row.usage_count,
+                used_by=list(row.used_by),
+            )
+            for row in rows
+        ]
 
-        # Sort by usage count
-        shared_modules.sort(key=lambda x: x.usage_count, reverse=True)
+        # total_count covers every shared module, not just this page
+        if limit is None and skip == 0:
+            total_count = len(shared_modules)
+        else:
+            total_count = await self.dependency_repo.count_shared_targets(project_id)
 
         return SharedModulesResponse(
             shared_modules=shared_modules,
-            total_count=len(shared_modules),
+            total_count=total_count,
         )
 
     # ========================================================================
@@ -561,13 +695,19 @@ class ArchitectureService:
         self,
         module_id: UUID,
         change_type: str = "update",
+        path_mode: str = "all",
+        max_depth: int = 3,
+        max_paths: int = DEFAULT_MAX_PATHS,
     ) -> dict:
         """
         ADVANCED: Analyze impact using RefMemTree dependency tracking.
 
         This uses RefMemTree's internal tracking to provide deeper analysis.
+        path_mode: "all" (bounded paths), "shortest" or "summary" (no paths).
         """
-        return self.refmem.analyze_module_modification_impact(module_id, change_type)
+        return self.refmem.analyze_module_modification_impact(
+            module_id, change_type, limits=PathSearchLimits(max_depth, max_paths), path_mode=path_mode
+        )
 
     def simulate_module_change(
         self,
@@ -662,62 +802,58 @@ class ArchitectureService:
     # Private Helper Methods
     # ========================================================================
 
-    async def _would_create_circular_dependency(self, from_module_id: UUID, to_module_id: UUID) -> bool:
-        """Check if creating this dependency would create a circular dependency."""
-        # Use DFS to check if there's a path from to_module to from_module
-        visited = set()
-
-        async def dfs(current_id: UUID) -> bool:
-            if current_id == from_module_id:
-                return True
-            if current_id in visited:
-                return False
-
-            visited.add(current_id)
-
-            # Get all dependencies FROM current module
-            deps = await self.dependency_repo.get_dependencies_from(current_id)
-            for dep in deps:
-                if await dfs(dep.to_module_id):
-                    return True
-
-            return False
+    async def _refresh_graph(self, project_id: UUID) -> None:
+        """Apply a committed write the graph does not mirror (keeps the project ETag current)."""
+        try:
+            await get_graph_manager().refresh_after_write(project_id, self.db)
+        except Exception as e:
+            print(f"⚠️ RefMemTree refresh warning: {e}")
+
+    def _check_dependency_rules(self, overlay: GraphOverlay, data: ModuleDependencyCreate) -> None:
+        """Simulate adding the dependency on a fork of the overlay and raise ValueError if a rule blocks it."""
+        from_id, to_id = str(data.from_module_id), str(data.to_module_id)
+        if not (overlay.has_node(from_id) and overlay.has_node(to_id)):
+            return
+
+        # ⭐ SIMULATE adding dependency (copy-on-write: only the new edge is recorded)
+        after = overlay.fork()
+        after.add_dependency(from_id, to_id, data.dependency_type)
+
+        # Check for BLOCKING errors from the Rule Engine
+        blocking_errors = [v for v in after.introduced_violations() if v["severity"] == "error"]
+        if blocking_errors:
+            # ⭐ RULE ENGINE BLOCKS INVALID OPERATION!
+            raise ValueError(
+                f"❌ Rule Engine blocked: {blocking_errors[0]['message']}\n"
+                f"Rule: {blocking_errors[0]['rule']}\n"
+                f"Fix: Review architecture rules"
+            )
 
-        return await dfs(to_module_id)
+    @staticmethod
+    def _impact_level(dependency_type: Optional[str]) -> str:
+        """Impact of a change on a dependent; dependency_type is None beyond the first hop."""
+        return "direct" if dependency_type in ["import", "extends"] else "indirect"
+
+    async def _load_adjacency(self, project_id: UUID) -> Dict[UUID, List[UUID]]:
+        """Outgoing dependencies of every module with dependencies, loaded in one query."""
+        adjacency: Dict[UUID, List[UUID]] = {}
+        for from_id, to_id in await self.dependency_repo.get_edges(project_id):
+            adjacency.setdefault(from_id, []).append(to_id)
+            adjacency.setdefault(to_id, [])
+        return adjacency
+
+    async def _would_create_circular_dependency(
+        self, project_id: UUID, from_module_id: UUID, to_module_id: UUID
+    ) -> bool:
+        """Check if creating this dependency would create a circular dependency."""
+        # A cycle appears if from_module is already reachable from to_module
+        adjacency = await self._load_adjacency(project_id)
+        return shortest_path(to_module_id, from_module_id, lambda module_id: adjacency.get(module_id, [])) is not None
 
     async def _detect_circular_dependencies(self, project_id: UUID) -> List[List[UUID]]:
-        """Detect all circular dependencies using DFS."""
-        modules = await self.module_repo.get_by_project(project_id)
-        cycles: list[list[UUID]] = []
-        visited = set()
-        rec_stack = set()
-        path = []
-
-        async def dfs(module_id: UUID) -> bool:
-            visited.add(module_id)
-            rec_stack.add(module_id)
-            path.append(module_id)
-
-            # Get dependencies
-            deps = await self.dependency_repo.get_dependencies_from(module_id)
-            for dep in deps:
-                to_id = dep.to_module_id
-
-                if to_id not in visited:
-                    if await dfs(to_id):
-                        return True
-                elif to_id in rec_stack:
-                    # Found cycle
-                    cycle_start = path.index(to_id)
-                    cycle = path[cycle_start:] + [to_id]
-                    cycles.append(cycle)
-
-            path.pop()
-            rec_stack.remove(module_id)
-            return False
-
-        for module in modules:
-            if module.id not in visited:
-                await dfs(module.id)
-
-        return cycles
+        """
+        Detect circular dependencies: one closed cycle per tangle (strongly
+        connected component), found with iterative Tarjan over one query.
+        """
+        adjacency = await self._load_adjacency(project_id)
+        return find_cycles(adjacency, adjacency.__getitem__)
@@ -3,6 +3,7 @@
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.modules.architecture.schemas import ArchitectureValidationResponse
 from backend.modules.architecture.service import ArchitectureService
 from backend.modules.requirements.service import RequirementsService
 from backend.modules.code_generation.schemas import PreGenerationValidation, ValidationCheck
@@ -20,8 +21,11 @@ class ValidationPipeline:
         """Validate if project is ready for code generation."""
         checks = []
 
+        # One validation pass (single-query cycle detection) shared by checks 1 and 3
+        validation = await self.arch_service.validate_architecture(project_id)
+
         # Check 1: Architecture Completeness
-        arch_check = await self._validate_architecture(project_id)
+        arch_check = await self._validate_architecture(project_id, validation)
         checks.append(arch_check)
 
         # Check 2: Requirements Quality
@@ -29,7 +33,7 @@ class ValidationPipeline:
         checks.append(req_check)
 
         # Check 3: Dependencies
-        dep_check = await self._validate_dependencies(project_id)
+        dep_check = self._validate_dependencies(validation)
         checks.append(dep_check)
 
         # Check 4: Technology Stack
@@ -65,10 +69,11 @@ class ValidationPipeline:
             blocking_issues=blocking_issues,
         )
 
-    async def _validate_architecture(self, project_id: UUID) -> ValidationCheck:
+    async def _validate_architecture(
+        self, project_id: UUID, validation: ArchitectureValidationResponse
+    ) -> ValidationCheck:
         """Validate architecture is complete."""
         modules = await self.arch_service.list_modules(project_id)
-        validation = await self.arch_service.validate_architecture(project_id)
 
         issues = []
         if len(modules) == 0:
@@ -123,10 +128,8 @@ class ValidationPipeline:
             issues=issues,
         )
 
-    async def _validate_dependencies(self, project_id: UUID) -> ValidationCheck:
+    def _validate_dependencies(self, validation: ArchitectureValidationResponse) -> ValidationCheck:
         """Validate all dependencies are resolved."""
-        validation = await self.arch_service.validate_architecture(project_id)
-
         issues = []
         if not validation.is_valid:
             for issue in validation.issues:
@@ -7,13 +7,15 @@ This implements the CRITICAL "write-through" pattern:
 3. Keep both in perfect sync
 """
 
-from typing import Optional
-from uuid import UUID
+from typing import List, Optional, Sequence
+from uuid import UUID, uuid4
 
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.db.models import TreeNode
 from backend.core.graph_manager import get_graph_manager
+from backend.core.materialized_path import build_path, is_within, move_subtree, path_ids, require_path
 
 
 class TreeNodeService:
@@ -41,12 +43,18 @@ class TreeNodeService:
         1. PostgreSQL write (Source of Truth)
         2. RefMemTree update (Query Engine)
         """
-        # Step 1: Write to PostgreSQL
+        # Step 1: Write to PostgreSQL (materialized path and level follow the parent)
+        parent = await self.session.get(TreeNode, parent_id) if parent_id else None
+        node_id = uuid4()
+        path = build_path(parent.path if parent is not None else None, node_id)
         node = TreeNode(
+            id=node_id,
             project_id=project_id,
             parent_id=parent_id,
             node_type=node_type,
             data=data,
+            level=(parent.level or 0) + 1 if parent is not None else 0,
+            path=path,
         )
 
         self.session.add(node)
@@ -207,3 +215,57 @@ class TreeNodeService:
         )
 
         return impact
+
+    # ========================================================================
+    # Hierarchy (materialized path)
+    # ========================================================================
+
+    async def move_node(self, node_id: UUID, parent_id: Optional[UUID]) -> Optional[TreeNode]:
+        """Re-parent a node; paths and levels of its whole subtree follow in one UPDATE."""
+        node = await self.session.get(TreeNode, node_id)
+        if not node:
+            return None
+
+        parent = await self.session.get(TreeNode, parent_id) if parent_id else None
+        if parent_id and parent is None:
+            raise ValueError("Parent node not found")
+        old_path = require_path(node.path, "Node")
+        parent_path = require_path(parent.path, "Parent node") if parent is not None else None
+        if parent_path is not None and is_within(parent_path, old_path):
+            raise ValueError("Node cannot be moved under itself or its descendants")
+
+        new_path = build_path(parent_path, node.id)
+        if new_path != old_path:
+            await move_subtree(self.session, TreeNode, old_path, new_path)
+        node.parent_id = parent_id
+
+        await self.session.commit()
+        await self.session.refresh(node)
+        return node
+
+    async def get_subtree(self, node: TreeNode) -> Sequence[TreeNode]:
+        """All nodes below a node, shallowest first (one prefix scan on path)."""
+        result = await self.session.execute(
+            select(TreeNode)
+            .where(TreeNode.path.startswith(node.path), TreeNode.id != node.id)
+            .order_by(TreeNode.level, TreeNode.position)
+        )
+        return result.scalars().all()
+
+    async def count_descendants(self, node: TreeNode) -> int:
+        """Number of nodes below a node (one prefix scan on path)."""
+        result = await self.session.execute(
+            select(func.count())
+            .select_from(TreeNode)
+            .where(TreeNode.path.startswith(node.path), TreeNode.id != node.id)
+        )
+        return result.scalar_one()
+
+    async def get_ancestors(self, node: TreeNode) -> List[TreeNode]:
+        """Nodes above a node, root first (ids come from its path)."""
+        ancestor_ids = path_ids(node.path)[:-1]
+        if not ancestor_ids:
+            return []
+        result = await self.session.execute(select(TreeNode).where(TreeNode.id.in_(ancestor_ids)))
+        by_id = {ancestor.id: ancestor for ancestor in result.scalars().all()}
+        return [by_id[ancestor_id] for ancestor_id in ancestor_ids if ancestor_id in by_id]
@@ -0,0 +1,32 @@
+"""Fixtures for performance benchmarks (see backend/tests/utils/benchmarks.py)."""
+
+from typing import AsyncGenerator
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.db.models import ArchitectureModule, ModuleDependency, Project, User
+
+
+@pytest.fixture
+async def benchmark_project(test_db: AsyncSession) -> AsyncGenerator[Project, None]:
+    """Create a throwaway project for benchmark data."""
+    user = User(
+        email=f"bench-{uuid4()}@test.com",
+        username=f"bench-{uuid4()}",
+        hashed_password="hashed",
+    )
+    test_db.add(user)
+    await test_db.flush()
+
+    project = Project(name="Benchmark Project", description="Benchmark", goal="Benchmark", created_by=user.id)
+    test_db.add(project)
+    await test_db.commit()
+
+    yield project
+
+    await test_db.execute(delete(ModuleDependency).where(ModuleDependency.project_id == project.id))
+    await test_db.execute(delete(ArchitectureModule).where(ArchitectureModule.project_id == project.id))
+    await test_db.commit()
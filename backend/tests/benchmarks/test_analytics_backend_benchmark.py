@@ -0,0 +1,95 @@
+"""
+Benchmark: rustworkx mirror vs. per-node Python loops for graph analytics.
+
+Builds a synthetic acyclic project graph in a RefMemTree GraphSystem and
+times the same analytics on both GraphAnalyticsService backends. Betweenness
+is O(V * E) in Python, so it runs on a smaller graph.
+"""
+
+import asyncio
+import os
+import random
+import time
+from typing import Any, Callable, Dict, List, Tuple
+from uuid import UUID, uuid4
+
+import pytest
+
+from backend.core.graph_analytics_service import GraphAnalyticsService
+from backend.core.graph_mirror import RUSTWORKX_AVAILABLE
+from backend.tests.utils.benchmarks import requires_benchmarks
+from refmemtree import GraphSystem
+
+NODES = int(os.getenv("CODORCH_BENCH_ANALYTICS_NODES", "5000"))
+EDGES = int(os.getenv("CODORCH_BENCH_ANALYTICS_EDGES", "25000"))
+CENTRALITY_NODES = int(os.getenv("CODORCH_BENCH_CENTRALITY_NODES", "500"))
+CLOSURE_TARGETS = 20
+
+
+def _build(nodes: int, edges: int, seed: int = 7) -> Tuple[GraphSystem, List[UUID]]:
+    """Build a GraphSystem with edges from higher to lower node index (acyclic)."""
+    rng = random.Random(seed)
+    graph_system = GraphSystem()
+    node_ids = [uuid4() for _ in range(nodes)]
+    for i, node_id in enumerate(node_ids):
+        graph_system.add_node(node_id=str(node_id), node_type="service", data={"name": f"Module{i}"})
+    added = set()
+    while len(added) < edges:
+        a, b = rng.randrange(nodes), rng.randrange(nodes)
+        if a != b and (max(a, b), min(a, b)) not in added:
+            added.add((max(a, b), min(a, b)))
+            graph_system.get_node(str(node_ids[max(a, b)])).add_dependency(
+                target_node_id=str(node_ids[min(a, b)]), dependency_type="uses"
+            )
+    return graph_system, node_ids
+
+
+def _time(fn: Callable[[], Any]) -> float:
+    started = time.perf_counter()
+    result = fn()
+    if asyncio.iscoroutine(result):
+        asyncio.run(result)
+    return time.perf_counter() - started
+
+
+@requires_benchmarks
+@pytest.mark.slow
+@pytest.mark.skipif(not RUSTWORKX_AVAILABLE, reason="rustworkx not installed")
+def test_rustworkx_vs_python_analytics() -> None:
+    graph_system, node_ids = _build(NODES, EDGES)
+    targets = node_ids[-CLOSURE_TARGETS:]
+
+    services = {
+        "python loops": GraphAnalyticsService(graph_system, use_rustworkx=False),
+        "rustworkx mirror": GraphAnalyticsService(graph_system, use_rustworkx=True),
+    }
+
+    async def closures(service: GraphAnalyticsService) -> List[int]:
+        return [(await service.get_transitive_dependencies(t, max_depth=50))["total_unique_dependencies"] for t in targets]
+
+    rows: Dict[str, Dict[str, float]] = {}
+    results: Dict[str, List[Any]] = {}
+    for name, service in services.items():
+        # Mirror construction is a one-off per project load; time it separately
+        rows[name] = {"build": _time(service._current_mirror)}
+        rows[name]["degrees"] = _time(service.get_degree_stats)
+        rows[name]["sccs"] = _time(service.get_strongly_connected_components)
+        rows[name]["topo sort"] = _time(service.get_topological_order)
+        rows[name]["closure x20"] = _time(lambda service=service: closures(service))
+        results[name] = [
+            asyncio.run(service.get_degree_stats()),
+            asyncio.run(closures(service)),
+        ]
+
+    small, _ = _build(CENTRALITY_NODES, CENTRALITY_NODES * 5)
+    for name, use_rustworkx in (("python loops", False), ("rustworkx mirror", True)):
+        service = GraphAnalyticsService(small, use_rustworkx=use_rustworkx)
+        rows[name]["betweenness"] = _time(service.get_betweenness_centrality)
+
+    columns = list(rows["python loops"])
+    print(f"\nGraph analytics: {NODES} nodes / {EDGES} edges (betweenness: {CENTRALITY_NODES} nodes)")
+    print(f"{'backend':<20}" + "".join(f"{column:>14}" for column in columns))
+    for name, timings in rows.items():
+        print(f"{name:<20}" + "".join(f"{timings[column]:>13.3f}s" for column in columns))
+
+    assert results["python loops"] == results["rustworkx mirror"]
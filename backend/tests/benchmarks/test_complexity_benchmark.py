@@ -0,0 +1,69 @@
+"""
+Benchmark: complexity analysis with aggregate queries vs. per-module queries.
+
+The "before" variant reproduces the previous hotspot loop, which issued two
+dependency queries per module (2N + 2 round trips). 5k modules / 25k
+dependencies by default (override with CODORCH_BENCH_COMPLEXITY_MODULES /
+CODORCH_BENCH_COMPLEXITY_DEPENDENCIES).
+"""
+
+import os
+from typing import Dict, List
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.db.models import Project
+from backend.modules.architecture.repository import ArchitectureModuleRepository, ModuleDependencyRepository
+from backend.modules.architecture.service import ArchitectureService
+from backend.tests.utils.benchmarks import measure, report, requires_benchmarks, seed_architecture
+
+MODULES = int(os.getenv("CODORCH_BENCH_COMPLEXITY_MODULES", "5000"))
+DEPENDENCIES = int(os.getenv("CODORCH_BENCH_COMPLEXITY_DEPENDENCIES", "25000"))
+
+
+async def _hotspots_per_module(session: AsyncSession, project: Project) -> List[str]:
+    """Previous behaviour: two dependency queries per module."""
+    module_repo = ArchitectureModuleRepository(session)
+    dependency_repo = ModuleDependencyRepository(session)
+    modules = await module_repo.get_by_project(project.id, limit=MODULES)
+    dependencies = await dependency_repo.get_by_project(project.id)
+    avg_dependencies = len(dependencies) / len(modules)
+
+    hotspots: List[str] = []
+    for module in modules:
+        deps_from = await dependency_repo.get_dependencies_from(module.id)
+        deps_to = await dependency_repo.get_dependencies_to(module.id)
+        if len(deps_from) + len(deps_to) > avg_dependencies * 2:
+            hotspots.append(module.name)
+    return hotspots
+
+
+@requires_benchmarks
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_complexity_aggregate_vs_per_module(test_db: AsyncSession, benchmark_project: Project) -> None:
+    """Compare analyze_complexity (constant round trips) with the per-module query loop."""
+    await seed_architecture(test_db, benchmark_project.id, MODULES, DEPENDENCIES)
+    results: Dict[str, List[str]] = {}
+
+    async def aggregate() -> None:
+        analysis = await ArchitectureService(test_db).analyze_complexity(benchmark_project.id)
+        assert analysis.metrics.module_count == MODULES
+        results["after"] = [hotspot.module_name for hotspot in analysis.hotspots]
+
+    async def per_module() -> None:
+        results["before"] = await _hotspots_per_module(test_db, benchmark_project)
+
+    after = await measure(aggregate)
+    test_db.expunge_all()
+    before = await measure(per_module)
+    test_db.expunge_all()
+
+    report(
+        f"Complexity analysis: {MODULES} modules / {DEPENDENCIES} dependencies",
+        {"per-module queries (before)": before, "aggregate queries (after)": after},
+    )
+
+    # analyze_complexity reports the top 5 hotspots by score
+    assert set(results["after"]) <= set(results["before"])
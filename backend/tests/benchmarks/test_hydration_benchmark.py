@@ -0,0 +1,44 @@
+"""
+Benchmark: ORM hydration vs. streamed column hydration.
+
+20k modules / 100k dependencies by default (override with
+CODORCH_BENCH_MODULES / CODORCH_BENCH_DEPENDENCIES).
+"""
+
+import os
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.graph_hydration_service import GraphHydrationService
+from backend.db.models import Project
+from backend.tests.utils.benchmarks import measure, report, requires_benchmarks, seed_architecture
+from refmemtree import GraphSystem
+
+MODULES = int(os.getenv("CODORCH_BENCH_MODULES", "20000"))
+DEPENDENCIES = int(os.getenv("CODORCH_BENCH_DEPENDENCIES", "100000"))
+
+
+@requires_benchmarks
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_hydration_orm_vs_streaming(test_db: AsyncSession, benchmark_project: Project) -> None:
+    """Compare hydrate_from_database (ORM) with hydrate_streaming (Core rows + yield_per)."""
+    await seed_architecture(test_db, benchmark_project.id, MODULES, DEPENDENCIES)
+
+    # ru_maxrss is a process-wide high-water mark, so measure the lighter variant first
+    streaming_service = GraphHydrationService(GraphSystem())
+    streaming = await measure(lambda: streaming_service.hydrate_streaming(benchmark_project.id, test_db))
+    test_db.expunge_all()
+
+    orm_service = GraphHydrationService(GraphSystem())
+    orm = await measure(lambda: orm_service.hydrate_from_database(benchmark_project.id, test_db))
+    test_db.expunge_all()
+
+    report(
+        f"Hydration: {MODULES} modules / {DEPENDENCIES} dependencies",
+        {"ORM (before)": orm, "streaming Core rows (after)": streaming},
+    )
+
+    assert len(streaming_service._module_ids) == len(orm_service._module_ids) == MODULES
+    assert len(streaming_service._dependencies) == len(orm_service._dependencies)
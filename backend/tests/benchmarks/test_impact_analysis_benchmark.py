@@ -0,0 +1,57 @@
+"""
+Benchmark: impact analysis with the reverse adjacency index vs. edge scans.
+
+The "before" variant reproduces the previous get_dependents() that scanned
+every edge on each call.
+"""
+
+import os
+import random
+import time
+from typing import List
+from uuid import UUID, uuid4
+
+import pytest
+
+from backend.core.refmemtree_advanced import DependencyLink, RefMemTreeManager
+from backend.tests.utils.benchmarks import requires_benchmarks
+
+NODES = int(os.getenv("CODORCH_BENCH_IMPACT_NODES", "3000"))
+EDGES = int(os.getenv("CODORCH_BENCH_IMPACT_EDGES", "15000"))
+TARGETS = int(os.getenv("CODORCH_BENCH_IMPACT_TARGETS", "50"))
+
+
+class EdgeScanManager(RefMemTreeManager):
+    """Previous behaviour: O(E) scan per get_dependents() call."""
+
+    def get_dependents(self, node_id: UUID) -> List[DependencyLink]:
+        return [link for links in self.dependencies.values() for link in links if link.to_node_id == node_id]
+
+
+def _build(manager: RefMemTreeManager, node_ids: List[UUID], rng: random.Random) -> None:
+    for _ in range(EDGES):
+        a, b = rng.randrange(NODES), rng.randrange(NODES)
+        if a != b:
+            manager.add_dependency(DependencyLink(node_ids[max(a, b)], node_ids[min(a, b)], "uses"))
+
+
+@requires_benchmarks
+@pytest.mark.slow
+def test_impact_analysis_reverse_index_vs_scan() -> None:
+    """Time analyze_change_impact over many targets on a large graph."""
+    node_ids = [uuid4() for _ in range(NODES)]
+    targets = node_ids[:TARGETS]
+
+    timings = {}
+    results = {}
+    for name, manager in (("edge scan (before)", EdgeScanManager()), ("reverse index (after)", RefMemTreeManager())):
+        _build(manager, node_ids, random.Random(7))
+        started = time.perf_counter()
+        results[name] = [sorted(manager.analyze_change_impact(t, "update").affected_nodes) for t in targets]
+        timings[name] = time.perf_counter() - started
+
+    print(f"\nImpact analysis: {NODES} nodes / {EDGES} edges / {TARGETS} targets")
+    for name, seconds in timings.items():
+        print(f"{name:<24}{seconds:>10.3f}s")
+
+    assert results["edge scan (before)"] == results["reverse index (after)"]
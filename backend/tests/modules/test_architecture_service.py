@@ -9,6 +9,8 @@ from backend.db.models import Project
 from backend.modules.architecture.service import ArchitectureService
 from backend.modules.architecture.schemas import (
     ArchitectureModuleCreate,
+    ArchitectureModuleUpdate,
+    ImpactAnalysisRequest,
     ModuleDependencyCreate,
 )
 
@@ -51,6 +53,86 @@ class TestArchitectureService:
 
         assert child.level == parent.level + 1
 
+    async def test_move_module_rewrites_subtree_paths(
+        self, async_session: AsyncSession, sample_project: Project
+    ) -> None:
+        """Moving a module carries its subtree; hierarchy queries follow the paths."""
+        service = ArchitectureService(async_session)
+
+        async def create(name: str, parent_id=None):
+            return await service.create_module(
+                ArchitectureModuleCreate(
+                    project_id=sample_project.id, parent_id=parent_id, name=name, module_type="package"
+                )
+            )
+
+        backend = await create("Backend")
+        services = await create("Services", backend.id)
+        users = await create("UserService", services.id)
+        frontend = await create("Frontend")
+
+        assert users.path == f"/{backend.id}/{services.id}/{users.id}/"
+        assert await service.module_repo.count_descendants(backend) == 2
+
+        await service.update_module(services.id, ArchitectureModuleUpdate(parent_id=frontend.id))
+        await async_session.refresh(users)
+
+        assert users.path == f"/{frontend.id}/{services.id}/{users.id}/"
+        assert users.level == 2
+        assert await service.module_repo.count_descendants(backend) == 0
+        assert [m.id for m in await service.module_repo.get_ancestors(users)] == [frontend.id, services.id]
+        with pytest.raises(ValueError, match="under itself"):
+            await service.update_module(frontend.id, ArchitectureModuleUpdate(parent_id=users.id))
+
+        # A row without a path (not backfilled yet) is refused rather than moved blindly
+        users.path = None
+        await async_session.commit()
+        with pytest.raises(ValueError, match="no materialized path"):
+            await service.update_module(users.id, ArchitectureModuleUpdate(parent_id=backend.id))
+
+    async def test_parents_must_be_in_the_same_project(
+        self, async_session: AsyncSession, sample_project: Project
+    ) -> None:
+        """Moves and batch inserts reject parents from another project; a batch may nest under itself."""
+        from datetime import datetime
+
+        service = ArchitectureService(async_session)
+        other = Project(
+            name="Other",
+            description="Other",
+            goal="Other goal",
+            owner_id=sample_project.owner_id,
+            created_at=datetime.utcnow(),
+            updated_at=datetime.utcnow(),
+        )
+        async_session.add(other)
+        await async_session.commit()
+        foreign = await service.create_module(
+            ArchitectureModuleCreate(project_id=other.id, name="Foreign", module_type="package")
+        )
+        local = await service.create_module(
+            ArchitectureModuleCreate(project_id=sample_project.id, name="Local", module_type="package")
+        )
+
+        with pytest.raises(ValueError, match="another project"):
+            await service.update_module(local.id, ArchitectureModuleUpdate(parent_id=foreign.id))
+        with pytest.raises(ValueError, match="another project"):
+            await service.module_repo.create_many(
+                [ArchitectureModuleCreate(project_id=sample_project.id, parent_id=foreign.id, name="Stray")]
+            )
+        await async_session.rollback()
+
+        root_id, child_id = uuid4(), uuid4()
+        root, child = await service.module_repo.create_many(
+            [
+                ArchitectureModuleCreate(project_id=sample_project.id, name="Root"),
+                ArchitectureModuleCreate(project_id=sample_project.id, parent_id=root_id, name="Child"),
+            ],
+            ids=[root_id, child_id],
+        )
+        assert child.level == root.level + 1
+        assert child.path == f"/{root_id}/{child_id}/"
+
     async def test_create_dependency_prevents_self_reference(
         self, async_session: AsyncSession, sample_project: Project
     ) -> None:
@@ -85,6 +167,192 @@ class TestArchitectureService:
         # Either succeeds or gracefully handles RefMemTree unavailability
         assert result in [True, False] or isinstance(result, bool)
 
+    async def test_validate_architecture_reports_cycle(
+        self, async_session: AsyncSession, sample_project: Project
+    ) -> None:
+        """A cycle written directly to the database is reported once, closed."""
+        service = ArchitectureService(async_session)
+        a, b, c = [
+            await service.create_module(
+                ArchitectureModuleCreate(project_id=sample_project.id, name=name, module_type="service")
+            )
+            for name in ("AService", "BService", "CService")
+        ]
+        for from_module, to_module in ((a, b), (b, c), (c, a)):
+            # Bypass create_dependency's cycle check
+            await service.dependency_repo.create(
+                ModuleDependencyCreate(
+                    project_id=sample_project.id,
+                    from_module_id=from_module.id,
+                    to_module_id=to_module.id,
+                    dependency_type="uses",
+                )
+            )
+
+        validation = await service.validate_architecture(sample_project.id)
+
+        assert not validation.is_valid
+        assert len(validation.issues) == 1
+        cycle = validation.issues[0].affected_modules
+        assert cycle[0] == cycle[-1]
+        assert set(cycle) == {a.id, b.id, c.id}
+
+    async def test_analyze_impact_transitive(self, async_session: AsyncSession, sample_project: Project) -> None:
+        """Transitive impact reports distance and the edge types along the path."""
+        service = ArchitectureService(async_session)
+        core, api, ui = [
+            await service.create_module(
+                ArchitectureModuleCreate(project_id=sample_project.id, name=name, module_type="service")
+            )
+            for name in ("Core", "Api", "Ui")
+        ]
+        for from_module, to_module, dependency_type in ((api, core, "extends"), (ui, api, "uses")):
+            await service.create_dependency(
+                ModuleDependencyCreate(
+                    project_id=sample_project.id,
+                    from_module_id=from_module.id,
+                    to_module_id=to_module.id,
+                    dependency_type=dependency_type,
+                )
+            )
+
+        direct = await service.analyze_impact(ImpactAnalysisRequest(module_id=core.id, change_type="modify"))
+        transitive = await service.analyze_impact(
+            ImpactAnalysisRequest(module_id=core.id, change_type="modify", transitive=True)
+        )
+        bounded = await service.analyze_impact(
+            ImpactAnalysisRequest(module_id=core.id, change_type="modify", transitive=True, max_depth=1)
+        )
+
+        assert [affected.module_id for affected in direct.affected_modules] == [api.id]
+        assert [(a.module_id, a.distance, a.path_edge_types) for a in transitive.affected_modules] == [
+            (api.id, 1, ["extends"]),
+            (ui.id, 2, ["uses", "extends"]),
+        ]
+        assert transitive.breaking_changes
+        assert [affected.module_id for affected in bounded.affected_modules] == [api.id]
+
+    async def test_transitive_dependents_visit_each_module_once(
+        self, async_session: AsyncSession, sample_project: Project
+    ) -> None:
+        """Diamonds and cycles report every dependent once, at its shortest distance."""
+        service = ArchitectureService(async_session)
+        core, left, right, top = [
+            await service.create_module(
+                ArchitectureModuleCreate(project_id=sample_project.id, name=name, module_type="service"),
+                sync_graph=False,
+            )
+            for name in ("Core", "Left", "Right", "Top")
+        ]
+        # top -> left -> core, top -> right -> core, plus core -> top closing a cycle (inserted unchecked)
+        edges = ((left, core), (right, core), (top, left), (top, right), (core, top))
+        await service.dependency_repo.create_many(
+            [
+                ModuleDependencyCreate(
+                    project_id=sample_project.id,
+                    from_module_id=from_module.id,
+                    to_module_id=to_module.id,
+                    dependency_type="uses",
+                )
+                for from_module, to_module in edges
+            ]
+        )
+        await async_session.commit()
+
+        dependents = await service.dependency_repo.get_transitive_dependents(core.id, max_depth=10)
+
+        assert sorted((row.distance, row.name, row.edge_types) for row in dependents) == [
+            (1, "Left", ["uses"]),
+            (1, "Right", ["uses"]),
+            (2, "Top", ["uses", "uses"]),
+        ]
+
+    async def test_create_architecture_bulk_skips_invalid_dependencies(
+        self, async_session: AsyncSession, sample_project: Project
+    ) -> None:
+        """A proposal is materialized in one pass; bad edges are dropped, not fatal."""
+        service = ArchitectureService(async_session)
+        modules = [
+            ArchitectureModuleCreate(project_id=sample_project.id, name=name, module_type="service")
+            for name in ("Api", "Domain", "Storage")
+        ]
+        dependencies = [
+            {"from_module": "Api", "to_module": "Domain", "dependency_type": "uses", "reason": "calls"},
+            {"from_module": "Domain", "to_module": "Storage", "dependency_type": "uses"},
+            {"from_module": "Api", "to_module": "Domain", "dependency_type": "uses"},  # Duplicate
+            {"from_module": "Storage", "to_module": "Api", "dependency_type": "uses"},  # Closes a cycle
+            {"from_module": "Api", "to_module": "Missing", "dependency_type": "uses"},  # Unknown module
+        ]
+
+        created_modules, created_dependencies = await service.create_architecture_bulk(
+            sample_project.id, modules, dependencies, generation_reasoning="layered"
+        )
+
+        by_name = {module.name: module.id for module in created_modules}
+        assert all(module.ai_generated for module in created_modules)
+        assert [(d.from_module_id, d.to_module_id) for d in created_dependencies] == [
+            (by_name["Api"], by_name["Domain"]),
+            (by_name["Domain"], by_name["Storage"]),
+        ]
+        assert created_dependencies[0].description == "calls"
+        assert len(await service.list_dependencies(sample_project.id)) == 2
+
+    async def test_analyze_complexity_uses_degree_counts(
+        self, async_session: AsyncSession, sample_project: Project
+    ) -> None:
+        """Hotspots come from aggregated in/out degrees."""
+        service = ArchitectureService(async_session)
+        hub, *clients = [
+            await service.create_module(
+                ArchitectureModuleCreate(project_id=sample_project.id, name=name, module_type="service")
+            )
+            for name in ("CoreService", "AService", "BService", "CService")
+        ]
+        for client in clients:
+            await service.create_dependency(
+                ModuleDependencyCreate(
+                    project_id=sample_project.id,
+                    from_module_id=client.id,
+                    to_module_id=hub.id,
+                    dependency_type="uses",
+                )
+            )
+
+        analysis = await service.analyze_complexity(sample_project.id)
+
+        assert analysis.metrics.module_count == 4
+        assert analysis.metrics.avg_dependencies == 0.75
+        assert analysis.metrics.cyclomatic_complexity == 7
+        assert [hotspot.module_id for hotspot in analysis.hotspots] == [hub.id]
+
+    async def test_get_shared_modules_paginates(self, async_session: AsyncSession, sample_project: Project) -> None:
+        """Shared modules are ordered by usage; total_count covers all pages."""
+        service = ArchitectureService(async_session)
+        core, util, *clients = [
+            await service.create_module(
+                ArchitectureModuleCreate(project_id=sample_project.id, name=name, module_type="service")
+            )
+            for name in ("Core", "Util", "AService", "BService", "CService")
+        ]
+        for target, users in ((core, clients), (util, clients[:2])):
+            for client in users:
+                await service.create_dependency(
+                    ModuleDependencyCreate(
+                        project_id=sample_project.id,
+                        from_module_id=client.id,
+                        to_module_id=target.id,
+                        dependency_type="uses",
+                    )
+                )
+
+        first_page = await service.get_shared_modules(sample_project.id, limit=1)
+        second_page = await service.get_shared_modules(sample_project.id, skip=1, limit=1)
+
+        assert first_page.total_count == second_page.total_count == 2
+        assert [info.module_id for info in first_page.shared_modules] == [core.id]
+        assert set(first_page.shared_modules[0].used_by) == {client.id for client in clients}
+        assert [info.usage_count for info in second_page.shared_modules] == [2]
+
 
 @pytest.fixture
 async def sample_project(async_session: AsyncSession) -> Project:
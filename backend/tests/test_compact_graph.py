@@ -0,0 +1,61 @@
+"""Tests for the array-backed CompactLinkStore and CompactRefMemTreeManager."""
+
+import random
+from uuid import uuid4
+
+from backend.core.compact_graph import CompactLinkStore
+from backend.core.refmemtree_advanced import CompactRefMemTreeManager, DependencyLink, RefMemTreeManager
+
+
+def test_store_keeps_insertion_order_across_compaction() -> None:
+    """Pending edges, tombstones and CSR rebuilds return the same live edges."""
+    store = CompactLinkStore()
+    a, b, c = uuid4(), uuid4(), uuid4()
+    store.add(a, b, "uses", 0.6)
+    store.add(a, c, "import", 0.9)
+    store.add(a, b, "import", 0.9)
+    assert store.remove(a, b, "uses") == 1
+
+    before = [store.edge(edge)[1:3] for edge in store.out_edges(store.intern(a))]
+    store.compact()
+    after = [store.edge(edge)[1:3] for edge in store.out_edges(store.intern(a))]
+
+    assert before == after == [(store.intern(c), "import"), (store.intern(b), "import")]
+    assert len(store) == 2
+    assert store.predecessors(store.intern(b)) == [store.intern(a)]
+
+
+def test_compact_manager_matches_object_manager() -> None:
+    """Both storage modes answer the public queries identically."""
+    rng = random.Random(7)
+    ids = [uuid4() for _ in range(60)]
+    managers = [RefMemTreeManager(), CompactRefMemTreeManager()]
+    for node_id in ids:
+        for manager in managers:
+            manager.register_node(node_id, {"name": str(node_id)})
+
+    # Enough churn to trigger several automatic compactions
+    for step in range(3000):
+        a, b = rng.sample(ids, 2)
+        dependency_type = rng.choice(["uses", "import"])
+        for manager in managers:
+            if step % 5 == 4:
+                manager.remove_dependency(a, b)
+            else:
+                manager.add_dependency(DependencyLink(a, b, dependency_type, 0.5))
+    for manager in managers:
+        manager.remove_node(ids[0])
+
+    def links(found: list) -> list:
+        return sorted((str(d.from_node_id), str(d.to_node_id), d.dependency_type) for d in found)
+
+    plain, compact = managers
+    assert compact.link_count() == plain.link_count()
+    assert set(compact.nodes) == set(plain.nodes)
+    for node_id in ids[:10]:
+        assert links(compact.get_dependencies(node_id)) == links(plain.get_dependencies(node_id))
+        assert links(compact.get_dependents(node_id)) == links(plain.get_dependents(node_id))
+        assert compact.get_dependency_reachability(node_id).min_depth == (
+            plain.get_dependency_reachability(node_id).min_depth
+        )
+    assert compact.estimate_size_bytes() < plain.estimate_size_bytes()
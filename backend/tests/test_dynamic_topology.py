@@ -0,0 +1,68 @@
+"""Tests for the incrementally maintained topological order used for cycle checks."""
+
+import random
+
+from backend.core.dynamic_topology import DynamicTopologicalOrder
+
+
+def _is_topological(topology: DynamicTopologicalOrder[int], edges: list) -> bool:
+    position = {node: index for index, node in enumerate(topology.order())}
+    return all(position[u] < position[v] for u, v in edges)
+
+
+def test_would_create_cycle_returns_closing_path() -> None:
+    topology: DynamicTopologicalOrder[str] = DynamicTopologicalOrder.from_edges("abc", [("a", "b"), ("b", "c")])
+
+    assert topology.would_create_cycle("c", "a") == ["c", "a", "b", "c"]
+    assert topology.would_create_cycle("a", "c") is None
+    assert topology.would_create_cycle("a", "a") == ["a", "a"]
+    # The check has no side effects
+    assert topology.would_create_cycle("a", "c") is None
+    assert topology.order() == ["a", "b", "c"]
+
+
+def test_insertions_against_order_reorder_affected_region() -> None:
+    """Random DAG insertions keep a valid order and never miss a cycle."""
+    rng = random.Random(7)
+    topology: DynamicTopologicalOrder[int] = DynamicTopologicalOrder()
+    for node in range(60):
+        topology.add_node(node)
+
+    edges = []
+    for _ in range(400):
+        u, v = rng.sample(range(60), 2)
+        if topology.would_create_cycle(u, v):
+            continue
+        assert topology.add_edge(u, v)
+        edges.append((u, v))
+
+    assert topology.is_acyclic
+    assert _is_topological(topology, edges)
+
+
+def test_cyclic_graph_falls_back_and_recovers_after_removal() -> None:
+    topology: DynamicTopologicalOrder[str] = DynamicTopologicalOrder()
+    topology.add_edge("a", "b")
+    assert not topology.add_edge("b", "a")
+    assert not topology.is_acyclic
+
+    topology.add_node("c")
+    assert topology.would_create_cycle("c", "a") is None
+    assert topology.would_create_cycle("b", "a") == ["b", "a", "b"]
+
+    topology.remove_edge("b", "a")
+    assert topology.is_acyclic
+    assert topology.would_create_cycle("b", "a") == ["b", "a", "b"]
+
+
+def test_parallel_edges_are_counted() -> None:
+    """Removing one of two typed edges between the same modules keeps the link."""
+    topology: DynamicTopologicalOrder[str] = DynamicTopologicalOrder()
+    topology.add_edge("a", "b")
+    topology.add_edge("a", "b")
+
+    topology.remove_edge("a", "b")
+    assert topology.would_create_cycle("b", "a") is not None
+
+    topology.remove_edge("a", "b")
+    assert topology.would_create_cycle("b", "a") is None
@@ -0,0 +1,84 @@
+"""Tests for the pure-Python graph algorithms (fallback analytics backend)."""
+
+from typing import Dict, List
+
+import pytest
+
+from backend.core.graph_algorithms import (
+    betweenness_centrality,
+    find_cycles,
+    shortest_path,
+    strongly_connected_components,
+    topological_sort,
+)
+
+GRAPH: Dict[str, List[str]] = {
+    "ui": ["api"],
+    "api": ["service"],
+    "service": ["repo", "api"],  # api <-> service tangle
+    "repo": ["db"],
+    "db": [],
+    "jobs": ["repo"],
+}
+
+
+def _succ(graph: Dict[str, List[str]]):
+    return lambda node: graph[node]
+
+
+def test_strongly_connected_components_find_tangles() -> None:
+    components = strongly_connected_components(GRAPH, _succ(GRAPH))
+
+    assert sorted(sorted(c) for c in components if len(c) > 1) == [["api", "service"]]
+    assert sum(len(c) for c in components) == len(GRAPH)
+    # Dependencies are emitted before their dependents
+    position = {node: i for i, component in enumerate(components) for node in component}
+    assert position["db"] < position["repo"] < position["service"] < position["ui"]
+
+
+def test_strongly_connected_components_deep_chain_does_not_recurse() -> None:
+    chain = {i: [i + 1] for i in range(20_000)}
+    chain[20_000] = [0]
+
+    components = strongly_connected_components(chain, _succ(chain))
+
+    assert len(components) == 1
+
+
+def test_find_cycles_one_per_component() -> None:
+    graph = dict(GRAPH, db=["db"], jobs=["repo", "x"], x=["y"], y=["jobs"])
+
+    cycles = find_cycles(graph, _succ(graph))
+
+    assert sorted(sorted(set(cycle)) for cycle in cycles) == [["api", "service"], ["db"], ["jobs", "x", "y"]]
+    for cycle in cycles:
+        assert cycle[0] == cycle[-1]
+        assert all(b in graph[a] for a, b in zip(cycle[:-1], cycle[1:], strict=True))
+    assert find_cycles({"a": ["b"], "b": []}, _succ({"a": ["b"], "b": []})) == []
+
+
+def test_topological_sort_and_cycle() -> None:
+    dag = {"a": ["b", "c"], "b": ["c"], "c": []}
+
+    assert topological_sort(dag, _succ(dag)) == ["a", "b", "c"]
+    assert topological_sort(GRAPH, _succ(GRAPH)) is None
+
+
+def test_shortest_path() -> None:
+    assert shortest_path("ui", "db", _succ(GRAPH)) == ["ui", "api", "service", "repo", "db"]
+    assert shortest_path("db", "ui", _succ(GRAPH)) is None
+
+
+def test_betweenness_centrality_matches_rustworkx() -> None:
+    pytest.importorskip("rustworkx")
+    from backend.core.graph_mirror import RustworkxGraphMirror
+
+    mirror = RustworkxGraphMirror()
+    for node, targets in GRAPH.items():
+        for target in targets:
+            mirror.add_edge(node, target, "uses")
+
+    expected = mirror.betweenness_centrality()
+    actual = betweenness_centrality(GRAPH, _succ(GRAPH))
+
+    assert actual == pytest.approx(expected)
@@ -0,0 +1,32 @@
+"""Tests for the Merkle tree behind project graph hashes."""
+
+import random
+
+from backend.core.graph_hash import MerkleTree, leaf_digest
+
+
+def test_incremental_tree_matches_rebuild() -> None:
+    """set() keeps the same root as building from the final leaves, and diffs find changed keys."""
+    rng = random.Random(3)
+    tree = MerkleTree(buckets=64)
+    leaves = {}
+    for step in range(2000):
+        key = f"n:{rng.randrange(300)}"
+        if step % 4 == 3:
+            tree.set(key, None)
+            leaves.pop(key, None)
+        else:
+            digest = leaf_digest([key, step])
+            tree.set(key, digest)
+            leaves[key] = digest
+
+    rebuilt = MerkleTree(buckets=64, leaves=leaves)
+    assert tree.root == rebuilt.root
+    assert tree.diff_buckets(rebuilt) == []
+
+    changed = next(iter(leaves))
+    rebuilt.set(changed, leaf_digest("changed"))
+    rebuilt.set("r:new", leaf_digest("rule"))
+    assert len(tree.diff_buckets(rebuilt)) <= 2
+    assert tree.diff_keys(rebuilt) == {changed, "r:new"}
+
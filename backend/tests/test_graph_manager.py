@@ -5,12 +5,17 @@ Critical tests for the BRAIN of Codorch!
 """
 
 from typing import Any, Dict
+from unittest.mock import MagicMock
 import pytest
 from uuid import UUID, uuid4
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.core.graph_hydration_service import GraphHydrationService
+from backend.core.graph_mirror import RUSTWORKX_AVAILABLE
+from backend.core.graph_operations_service import GraphOperation
 from backend.core.graph_manager import GraphManagerService, get_graph_manager, reset_graph_manager
+from backend.core.graph_versioning_service import _diff_tables, _hashes
 from backend.db.models import Project, User
 
 
@@ -74,6 +79,115 @@ class TestGraphManagerIntegration:
         assert manager is not None
         assert hasattr(manager, "_graph_cache")
 
+    async def test_delta_refresh_applies_only_changes(
+        self, async_session: AsyncSession, sample_project: Project
+    ) -> None:
+        """Delta refresh picks up new rows and deletions without a full reload."""
+        from backend.db.models import ArchitectureModule
+
+        keep = ArchitectureModule(project_id=sample_project.id, name="KeepService", module_type="service")
+        drop = ArchitectureModule(project_id=sample_project.id, name="DropService", module_type="service")
+        async_session.add_all([keep, drop])
+        await async_session.commit()
+
+        manager = GraphManagerService(max_projects=0, max_memory_bytes=0, idle_ttl_seconds=0)
+        hydration, ops, _, _ = await manager.get_or_create_services(sample_project.id, async_session)
+        assert hydration.modules_watermark is not None
+
+        added = ArchitectureModule(project_id=sample_project.id, name="NewService", module_type="service")
+        async_session.add(added)
+        await async_session.delete(drop)
+        await async_session.commit()
+
+        stats = await manager.refresh_project(sample_project.id, async_session)
+
+        assert stats["full_reload"] == 0
+        assert stats["modules_removed"] == 1
+        assert stats["modules_upserted"] == 1
+        assert hydration.graph_system.get_node(str(added.id)) is not None
+
+        # Nothing changed since: rows at the watermark are not re-applied and the revision stays put
+        version = ops.revision.version
+        assert not any((await manager.refresh_project(sample_project.id, async_session)).values())
+        assert ops.revision.version == version
+
+    async def test_delta_refresh_applies_rows_committed_late(
+        self, async_session: AsyncSession, sample_project: Project
+    ) -> None:
+        """Rows committed after a refresh with a timestamp behind the watermark are still applied."""
+        from datetime import timedelta
+
+        from backend.db.models import ArchitectureModule, ModuleDependency
+
+        first = ArchitectureModule(project_id=sample_project.id, name="FirstService", module_type="service")
+        async_session.add(first)
+        await async_session.commit()
+
+        manager = GraphManagerService(max_projects=0, max_memory_bytes=0, idle_ttl_seconds=0)
+        hydration, _, _, _ = await manager.get_or_create_services(sample_project.id, async_session)
+        await manager.refresh_project(sample_project.id, async_session)
+        assert hydration.modules_watermark is not None
+        stamp = hydration.modules_watermark - timedelta(minutes=5)
+
+        # Stamped by a slower transaction that started before the refresh
+        late = ArchitectureModule(
+            project_id=sample_project.id, name="LateService", module_type="service", updated_at=stamp
+        )
+        async_session.add(late)
+        await async_session.flush()
+        async_session.add(
+            ModuleDependency(
+                project_id=sample_project.id,
+                from_module_id=late.id,
+                to_module_id=first.id,
+                dependency_type="uses",
+                created_at=stamp,
+            )
+        )
+        await async_session.commit()
+
+        stats = await manager.refresh_project(sample_project.id, async_session)
+
+        assert stats["modules_upserted"] == 1
+        assert stats["dependencies_added"] == 1
+        assert hydration.graph_system.get_node(str(late.id)) is not None
+        assert not any((await manager.refresh_project(sample_project.id, async_session)).values())
+
+    async def test_service_writes_leave_no_drift(
+        self, async_session: AsyncSession, sample_project: Project, graph_manager: GraphManagerService
+    ) -> None:
+        """Nodes and edges written through the service match what hydration builds from the rows."""
+        from backend.modules.architecture.schemas import ArchitectureModuleCreate, ModuleDependencyCreate
+        from backend.modules.architecture.service import ArchitectureService
+
+        await graph_manager.get_or_create_services(sample_project.id, async_session)  # Cached before the writes
+        service = ArchitectureService(async_session)
+        api = await service.create_module(
+            ArchitectureModuleCreate(project_id=sample_project.id, name="Api", module_type="service")
+        )
+        store = await service.create_module(
+            ArchitectureModuleCreate(
+                project_id=sample_project.id, name="Store", module_type="service", module_metadata={"layer": "data"}
+            )
+        )
+        await service.create_dependency(
+            ModuleDependencyCreate(
+                project_id=sample_project.id,
+                from_module_id=api.id,
+                to_module_id=store.id,
+                dependency_type="uses",
+                description="Reads orders",
+                dependency_metadata={"weight": 2},
+            )
+        )
+
+        result = await graph_manager.check_drift(sample_project.id, async_session, repair=False)
+        assert result["checked"] and result["drifted"] == 0
+
+        # A later refresh adopts the written rows instead of adding them again
+        await graph_manager.refresh_project(sample_project.id, async_session)
+        assert (await graph_manager.check_drift(sample_project.id, async_session, repair=False))["drifted"] == 0
+
     async def test_add_node_to_graph_without_refmemtree(self, async_session: AsyncSession) -> None:
         """Test graceful fallback when RefMemTree not available."""
         manager = get_graph_manager()
@@ -103,6 +217,511 @@ class TestGraphManagerIntegration:
         assert isinstance(cycles, list)
 
 
+@pytest.fixture
+def skip_hydration(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Hydrate empty graphs without touching the database."""
+
+    async def _hydrate(self: GraphHydrationService, project_id: UUID, session: AsyncSession) -> None:
+        return None
+
+    monkeypatch.setattr(GraphHydrationService, "hydrate_streaming", _hydrate)
+
+
+@pytest.mark.asyncio
+class TestGraphCacheEviction:
+    """Test bounded project graph cache (LRU / memory budget / idle TTL)."""
+
+    async def test_lru_eviction_by_project_count(self, skip_hydration: None) -> None:
+        """Least recently used project is evicted when over max_projects."""
+        manager = GraphManagerService(max_projects=2, max_memory_bytes=0, idle_ttl_seconds=0)
+        session = MagicMock()
+        p1, p2, p3 = uuid4(), uuid4(), uuid4()
+
+        await manager.get_or_create_services(p1, session)
+        await manager.get_or_create_services(p2, session)
+        await manager.get_or_create_services(p1, session)  # p1 becomes most recent
+        await manager.get_or_create_services(p3, session)
+
+        assert p1 in manager._graph_cache
+        assert p2 not in manager._graph_cache
+        assert p3 in manager._graph_cache
+        # All per-project dicts are dropped together
+        assert p2 not in manager._hydration_services
+        assert p2 not in manager._operations_services
+        assert p2 not in manager._analytics_services
+        assert p2 not in manager._versioning_services
+
+        stats = manager.get_cache_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 3
+        assert stats["evictions"] == 1
+
+    async def test_idle_ttl_eviction_and_rehydration(self, skip_hydration: None) -> None:
+        """Idle projects are evicted and transparently rehydrated on next access."""
+        now = [0.0]
+        manager = GraphManagerService(max_projects=0, max_memory_bytes=0, idle_ttl_seconds=60, clock=lambda: now[0])
+        session = MagicMock()
+        project_id = uuid4()
+
+        first = await manager.get_or_create_services(project_id, session)
+        now[0] = 120.0
+        second = await manager.get_or_create_services(project_id, session)
+
+        assert first[0] is not second[0]
+        assert manager.get_cache_stats()["evictions"] == 1
+        assert manager.get_cache_stats()["misses"] == 2
+
+    async def test_memory_budget_keeps_project_in_use(self, skip_hydration: None) -> None:
+        """Memory budget evicts older projects but never the one being accessed."""
+        manager = GraphManagerService(max_projects=0, max_memory_bytes=1, idle_ttl_seconds=0)
+        session = MagicMock()
+        p1, p2 = uuid4(), uuid4()
+
+        await manager.add_node_to_graph(p1, session, uuid4(), "module", {"name": "A"})
+        await manager.add_node_to_graph(p2, session, uuid4(), "module", {"name": "B"})
+
+        assert list(manager._graph_cache) == [p2]
+        assert manager.get_cache_stats()["evictions"] >= 1
+
+
+@pytest.mark.asyncio
+class TestSingleFlightHydration:
+    """Test that concurrent cold loads share a single hydration."""
+
+    async def test_concurrent_cold_loads_hydrate_once(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """N concurrent requests for a cold project run hydration exactly once."""
+        import asyncio
+
+        calls = []
+        release = asyncio.Event()
+
+        async def _hydrate(self: GraphHydrationService, project_id: UUID, session: AsyncSession) -> None:
+            calls.append(project_id)
+            await release.wait()
+
+        monkeypatch.setattr(GraphHydrationService, "hydrate_streaming", _hydrate)
+        manager = GraphManagerService(max_projects=0, max_memory_bytes=0, idle_ttl_seconds=0)
+        project_id = uuid4()
+
+        tasks = [asyncio.create_task(manager.get_or_create_services(project_id, MagicMock())) for _ in range(5)]
+        await asyncio.sleep(0)
+
+        # Graph is not published while hydration is still running
+        assert project_id not in manager._graph_cache
+
+        release.set()
+        results = await asyncio.gather(*tasks)
+
+        assert len(calls) == 1
+        assert all(r[0] is results[0][0] for r in results)
+        assert manager.get_cache_stats()["coalesced_loads"] == 4
+
+    async def test_failed_hydration_is_not_cached(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A failed load propagates to waiters and leaves nothing in the cache."""
+
+        async def _hydrate(self: GraphHydrationService, project_id: UUID, session: AsyncSession) -> None:
+            raise RuntimeError("database unavailable")
+
+        monkeypatch.setattr(GraphHydrationService, "hydrate_streaming", _hydrate)
+        manager = GraphManagerService(max_projects=0, max_memory_bytes=0, idle_ttl_seconds=0)
+        project_id = uuid4()
+
+        with pytest.raises(RuntimeError):
+            await manager.get_or_create_services(project_id, MagicMock())
+
+        assert project_id not in manager._graph_cache
+        assert manager.get_cache_stats()["loads_in_flight"] == 0
+
+
+async def _add_chain(manager: GraphManagerService, project_id: UUID, length: int) -> list:
+    """Add modules m0 -> m1 -> ... to a project graph and return their ids."""
+    session = MagicMock()
+    ids = [uuid4() for _ in range(length)]
+    for node_id in ids:
+        await manager.add_node_to_graph(project_id, session, node_id, "module", {"name": str(node_id)})
+    for upper, lower in zip(ids[:-1], ids[1:], strict=True):
+        await manager.add_dependency_to_graph(project_id, session, upper, lower, "uses")
+    return ids
+
+
+@pytest.mark.asyncio
+class TestTransitiveDependencies:
+    """Test BFS closure and its revision-keyed cache."""
+
+    async def test_closure_reports_depth_and_chains(self, skip_hydration: None) -> None:
+        """Every transitive dependency gets its depth; max_depth bounds the search."""
+        manager = GraphManagerService(max_projects=0, max_memory_bytes=0, idle_ttl_seconds=0)
+        project_id = uuid4()
+        a, b, c, d = await _add_chain(manager, project_id, 4)
+
+        result = await manager.get_transitive_dependencies(project_id, MagicMock(), a)
+
+        assert [(dep["node_id"], dep["depth"]) for dep in result["dependencies"]] == [
+            (str(b), 1),
+            (str(c), 2),
+            (str(d), 3),
+        ]
+        assert result["dependency_chains"] == [[str(a), str(b), str(c), str(d)]]
+        assert result["max_depth"] == 3
+
+        bounded = await manager.get_transitive_dependencies(project_id, MagicMock(), a, max_depth=2)
+        assert bounded["total_unique_dependencies"] == 2
+
+    async def test_closure_cache_invalidated_by_mutations(self, skip_hydration: None) -> None:
+        """Cached closures are reused until an operation changes the graph."""
+        manager = GraphManagerService(max_projects=0, max_memory_bytes=0, idle_ttl_seconds=0)
+        project_id = uuid4()
+        a, b = await _add_chain(manager, project_id, 2)
+
+        first = await manager.get_transitive_dependencies(project_id, MagicMock(), a)
+        assert await manager.get_transitive_dependencies(project_id, MagicMock(), a) is first
+
+        c = uuid4()
+        await manager.add_node_to_graph(project_id, MagicMock(), c, "module", {"name": "C"})
+        await manager.add_dependency_to_graph(project_id, MagicMock(), b, c, "uses")
+
+        second = await manager.get_transitive_dependencies(project_id, MagicMock(), a)
+        assert second is not first
+        assert second["total_unique_dependencies"] == 2
+        assert second["graph_version"] > first["graph_version"]
+
+
+@pytest.mark.asyncio
+class TestIncrementalCycleCheck:
+    """Test cycle checks against the maintained topological order."""
+
+    async def test_would_create_cycle_leaves_graph_untouched(self, skip_hydration: None) -> None:
+        manager = GraphManagerService(max_projects=0, max_memory_bytes=0, idle_ttl_seconds=0)
+        project_id = uuid4()
+        a, b, c = await _add_chain(manager, project_id, 3)
+        _, ops, _, _ = await manager.get_or_create_services(project_id, MagicMock())
+        version = ops.revision.version
+
+        cycle = await manager.would_create_cycle(project_id, MagicMock(), c, a)
+
+        assert cycle == [str(c), str(a), str(b), str(c)]
+        assert await manager.would_create_cycle(project_id, MagicMock(), a, c) is None
+        assert ops.revision.version == version
+        assert ops.graph_system.get_node(str(c)).get_dependencies(direction="outgoing") == []
+
+    async def test_topology_follows_graph_mutations(self, skip_hydration: None) -> None:
+        manager = GraphManagerService(max_projects=0, max_memory_bytes=0, idle_ttl_seconds=0)
+        project_id = uuid4()
+        a, b = await _add_chain(manager, project_id, 2)
+        assert await manager.would_create_cycle(project_id, MagicMock(), b, a) is not None
+
+        await manager.remove_node_from_graph(project_id, MagicMock(), b)
+
+        assert await manager.would_create_cycle(project_id, MagicMock(), b, a) is None
+
+
+@pytest.mark.asyncio
+class TestSimulateChanges:
+    """Test batched what-if simulation on graph overlays."""
+
+    async def test_changes_are_simulated_alone_and_combined(self, skip_hydration: None) -> None:
+        manager = GraphManagerService(max_projects=0, max_memory_bytes=0, idle_ttl_seconds=0)
+        project_id = uuid4()
+        a, b, c = await _add_chain(manager, project_id, 3)
+        _, ops, _, _ = await manager.get_or_create_services(project_id, MagicMock())
+        version = ops.revision.version
+
+        result = await manager.simulate_changes(
+            project_id,
+            MagicMock(),
+            [
+                (c, {"add_dependencies": [{"target_id": str(a)}]}),
+                (b, {"delete": True}),
+                (a, {"add_dependencies": [{"target_id": str(b)}]}),  # b is gone in the combined view
+                (uuid4(), {"status": "approved"}),
+            ],
+        )
+
+        closing, deletion, conflicting, missing = result["results"]
+        assert not closing["valid"] and closing["new_cycles"] == [[str(c), str(a), str(b), str(c)]]
+        assert closing["affected_nodes"] == [str(b), str(a)]
+        assert deletion["valid"] and conflicting["valid"]
+        assert missing["error"] == "Node not found"
+        # Deleting b breaks the cycle c -> a would close; re-adding a -> b cannot be applied after it
+        assert result["combined"]["valid"] and result["combined"]["new_cycles"] == []
+        assert result["combined"]["conflicts"] == [2]
+        assert result["graph_version"] == ops.revision.version == version
+
+
+@pytest.mark.asyncio
+class TestApplyBatch:
+    """Test batched graph mutations."""
+
+    async def test_batch_bumps_revision_once(self, skip_hydration: None) -> None:
+        """Nodes and edges are applied together with a single change event."""
+        manager = GraphManagerService(max_projects=0, max_memory_bytes=0, idle_ttl_seconds=0)
+        project_id = uuid4()
+        _, ops, _, _ = await manager.get_or_create_services(project_id, MagicMock())
+        events = []
+        ops.revision.subscribe(lambda version, changes: events.append(len(changes or [])))
+        a, b, c = uuid4(), uuid4(), uuid4()
+
+        result = await manager.apply_batch(
+            project_id,
+            MagicMock(),
+            [
+                GraphOperation.add_node(a, "module", {"name": "A"}),
+                GraphOperation.add_node(b, "module", {"name": "B"}),
+                GraphOperation.add_dependency(a, b, "uses"),
+                GraphOperation.add_dependency(c, a, "uses"),  # c does not exist
+            ],
+        )
+
+        assert result["applied"] == 3
+        assert [failure["index"] for failure in result["failed"]] == [3]
+        assert events == [3]
+        assert ops.revision.version == result["version"] == 1
+        assert await manager.would_create_cycle(project_id, MagicMock(), b, a) is not None
+
+    async def test_empty_batch_is_a_no_op(self, skip_hydration: None) -> None:
+        manager = GraphManagerService(max_projects=0, max_memory_bytes=0, idle_ttl_seconds=0)
+
+        result = await manager.apply_batch(uuid4(), MagicMock(), [])
+
+        assert result["applied"] == 0
+        assert manager.get_cache_stats()["misses"] == 0
+
+
+@pytest.mark.asyncio
+class TestRefMemTreeManagerView:
+    """Test the RefMemTreeManager view over the shared project graph."""
+
+    async def test_view_follows_operations_and_invalidation(self, skip_hydration: None) -> None:
+        manager = GraphManagerService(max_projects=0, max_memory_bytes=0, idle_ttl_seconds=0)
+        project_id = uuid4()
+        a, b = await _add_chain(manager, project_id, 2)
+
+        refmem = await manager.get_refmemtree_manager(project_id, MagicMock())
+        assert set(refmem.nodes) == {a, b}
+        assert [link.to_node_id for link in refmem.get_dependencies(a)] == [b]
+        assert manager.get_cache_stats()["misses"] == 1
+
+        c = uuid4()
+        await manager.add_node_to_graph(project_id, MagicMock(), c, "module", {"name": "C"})
+        await manager.add_dependency_to_graph(project_id, MagicMock(), b, c, "uses")
+        await manager.remove_node_from_graph(project_id, MagicMock(), a)
+
+        assert await manager.get_refmemtree_manager(project_id, MagicMock()) is refmem
+        assert set(refmem.nodes) == {b, c}
+        assert refmem.get_dependents(b) == []
+        assert refmem.get_dependencies(b)[0].strength == 0.6
+
+        manager.invalidate_project(project_id)
+        assert await manager.get_refmemtree_manager(project_id, MagicMock()) is not refmem
+
+
+@pytest.mark.asyncio
+class TestGraphVersioning:
+    """Test delta-chain graph snapshots."""
+
+    async def test_delta_snapshots_roll_back_and_are_pruned(self, skip_hydration: None) -> None:
+        manager = GraphManagerService(max_projects=0, max_memory_bytes=0, idle_ttl_seconds=0)
+        project_id = uuid4()
+        a, b = await _add_chain(manager, project_id, 2)
+        _, _, _, versioning = await manager.get_or_create_services(project_id, MagicMock())
+        versioning.retention = 3
+
+        first = await manager.create_snapshot(project_id, MagicMock(), "first", "two modules")
+        c = uuid4()
+        await manager.add_node_to_graph(project_id, MagicMock(), c, "module", {"name": "C"})
+        await manager.add_dependency_to_graph(project_id, MagicMock(), b, c, "uses")
+        await manager.remove_node_from_graph(project_id, MagicMock(), a)
+        await manager.create_snapshot(project_id, MagicMock(), "second", "b -> c")
+
+        listed = await manager.list_snapshots(project_id, MagicMock())
+        assert [(s["kind"], s["node_count"]) for s in listed] == [("checkpoint", 2), ("delta", 2)]
+        assert set(versioning._versions[listed[1]["version_id"]].nodes) == {str(a), str(b), str(c)}
+
+        result = await manager.rollback_to_snapshot(project_id, MagicMock(), first)
+        assert result["status"] == "success"
+        assert await manager.would_create_cycle(project_id, MagicMock(), b, a) is not None
+        transitive = await manager.get_transitive_dependencies(project_id, MagicMock(), b)
+        assert transitive["dependencies"] == []
+
+        # Retention drops the oldest version; its delta child becomes a checkpoint
+        for name in ("third", "fourth"):
+            await manager.create_snapshot(project_id, MagicMock(), name, "")
+        listed = await manager.list_snapshots(project_id, MagicMock())
+        assert [s["name"] for s in listed] == ["second", "third", "fourth"]
+        assert listed[0]["kind"] == "checkpoint" and listed[0]["node_count"] == 2
+        assert (await manager.rollback_to_snapshot(project_id, MagicMock(), listed[0]["version_id"]))["status"] == (
+            "success"
+        )
+
+    async def test_removed_node_edges_do_not_survive_re_adding_it(self, skip_hydration: None) -> None:
+        """Removing a node drops its incoming edges from the next delta, even if the node comes back."""
+        manager = GraphManagerService(max_projects=0, max_memory_bytes=0, idle_ttl_seconds=0)
+        project_id = uuid4()
+        a, b = await _add_chain(manager, project_id, 2)
+        _, _, _, versioning = await manager.get_or_create_services(project_id, MagicMock())
+        first = await manager.create_snapshot(project_id, MagicMock(), "first", "a -> b")
+
+        await manager.remove_node_from_graph(project_id, MagicMock(), b)
+        await manager.add_node_to_graph(project_id, MagicMock(), b, "module", {"name": str(b)})
+        second = await manager.create_snapshot(project_id, MagicMock(), "second", "b re-added")
+
+        _, edges, _ = versioning._materialize(second)
+        assert edges[str(a)] == []
+        diff = await manager.diff_snapshots(project_id, MagicMock(), first, second)
+        assert diff["edges"]["removed"] == [{"from_node_id": str(a), "to_node_id": str(b), "dependency_type": "uses"}]
+
+        await manager.rollback_to_snapshot(project_id, MagicMock(), second)
+        graph = versioning.graph_system
+        assert graph.get_node(str(a)).get_dependencies(direction="outgoing") == []
+
+    async def test_diff_reports_edge_metadata_and_edges_into_removed_nodes(self) -> None:
+        """Edges into a removed node are reported even from sources that are not diff candidates."""
+        old_nodes = {"a": ["module", {}], "b": ["module", {}], "c": ["module", {}]}
+        old_edges = {"a": [["b", "uses", None]], "b": [], "c": [["a", "uses", {"description": "old"}]]}
+        new_nodes = {"a": ["module", {}], "c": ["module", {}]}
+        new_edges = {"a": [["b", "uses", None]], "c": [["a", "uses", {"description": "new"}]]}  # a is stale
+
+        diff = _diff_tables(
+            old_nodes,
+            old_edges,
+            _hashes(old_nodes, old_edges),
+            new_nodes,
+            new_edges,
+            _hashes(new_nodes, new_edges),
+            {"b", "c"},
+        )
+
+        assert [node["node_id"] for node in diff["nodes"]["removed"]] == ["b"]
+        assert diff["nodes"]["changed"] == []
+        assert diff["edges"]["removed"] == [{"from_node_id": "a", "to_node_id": "b", "dependency_type": "uses"}]
+        assert diff["edges"]["changed"] == [
+            {"from_node_id": "c", "to_node_id": "a", "dependency_type": "uses", "metadata": {"description": "new"}}
+        ]
+
+    async def test_diff_examines_only_touched_nodes(self, skip_hydration: None) -> None:
+        manager = GraphManagerService(max_projects=0, max_memory_bytes=0, idle_ttl_seconds=0)
+        project_id = uuid4()
+        ids = await _add_chain(manager, project_id, 20)
+        base = await manager.create_snapshot(project_id, MagicMock(), "base", "")
+
+        new = uuid4()
+        await manager.add_node_to_graph(project_id, MagicMock(), new, "module", {"name": "New"})
+        await manager.add_dependency_to_graph(project_id, MagicMock(), ids[5], new, "uses")
+        await manager.update_node_in_graph(project_id, MagicMock(), ids[7], "service", {"name": "Renamed"})
+        await manager.update_node_in_graph(project_id, MagicMock(), ids[9], "module", {"name": str(ids[9])})
+        await manager.remove_node_from_graph(project_id, MagicMock(), ids[19])
+
+        live = await manager.diff_snapshots(project_id, MagicMock(), base)
+        after = await manager.create_snapshot(project_id, MagicMock(), "after", "")
+        stored = await manager.diff_snapshots(project_id, MagicMock(), base, after)
+
+        for diff in (live, stored):
+            assert [node["node_id"] for node in diff["nodes"]["added"]] == [str(new)]
+            assert [node["node_id"] for node in diff["nodes"]["removed"]] == [str(ids[19])]
+            assert diff["nodes"]["changed"] == [
+                {"node_id": str(ids[7]), "node_type": "service", "changed_fields": ["node_type", "name"]}
+            ]
+            assert diff["edges"]["added"] == [
+                {"from_node_id": str(ids[5]), "to_node_id": str(new), "dependency_type": "uses"}
+            ]
+            assert diff["edges"]["removed"] == [
+                {"from_node_id": str(ids[18]), "to_node_id": str(ids[19]), "dependency_type": "uses"}
+            ]
+            # ids[9] was rewritten with identical content; ids[18] lost its edge into the removed node
+            assert diff["examined_nodes"] == 6
+
+        reverse = await manager.diff_snapshots(project_id, MagicMock(), after, base)
+        assert [node["node_id"] for node in reverse["nodes"]["removed"]] == [str(new)]
+        with pytest.raises(ValueError):
+            await manager.diff_snapshots(project_id, MagicMock(), str(uuid4()))
+
+
+@pytest.mark.asyncio
+class TestGraphHash:
+    """Test the incrementally maintained project graph hash."""
+
+    async def test_hash_follows_operations(self, skip_hydration: None) -> None:
+        manager = GraphManagerService(max_projects=0, max_memory_bytes=0, idle_ttl_seconds=0)
+        project_id = uuid4()
+        a, b, c = await _add_chain(manager, project_id, 3)
+        before = (await manager.get_graph_hash(project_id, MagicMock())).root
+
+        await manager.update_node_in_graph(project_id, MagicMock(), b, "service", {"name": "B"})
+        await manager.remove_node_from_graph(project_id, MagicMock(), c)  # Also drops b -> c
+        graph_hash = await manager.get_graph_hash(project_id, MagicMock())
+        after = graph_hash.root
+        assert after != before
+
+        # Incremental updates agree with a full rebuild
+        graph_hash._tree = None
+        assert graph_hash.root == after
+        assert manager.get_cache_stats()["estimated_bytes"] > 0
+
+    async def test_edge_metadata_changes_the_hash(self, skip_hydration: None) -> None:
+        manager = GraphManagerService(max_projects=0, max_memory_bytes=0, idle_ttl_seconds=0)
+        project_id = uuid4()
+        a, b = await _add_chain(manager, project_id, 2)
+        before = (await manager.get_graph_hash(project_id, MagicMock())).root
+
+        await manager.remove_node_from_graph(project_id, MagicMock(), b)
+        await manager.add_node_to_graph(project_id, MagicMock(), b, "module", {"name": str(b)})
+        await manager.add_dependency_to_graph(
+            project_id, MagicMock(), a, b, "uses", metadata={"description": None, "metadata": {"weight": 2}}
+        )
+        assert (await manager.get_graph_hash(project_id, MagicMock())).root != before
+
+    async def test_etag_follows_database_probe(self, skip_hydration: None, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Rows written by another worker change the tag and refresh the graph before it is served."""
+        manager = GraphManagerService(max_projects=0, max_memory_bytes=0, idle_ttl_seconds=0)
+        project_id = uuid4()
+        await _add_chain(manager, project_id, 2)
+        probe = list(manager._hydration_services[project_id].applied_watermarks)
+        refreshed: list = []
+
+        async def _probe(project_id: UUID, session: AsyncSession) -> tuple:
+            return tuple(probe)
+
+        async def _refresh(project_id: UUID, session: AsyncSession) -> Dict[str, int]:
+            refreshed.append(project_id)
+            return {}
+
+        monkeypatch.setattr("backend.core.graph_manager.database_watermarks", _probe)
+        monkeypatch.setattr(manager, "refresh_project", _refresh)
+
+        first = await manager.get_project_etag(project_id, MagicMock())
+        assert await manager.get_project_etag(project_id, MagicMock()) == first
+        assert refreshed == []
+
+        probe[1] += 1  # Another worker inserted a module
+        assert await manager.get_project_etag(project_id, MagicMock()) != first
+        assert refreshed == [project_id]
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not RUSTWORKX_AVAILABLE, reason="rustworkx not installed")
+class TestRustworkxMirror:
+    """Test that the analytics mirror follows graph mutations."""
+
+    async def test_mirror_tracks_operations_without_rebuild(self, skip_hydration: None) -> None:
+        manager = GraphManagerService(max_projects=0, max_memory_bytes=0, idle_ttl_seconds=0)
+        project_id = uuid4()
+        a, b, c = await _add_chain(manager, project_id, 3)
+        _, _, analytics, _ = await manager.get_or_create_services(project_id, MagicMock())
+        analytics.use_rustworkx = True
+
+        assert await analytics.get_topological_order() == [str(a), str(b), str(c)]
+        mirror = analytics._current_mirror()
+
+        await manager.add_dependency_to_graph(project_id, MagicMock(), c, a, "uses")
+
+        assert analytics._current_mirror() is mirror
+        assert [sorted(component) for component in await analytics.get_strongly_connected_components()] == [
+            sorted([str(a), str(b), str(c)])
+        ]
+        assert await analytics.get_topological_order() is None
+        assert await analytics.get_shortest_path(a, c) == [str(a), str(b), str(c)]
+
+
 # ============================================================================
 # Mock Tests (when RefMemTree is available)
 # ============================================================================
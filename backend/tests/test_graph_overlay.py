@@ -0,0 +1,109 @@
+"""Tests for the copy-on-write GraphOverlay used by what-if checks."""
+
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+from backend.core.graph_overlay import GraphOverlay
+from backend.core.graph_revision import GraphRevision
+from backend.core.rule_engine import compile_rule
+
+
+class _Dependency:
+    def __init__(self, source_node_id: str, target_node_id: str, dependency_type: str = "uses") -> None:
+        self.source_node_id = source_node_id
+        self.target_node_id = target_node_id
+        self.dependency_type = dependency_type
+
+
+class _Node:
+    def __init__(self, node_id: str, data: Dict[str, Any]) -> None:
+        self.id = node_id
+        self.node_type = "module"
+        self.data = data
+        self.outgoing: List[_Dependency] = []
+        self.incoming: List[_Dependency] = []
+
+    def get_dependencies(self, direction: str = "outgoing") -> List[_Dependency]:
+        return self.outgoing if direction == "outgoing" else self.incoming
+
+
+class _Graph:
+    """The slice of the RefMemTree GraphSystem API the overlay reads."""
+
+    def __init__(self) -> None:
+        self.nodes: Dict[str, _Node] = {}
+
+    def add(self, name: str, layer: str) -> str:
+        node_id = name.lower()
+        self.nodes[node_id] = _Node(node_id, {"name": name, "metadata": {"layer": layer}})
+        return node_id
+
+    def link(self, source: str, target: str) -> None:
+        dependency = _Dependency(source, target)
+        self.nodes[source].outgoing.append(dependency)
+        self.nodes[target].incoming.append(dependency)
+
+    def get_node(self, node_id: str) -> Optional[_Node]:
+        return self.nodes.get(node_id)
+
+    def get_all_nodes(self) -> List[_Node]:
+        return list(self.nodes.values())
+
+
+def _layered_graph() -> _Graph:
+    graph = _Graph()
+    for name, layer in (("Ui", "ui"), ("Api", "service"), ("Store", "data")):
+        graph.add(name, layer)
+    graph.link("ui", "api")
+    graph.link("api", "store")
+    return graph
+
+
+def test_overlay_reads_base_plus_delta_without_touching_base() -> None:
+    graph = _layered_graph()
+    overlay = GraphOverlay(graph)
+
+    overlay.add_node("cache", "module", {"name": "Cache"})
+    overlay.add_dependency("api", "cache")
+    overlay.remove_dependency("api", "store")
+    overlay.update_node("ui", data={"status": "approved"})
+
+    assert set(overlay.successors("api")) == {"cache"}
+    assert overlay.predecessors("store") == []
+    assert overlay.node("ui") == ("module", {"name": "Ui", "metadata": {"layer": "ui"}, "status": "approved"})
+    assert overlay.impact("cache") == {"api": 1, "ui": 2}
+    # The shared graph is unchanged
+    assert [dep.target_node_id for dep in graph.nodes["api"].outgoing] == ["store"]
+    assert "status" not in graph.nodes["ui"].data
+
+
+def test_overlay_reports_cycles_closed_by_the_delta() -> None:
+    overlay = GraphOverlay(_layered_graph())
+
+    assert overlay.would_create_cycle("store", "ui") == ["store", "ui", "api", "store"]
+
+    fork = overlay.fork()
+    fork.add_dependency("store", "ui")
+
+    assert fork.new_cycles() == [["store", "ui", "api", "store"]]
+    assert overlay.new_cycles() == []  # Forks are independent
+
+    fork.remove_node("api")
+    assert fork.new_cycles() == [] and fork.cycles() == []
+
+
+def test_overlay_reports_only_introduced_rule_violations() -> None:
+    graph = _layered_graph()
+    layers = compile_rule(uuid4(), "layer", {"layers": ["UI", "service", "data"]}, level="global")
+    revision = GraphRevision()
+    overlay = GraphOverlay(graph, {layers.rule_id: layers}, revision)
+
+    overlay.add_dependency("store", "api")
+
+    violations = overlay.introduced_violations()
+    assert [(v["node_id"], v["severity"]) for v in violations] == [("store", "error")]
+    assert GraphOverlay(graph, {layers.rule_id: layers}).introduced_violations() == []
+
+    assert not overlay.stale
+    revision.bump()
+    assert overlay.stale
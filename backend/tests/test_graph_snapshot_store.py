@@ -0,0 +1,86 @@
+"""Tests for on-disk graph snapshots (warm start)."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict
+from uuid import uuid4
+
+from backend.core.graph_snapshot_store import GraphSnapshotStore
+
+
+def _snapshot(project_id: Any) -> Dict[str, Any]:
+    return {
+        "project_id": str(project_id),
+        "watermarks": {"modules": "2025-01-01T00:00:00", "dependencies": None, "rules": None},
+        "nodes": [[str(uuid4()), "service", {"name": "UserService", "level": 1}]],
+        "dependencies": [],
+        "rules": [],
+    }
+
+
+def test_save_and_load_roundtrip(tmp_path: Path) -> None:
+    """Saved snapshot loads back unchanged."""
+    store = GraphSnapshotStore(str(tmp_path))
+    project_id = uuid4()
+    snapshot = _snapshot(project_id)
+
+    written = store.save(project_id, snapshot)
+
+    assert written == store.path_for(project_id).stat().st_size
+    assert store.load(project_id) == snapshot
+
+
+def test_missing_snapshot_returns_none(tmp_path: Path) -> None:
+    """No snapshot on disk means cold hydration."""
+    store = GraphSnapshotStore(str(tmp_path))
+    assert store.load(uuid4()) is None
+
+
+def test_corrupt_snapshot_is_discarded(tmp_path: Path) -> None:
+    """Checksum mismatch -> None and the file is removed."""
+    store = GraphSnapshotStore(str(tmp_path))
+    project_id = uuid4()
+    store.save(project_id, _snapshot(project_id))
+
+    path = store.path_for(project_id)
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    assert store.load(project_id) is None
+    assert not path.exists()
+
+
+def test_stale_snapshot_is_discarded(tmp_path: Path) -> None:
+    """Snapshots older than max_age_seconds are ignored."""
+    project_id = uuid4()
+    GraphSnapshotStore(str(tmp_path)).save(project_id, _snapshot(project_id))
+    time.sleep(0.02)
+
+    store = GraphSnapshotStore(str(tmp_path), max_age_seconds=0.01)
+
+    assert store.load(project_id) is None
+
+
+def test_snapshot_for_other_project_is_rejected(tmp_path: Path) -> None:
+    """A file renamed to another project id is not trusted."""
+    store = GraphSnapshotStore(str(tmp_path))
+    project_id, other_id = uuid4(), uuid4()
+    store.save(project_id, _snapshot(project_id))
+    store.path_for(project_id).rename(store.path_for(other_id))
+
+    assert store.load(other_id) is None
+
+
+def test_concurrent_saves_do_not_share_a_temp_file(tmp_path: Path) -> None:
+    """Eviction and shutdown may save one project at once; the result is one intact snapshot."""
+    store = GraphSnapshotStore(str(tmp_path))
+    project_id = uuid4()
+    snapshot = _snapshot(project_id)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda _: store.save(project_id, snapshot), range(16)))
+
+    assert store.load(project_id) == snapshot
+    assert [path.name for path in tmp_path.iterdir()] == [store.path_for(project_id).name]
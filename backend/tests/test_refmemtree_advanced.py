@@ -0,0 +1,153 @@
+"""Tests for RefMemTreeManager dependency tracking and impact analysis."""
+
+from uuid import UUID, uuid4
+
+from backend.core.graph_algorithms import PathSearchLimits
+from backend.core.refmemtree_advanced import DependencyLink, RefMemTreeManager
+from backend.modules.architecture.refmemtree_integration import ArchitectureRefMemTreeIntegration
+
+
+def _link(manager: RefMemTreeManager, from_id: UUID, to_id: UUID, dependency_type: str = "uses") -> None:
+    manager.add_dependency(DependencyLink(from_id, to_id, dependency_type, strength=0.9))
+
+
+def test_get_dependents_uses_reverse_index() -> None:
+    """Incoming links are returned without scanning all edges."""
+    manager = RefMemTreeManager()
+    a, b, c = uuid4(), uuid4(), uuid4()
+    _link(manager, a, c)
+    _link(manager, b, c)
+
+    dependents = manager.get_dependents(c)
+
+    assert {d.from_node_id for d in dependents} == {a, b}
+    assert manager.get_dependents(a) == []
+
+
+def test_remove_dependency_updates_both_indexes() -> None:
+    """Removing an edge drops it from outgoing and incoming indexes."""
+    manager = RefMemTreeManager()
+    a, b = uuid4(), uuid4()
+    _link(manager, a, b, "uses")
+    _link(manager, a, b, "import")
+
+    assert manager.remove_dependency(a, b, "uses") == 1
+    assert [d.dependency_type for d in manager.get_dependencies(a)] == ["import"]
+    assert [d.dependency_type for d in manager.get_dependents(b)] == ["import"]
+
+    assert manager.remove_dependency(a, b) == 1
+    assert manager.get_dependencies(a) == []
+    assert manager.get_dependents(b) == []
+    assert manager.remove_dependency(a, b) == 0
+
+
+def test_analyze_change_impact_finds_direct_dependents() -> None:
+    """Impact analysis reports nodes that depend on the changed node."""
+    manager = RefMemTreeManager()
+    core, service, ui = uuid4(), uuid4(), uuid4()
+    _link(manager, service, core)
+    _link(manager, ui, service)
+
+    impact = manager.analyze_change_impact(core, "delete")
+
+    assert impact.affected_nodes == [service]
+    assert impact.impact_scores[service] == 1.0
+    assert [core, service, ui] in impact.propagation_path
+
+
+def _layered(manager: RefMemTreeManager, layers: int, width: int) -> UUID:
+    """Build a fully connected layered DAG (width ** layers chains); returns the root."""
+    root = uuid4()
+    previous = [root]
+    for _ in range(layers):
+        current = [uuid4() for _ in range(width)]
+        for upper in previous:
+            for lower in current:
+                _link(manager, upper, lower)
+        previous = current
+    return root
+
+
+def test_dependency_chain_matches_unbounded_semantics() -> None:
+    """Chains end at leaves, respect max_depth and skip cycles."""
+    manager = RefMemTreeManager()
+    a, b, c, d = uuid4(), uuid4(), uuid4(), uuid4()
+    _link(manager, a, b)
+    _link(manager, b, c)
+    _link(manager, c, a)  # Cycle back to the root
+    _link(manager, a, d)
+
+    assert manager.get_dependency_chain(a) == [[a, d]]
+    assert manager.get_dependency_chain(d) == [[d]]
+    assert manager.get_dependency_chain(a, max_depth=1) == []
+
+
+def test_dependency_chain_stops_at_max_paths() -> None:
+    """Path explosion is capped and reported as truncated."""
+    manager = RefMemTreeManager()
+    root = _layered(manager, layers=4, width=6)  # 1296 chains
+
+    result = manager.search_dependency_chains(root, max_depth=10, max_paths=50)
+
+    assert len(result.paths) == 50
+    assert result.truncated_by == "max_paths"
+    assert len(manager.get_dependency_chain(root, max_depth=10, max_paths=0)) == 6**4
+
+
+def test_shortest_mode_returns_shortest_chains_first() -> None:
+    manager = RefMemTreeManager()
+    a, b, c, d = uuid4(), uuid4(), uuid4(), uuid4()
+    _link(manager, a, b)
+    _link(manager, b, c)
+    _link(manager, c, d)
+    _link(manager, a, d)
+
+    assert manager.get_dependency_chain(a, max_paths=1, mode="shortest") == [[a, d]]
+
+
+def test_dependency_reachability_aggregates_paths() -> None:
+    """DAG summary gives shortest/longest depth and chain counts without enumeration."""
+    manager = RefMemTreeManager()
+    root = _layered(manager, layers=3, width=4)
+
+    summary = manager.get_dependency_reachability(root)
+    leaves = [node_id for node_id in summary.reachable if not manager.get_dependencies(node_id)]
+
+    assert summary.is_dag
+    assert len(summary.reachable) == 12
+    assert summary.depth == 3
+    assert len(leaves) == 4
+    assert all(summary.path_counts[leaf] == 16 for leaf in leaves)
+
+
+def test_impact_summary_mode_reports_transitive_dependents() -> None:
+    manager = RefMemTreeManager()
+    core, service, ui = uuid4(), uuid4(), uuid4()
+    _link(manager, service, core)
+    _link(manager, ui, service)
+    _link(manager, core, ui)  # Cycle: no longest-path DP
+
+    impact = manager.analyze_change_impact(core, "update", limits=PathSearchLimits(max_depth=5), path_mode="summary")
+
+    assert impact.propagation_path == []
+    assert impact.reachability is not None
+    assert impact.reachability.min_depth == {service: 1, ui: 2}
+    assert not impact.reachability.is_dag
+
+
+def test_integration_passes_path_mode_and_limits() -> None:
+    integration = ArchitectureRefMemTreeIntegration()
+    core, service, ui = uuid4(), uuid4(), uuid4()
+    _link(integration.manager, service, core)
+    _link(integration.manager, ui, service)
+
+    summary = integration.analyze_module_modification_impact(core, path_mode="summary")
+    default = integration.analyze_module_modification_impact(core)
+    bounded = integration.analyze_module_modification_impact(core, limits=PathSearchLimits(max_depth=1))
+
+    assert summary["path_mode"] == "summary"
+    assert summary["transitive_affected_count"] == 2
+    assert summary["propagation_depth"] == 3
+    assert default["propagation_depth"] == 3
+    assert default["transitive_affected_count"] is None
+    assert bounded["propagation_depth"] == 0  # The only chain is longer than max_depth
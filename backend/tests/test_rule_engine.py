@@ -0,0 +1,110 @@
+"""Tests for compiled architecture rules and the incremental RuleEngine."""
+
+from typing import Any, Dict, List, Optional
+from uuid import UUID, uuid4
+
+from backend.core.graph_revision import GraphChange, GraphRevision
+from backend.core.refmemtree_advanced import DependencyLink, NodeRule, RefMemTreeManager
+from backend.core.rule_engine import CompiledRule, RuleEngine, compile_rule
+
+
+class _Dependency:
+    def __init__(self, target_node_id: str) -> None:
+        self.target_node_id = target_node_id
+
+
+class _Node:
+    def __init__(self, node_id: str, node_type: str, data: Dict[str, Any]) -> None:
+        self.id = node_id
+        self.node_type = node_type
+        self.data = data
+        self.dependencies: List[_Dependency] = []
+
+    def get_dependencies(self, direction: str = "outgoing") -> List[_Dependency]:
+        return self.dependencies
+
+
+class _Graph:
+    """The slice of the RefMemTree GraphSystem API the rule engine uses."""
+
+    def __init__(self) -> None:
+        self.nodes: Dict[str, _Node] = {}
+
+    def add(self, name: str, layer: str) -> str:
+        node_id = str(uuid4())
+        self.nodes[node_id] = _Node(node_id, "module", {"name": name, "metadata": {"layer": layer}})
+        return node_id
+
+    def get_node(self, node_id: str) -> Optional[_Node]:
+        return self.nodes.get(node_id)
+
+    def get_all_nodes(self) -> List[_Node]:
+        return list(self.nodes.values())
+
+
+def test_compile_rule_parses_definitions_once() -> None:
+    naming = compile_rule(uuid4(), "naming", {"condition": "name must end with 'Service'"})
+    limit = compile_rule(uuid4(), "dependency", {"condition": "max_dependencies < 3"})
+    layers = compile_rule(uuid4(), "layer", {"layers": ["UI", "service", "data"]}, level="global")
+    text = compile_rule(uuid4(), "dependency", {"condition": "UI components cannot depend on database layer"})
+
+    assert (naming.kind, naming.suffix) == (CompiledRule.NAMING, "Service")
+    assert (limit.kind, limit.max_dependencies) == (CompiledRule.MAX_DEPENDENCIES, 2)
+    assert layers.severity == "error"
+    assert layers.allows_edge("ui", "data") and not layers.allows_edge("data", "ui")
+    assert text.kind == CompiledRule.LAYER and not text.allows_edge("ui", "database")
+    assert not compile_rule(uuid4(), "security", {"condition": "use TLS"}).checkable
+
+
+def test_engine_reevaluates_only_touched_nodes() -> None:
+    graph = _Graph()
+    ui, service, data = graph.add("Dashboard", "ui"), graph.add("UserService", "service"), graph.add("Users", "data")
+    graph.nodes[ui].dependencies.append(_Dependency(service))
+    naming_id, layer_id = uuid4(), uuid4()
+    rules = {
+        naming_id: compile_rule(naming_id, "naming", {"suffix": "Service"}, module_id=UUID(service)),
+        layer_id: compile_rule(layer_id, "layer", {"layers": ["ui", "service", "data"]}),
+    }
+    revision = GraphRevision()
+    engine = RuleEngine(graph, rules, revision)
+    assert engine.violations() == {naming_id: set(), layer_id: set()}
+
+    full_passes = []
+    evaluate_all = engine._evaluate_all
+    engine._evaluate_all = lambda: full_passes.append(1) or evaluate_all()  # type: ignore[method-assign]
+
+    # data -> ui points upwards, and the service loses its suffix
+    graph.nodes[data].dependencies.append(_Dependency(ui))
+    graph.nodes[service].data = {**graph.nodes[service].data, "name": "Users"}
+    revision.bump(
+        GraphChange(GraphChange.ADD_DEPENDENCY, data, ui, "uses"),
+        GraphChange(GraphChange.UPDATE_NODE, service),
+    )
+    assert engine.violations() == {naming_id: {service}, layer_id: {data}}
+    assert engine.report()["failed_rules"] == 2
+
+    del graph.nodes[data]
+    revision.bump(GraphChange(GraphChange.REMOVE_NODE, data))
+    assert engine.violations()[layer_id] == set()
+    assert full_passes == []
+    # Both indexes forget the removed node (its data -> ui edge included)
+    assert data not in engine._targets and all(data not in sources for sources in engine._dependents.values())
+
+    revision.bump()  # Unknown change (e.g. delta refresh): full pass
+    engine.violations()
+    assert full_passes == [1]
+
+
+def test_manager_rule_conditions_are_evaluated() -> None:
+    manager = RefMemTreeManager()
+    module, database = uuid4(), uuid4()
+    manager.register_node(module, {"name": "UserService", "type": "ui"})
+    manager.register_node(database, {"name": "Db", "type": "database"})
+    manager.add_dependency(DependencyLink(module, database, "uses"))
+    manager.add_rule(module, NodeRule(uuid4(), "naming", "name.endswith('Service')", "Enforce naming"))
+    manager.add_rule(module, NodeRule(uuid4(), "dependency", "cannot depend on database layer", "No DB access"))
+
+    valid, violations = manager.validate_against_rules(module, {"name": "UserHandler"})
+
+    assert not valid
+    assert violations == ["Rule violation: Enforce naming", "Rule violation: No DB access"]
@@ -0,0 +1,121 @@
+"""
+Benchmark utilities: synthetic data seeding and measurement helpers.
+
+Benchmarks are skipped unless CODORCH_BENCHMARKS=1 is set. Run them with
+output enabled:
+
+    CODORCH_BENCHMARKS=1 pytest tests/benchmarks -s -m slow --no-cov
+"""
+
+import os
+import random
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.db.models import ArchitectureModule, ModuleDependency
+
+BENCHMARKS_ENABLED = bool(os.getenv("CODORCH_BENCHMARKS"))
+
+requires_benchmarks = pytest.mark.skipif(not BENCHMARKS_ENABLED, reason="Set CODORCH_BENCHMARKS=1 to run benchmarks")
+
+INSERT_CHUNK = 5000
+
+
+async def seed_architecture(
+    session: AsyncSession,
+    project_id: UUID,
+    module_count: int,
+    dependency_count: int,
+    seed: int = 42,
+) -> Tuple[List[UUID], List[Tuple[UUID, UUID]]]:
+    """
+    Seed a synthetic architecture with bulk Core inserts.
+
+    Dependencies always point from a higher to a lower module index, so the
+    generated graph is acyclic.
+    """
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    module_ids = [uuid4() for _ in range(module_count)]
+
+    module_rows: List[Dict[str, Any]] = [
+        {
+            "id": module_id,
+            "project_id": project_id,
+            "name": f"Module{i}Service",
+            "description": f"Synthetic module {i}",
+            "module_type": "service",
+            "level": i % 6,
+            "ai_generated": False,
+            "status": "draft",
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i, module_id in enumerate(module_ids)
+    ]
+    for start in range(0, len(module_rows), INSERT_CHUNK):
+        await session.execute(insert(ArchitectureModule), module_rows[start : start + INSERT_CHUNK])
+
+    edges: set[Tuple[int, int]] = set()
+    while len(edges) < dependency_count:
+        a, b = rng.randrange(module_count), rng.randrange(module_count)
+        if a != b:
+            edges.add((max(a, b), min(a, b)))
+
+    dependency_rows: List[Dict[str, Any]] = [
+        {
+            "id": uuid4(),
+            "project_id": project_id,
+            "from_module_id": module_ids[a],
+            "to_module_id": module_ids[b],
+            "dependency_type": "uses",
+            "created_at": now,
+        }
+        for a, b in edges
+    ]
+    for start in range(0, len(dependency_rows), INSERT_CHUNK):
+        await session.execute(insert(ModuleDependency), dependency_rows[start : start + INSERT_CHUNK])
+
+    await session.commit()
+    return module_ids, [(module_ids[a], module_ids[b]) for a, b in edges]
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Process peak RSS in MB, or None where the resource module is unavailable (Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is KiB on Linux; it is a process-wide high-water mark
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def measure(fn: Callable[[], Awaitable[Any]]) -> Dict[str, Optional[float]]:
+    """Measure wall time, traced peak allocation and process peak RSS for an async call."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    await fn()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "seconds": elapsed,
+        "peak_alloc_mb": peak / (1024 * 1024),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def report(title: str, rows: Dict[str, Dict[str, Optional[float]]]) -> None:
+    """Print a small comparison table."""
+    print(f"\n{title}")
+    print(f"{'variant':<28}{'seconds':>10}{'peak alloc MB':>16}{'peak RSS MB':>14}")
+    for name, stats in rows.items():
+        rss = f"{stats['peak_rss_mb']:>14.1f}" if stats["peak_rss_mb"] is not None else f"{'n/a':>14}"
+        print(f"{name:<28}{stats['seconds']:>10.3f}{stats['peak_alloc_mb']:>16.1f}{rss}")
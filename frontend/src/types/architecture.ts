@@ -6,6 +6,7 @@ export interface ArchitectureModule {
   id: string;
   project_id: string;
   parent_id?: string | null;
+  path?: string | null;
   tree_node_id?: string | null;
   name: string;
   description?: string | null;
@@ -37,6 +38,7 @@ export interface ArchitectureModuleCreate {
 }
 
 export interface ArchitectureModuleUpdate {
+  parent_id?: string | null;
   name?: string;
   description?: string | null;
   module_type?: string;
@@ -149,6 +151,8 @@ export interface ComplexityAnalysisResponse {
 export interface ImpactAnalysisRequest {
   module_id: string;
   change_type: 'modify' | 'delete' | 'add';
+  transitive?: boolean;
+  max_depth?: number;
 }
 
 export interface AffectedModule {
@@ -156,6 +160,8 @@ export interface AffectedModule {
   module_name: string;
   impact_level: 'direct' | 'indirect' | 'cascading';
   affected_features: string[];
+  distance: number;
+  path_edge_types: string[];
 }
 
 export interface ImpactAnalysisResponse {